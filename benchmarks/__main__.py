@@ -0,0 +1,102 @@
+"""运行全部基准，输出带版本信息的 JSON，可与之前的结果对比
+
+运行：
+    python -m benchmarks --output bench_results/$(git rev-parse --short HEAD).json
+    python -m benchmarks --only data --compare bench_results/abc1234.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime
+from importlib import import_module
+from importlib.metadata import version
+from pathlib import Path
+from typing import Dict
+
+
+# 基准名称 -> (模块, run() 的参数)
+SUITES = {
+    "actions": ("benchmarks.bench_actions", {"iterations": 300}),
+    "context": ("benchmarks.bench_context", {"iterations": 20}),
+    "data": ("benchmarks.bench_data", {"iterations": 2000}),
+    "locator_cache": ("benchmarks.bench_locator_cache", {"iterations": 5000}),
+    "logger": ("benchmarks.bench_logger", {"records": 20000, "queue_size": 10000}),
+}
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _flatten(data, prefix: str = "") -> Dict[str, float]:
+    """嵌套结果展开为 "suite.metric.key" -> 数值，便于跨提交逐项对比"""
+    flat = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            flat.update(_flatten(value, f"{prefix}.{key}" if prefix else key))
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        flat[prefix] = data
+    return flat
+
+
+def compare(current: dict, previous: dict) -> str:
+    """逐项对比两次结果（_ops 越大越好，其余耗时类指标越小越好）"""
+    old = _flatten(previous["results"])
+    lines = [f"对比 {previous['meta']['commit']} -> {current['meta']['commit']}:"]
+    for key, value in _flatten(current["results"]).items():
+        base = old.get(key)
+        if not base or key.endswith("iterations") or key.split(".")[-1] in ("records", "queue_size", "bytes"):
+            continue
+        change = (value / base - 1) * 100
+        better = change > 0 if key.endswith("_ops") else change < 0
+        mark = "✓" if better else "⚠" if abs(change) >= 10 else " "
+        lines.append(f"  {mark} {key}: {base:.2f} -> {value:.2f} ({change:+.1f}%)")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="运行全部基准")
+    parser.add_argument("--only", nargs="+", choices=list(SUITES), help="只运行指定的基准")
+    parser.add_argument("--output", type=Path, help="结果 JSON 文件，默认输出到标准输出")
+    parser.add_argument("--compare", type=Path, help="与之前的结果 JSON 对比")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.only or SUITES:
+        module_name, kwargs = SUITES[name]
+        print(f"ℹ 运行基准: {name}", file=sys.stderr)
+        module = import_module(module_name)
+        results[name] = module.run(**kwargs)
+
+    report = {
+        "meta": {
+            "commit": _commit(),
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "playwright": version("playwright"),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text + "\n", encoding="utf-8")
+        print(f"✓ 基准结果已保存: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            print(compare(report, json.load(f)), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""BasePage 动作基准
+
+对比同一本地页面上 click / fill / get_text 通过 BasePage（日志、Allure 步骤、
+定位器缓存、操作耗时统计）与直接调用 page.locator(...) 的每秒次数，差值即框架开销；
+页面断言 Assertion.assert_text 与直接 expect(...).to_have_text 同样对比。
+
+运行：
+    python -m benchmarks.bench_actions --iterations 300
+"""
+import argparse
+import json
+from playwright.sync_api import expect, sync_playwright
+from benchmarks.common import HTML, per_second
+from pages.base_page import BasePage
+from utils.assertion import Assertion
+
+
+class BenchPage(BasePage):
+    """基准测试用页面对象"""
+
+    BUTTON = ("button", "保存")
+    INPUT = "#username"
+    MESSAGE = "//p[contains(@class, 'text-green-800')]"
+
+
+def _compare(base_func, raw_func, iterations: int) -> dict:
+    # 先各跑一轮预热，避免首次解析/编译计入先执行的一方
+    per_second(base_func, max(iterations // 10, 1))
+    per_second(raw_func, max(iterations // 10, 1))
+    base_ops = per_second(base_func, iterations)
+    raw_ops = per_second(raw_func, iterations)
+    return {
+        "basepage_ops": base_ops,
+        "raw_ops": raw_ops,
+        "overhead_ms": 1000 / base_ops - 1000 / raw_ops,
+    }
+
+
+def run(iterations: int) -> dict:
+    results = {"iterations": iterations}
+    with sync_playwright() as p:
+        browser = p.chromium.launch()
+        page = browser.new_page()
+        page.set_content(HTML)
+        bench_page = BenchPage(page)
+
+        results["click"] = _compare(
+            lambda i: bench_page.click(BenchPage.BUTTON),
+            lambda i: page.get_by_role("button", name="保存").click(),
+            iterations
+        )
+        results["fill"] = _compare(
+            lambda i: bench_page.fill(BenchPage.INPUT, f"user{i}"),
+            lambda i: page.locator(BenchPage.INPUT).fill(f"user{i}"),
+            iterations
+        )
+        results["get_text"] = _compare(
+            lambda i: bench_page.get_text(BenchPage.MESSAGE),
+            lambda i: page.locator(f"xpath={BenchPage.MESSAGE}").text_content(),
+            iterations
+        )
+        assertion = Assertion("Bench")
+        results["assert_text"] = _compare(
+            lambda i: assertion.assert_text(bench_page, BenchPage.MESSAGE, "登录成功"),
+            lambda i: expect(page.locator(f"xpath={BenchPage.MESSAGE}")).to_have_text("登录成功"),
+            iterations
+        )
+        browser.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BasePage 动作基准")
+    parser.add_argument("--iterations", type=int, default=300, help="每种动作的执行次数")
+    args = parser.parse_args()
+    print(json.dumps(run(args.iterations), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""上下文创建和 tracing 基准
+
+通过 ContextFactory（与 page / authenticated_page fixture 相同的路径）模拟一个测试：
+创建上下文和页面、加载本地页面、执行几次 BasePage 动作、回收上下文。
+    - context: 不带 / 带 storage state 时每个测试的上下文创建、回收耗时
+    - tracing: 各 trace 模式下每个测试的总耗时，分别按测试通过和失败（需要保存 trace）计
+
+运行：
+    python -m benchmarks.bench_context --iterations 20
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from playwright.sync_api import sync_playwright
+from benchmarks.common import HTML
+from pages.base_page import BasePage
+from utils.context_factory import ContextFactory
+from utils.trace_recorder import TraceRecorder
+
+
+class BenchPage(BasePage):
+    """基准测试用页面对象"""
+
+
+def _simulate_test(factory: ContextFactory, iterations: int, storage_state=None, failed: bool = False) -> dict:
+    """执行 iterations 个模拟测试，返回每个测试的平均耗时（毫秒）"""
+    create = teardown = total = 0.0
+    for i in range(iterations):
+        start = time.perf_counter()
+        session = factory.open(f"bench_{i}", storage_state=storage_state)
+        opened = time.perf_counter()
+        session.page.set_content(HTML)
+        bench_page = BenchPage(session.page)
+        for step in range(3):
+            bench_page.fill("#username", f"user{step}")
+            bench_page.click(("button", "保存"))
+        closing = time.perf_counter()
+        factory.close(session, failed=failed)
+        end = time.perf_counter()
+        create += opened - start
+        teardown += end - closing
+        total += end - start
+    return {
+        "create_ms": create / iterations * 1000,
+        "teardown_ms": teardown / iterations * 1000,
+        "test_ms": total / iterations * 1000,
+    }
+
+
+def _storage_state(browser, path: Path) -> Path:
+    """生成包含 cookie 和 localStorage 的登录状态文件"""
+    context = browser.new_context()
+    context.add_cookies([{"name": "session", "value": "x" * 200, "url": "http://127.0.0.1"}])
+    page = context.new_page()
+    page.route("http://127.0.0.1/", lambda route: route.fulfill(body=HTML, content_type="text/html"))
+    page.goto("http://127.0.0.1/")
+    page.evaluate("() => localStorage.setItem('token', 'x'.repeat(500))")
+    context.storage_state(path=str(path))
+    context.close()
+    return path
+
+
+def run(iterations: int) -> dict:
+    results = {"iterations": iterations, "context": {}, "tracing": {}}
+    with sync_playwright() as p, tempfile.TemporaryDirectory() as tmp:
+        browser = p.chromium.launch()
+        state = _storage_state(browser, Path(tmp) / "state.json")
+
+        factory = ContextFactory(browser, p, trace_dir=Path(tmp))
+        _simulate_test(factory, 2)
+        results["context"]["no_storage_state"] = _simulate_test(factory, iterations)
+        results["context"]["storage_state"] = _simulate_test(factory, iterations, storage_state=state)
+
+        for mode in TraceRecorder.MODES:
+            factory = ContextFactory(browser, p, trace_mode=mode, trace_dir=Path(tmp) / "traces")
+            results["tracing"][mode] = {
+                "passed": _simulate_test(factory, iterations),
+                "failed": _simulate_test(factory, iterations, failed=True),
+            }
+        browser.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="上下文创建和 tracing 基准")
+    parser.add_argument("--iterations", type=int, default=20, help="每种场景模拟的测试数量")
+    args = parser.parse_args()
+    print(json.dumps(run(args.iterations), indent=2))
+
+
+if __name__ == "__main__":
+    main()
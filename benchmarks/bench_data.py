@@ -0,0 +1,75 @@
+"""测试数据与断言基准
+
+    - yaml: test_data 下各 YAML 文件直接 yaml.safe_load、DataLoader 冷加载（清空进程内缓存，
+      开启 DATA_DISK_CACHE 时读取磁盘缓存）、DataLoader 热加载（命中缓存，只做深拷贝）的单次耗时
+    - assertion: Assertion.assert_equal 在各报告详细程度下与裸 assert 的单次耗时
+
+不需要浏览器。
+
+运行：
+    python -m benchmarks.bench_data --iterations 2000
+"""
+import argparse
+import json
+import yaml
+from benchmarks.common import per_call_us
+from utils.assertion import Assertion
+from utils.data_loader import DataLoader
+
+
+def _bench_yaml(iterations: int) -> dict:
+    results = {}
+    for file_path in sorted(DataLoader.DATA_DIR.rglob("*.y*ml")):
+        name = str(file_path.relative_to(DataLoader.DATA_DIR))
+        content = file_path.read_bytes()
+        load_iterations = max(iterations // 10, 1)
+
+        def cold(i):
+            DataLoader._cache.clear()
+            DataLoader.load_yaml(name)
+
+        results[name] = {
+            "bytes": len(content),
+            "safe_load_us": per_call_us(lambda i: yaml.safe_load(content), load_iterations),
+            "loader_cold_us": per_call_us(cold, load_iterations),
+            "loader_warm_us": per_call_us(lambda i: DataLoader.load_yaml(name), iterations),
+        }
+    return results
+
+
+def _bench_assertion(iterations: int) -> dict:
+    def plain(i):
+        assert i == i
+
+    results = {"plain_assert_us": per_call_us(plain, iterations)}
+    assertion = Assertion("Bench")
+    original = Assertion.verbosity
+    try:
+        for verbosity in ("full", "failures", "summary"):
+            Assertion.verbosity = verbosity
+            results[f"assert_equal_{verbosity}_us"] = per_call_us(
+                lambda i: assertion.assert_equal(i, i, "基准"), iterations
+            )
+            Assertion._passed = []
+    finally:
+        Assertion.verbosity = original
+    return results
+
+
+def run(iterations: int) -> dict:
+    return {
+        "iterations": iterations,
+        "yaml": _bench_yaml(iterations),
+        "assertion": _bench_assertion(iterations),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测试数据与断言基准")
+    parser.add_argument("--iterations", type=int, default=2000, help="热加载和断言的执行次数（冷加载为其 1/10）")
+    args = parser.parse_args()
+    print(json.dumps(run(args.iterations), indent=2))
+
+
+if __name__ == "__main__":
+    main()
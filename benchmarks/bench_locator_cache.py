@@ -0,0 +1,72 @@
+"""定位器缓存微基准
+
+对比 BasePage._get_locator 开启/关闭缓存时的单次解析耗时，以及完整动作
+（get_text）的单次耗时。页面使用本地 HTML，不依赖被测环境。
+
+运行：
+    python -m benchmarks.bench_locator_cache --iterations 5000
+"""
+import argparse
+import json
+import logging
+import time
+from playwright.sync_api import sync_playwright
+from pages.base_page import BasePage
+
+
+HTML = """
+<form>
+  <label for="plt">PLT</label><input id="plt" value="150">
+  <button type="button">保存</button>
+  <p class="text-sm mt-1 text-green-800">登录成功</p>
+</form>
+"""
+
+LOCATORS = ["#plt", ("button", "保存"), "//p[contains(@class, 'text-green-800')]"]
+
+
+class BenchPage(BasePage):
+    """基准测试用页面对象"""
+
+
+def _per_call_us(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for i in range(iterations):
+        func(LOCATORS[i % len(LOCATORS)])
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def run(iterations: int) -> dict:
+    # 基准只关心定位器本身的开销，关闭 BasePage 的日志输出
+    logging.getLogger(BenchPage.__name__).setLevel(logging.CRITICAL)
+    results = {"iterations": iterations}
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch()
+        page = browser.new_page()
+        page.set_content(HTML)
+        bench_page = BenchPage(page)
+
+        for enabled in (False, True):
+            label = "cached" if enabled else "uncached"
+            bench_page.locator_cache_enabled = enabled
+            bench_page._locator_cache.clear()
+            results[f"resolve_us_{label}"] = _per_call_us(bench_page._get_locator, iterations)
+            results[f"get_text_us_{label}"] = _per_call_us(
+                lambda loc: bench_page._get_locator(loc).text_content(), max(iterations // 10, 1)
+            )
+
+        browser.close()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="定位器缓存微基准")
+    parser.add_argument("--iterations", type=int, default=5000, help="定位器解析次数（get_text 为其 1/10）")
+    args = parser.parse_args()
+    print(json.dumps(run(args.iterations), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""异步日志微基准
+
+对比同步 FileHandler 与队列 + 后台线程两种方式下，测试线程上单条日志的耗时
+（即每个 BasePage 动作因日志产生的额外延迟）。日志写入临时目录。
+
+运行：
+    python -m benchmarks.bench_logger --records 20000
+"""
+import argparse
+import json
+import logging
+import queue
+import statistics
+import tempfile
+import time
+from logging.handlers import QueueListener
+from pathlib import Path
+from utils.logger import _BoundedQueueHandler
+
+
+FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+def _file_handler(path: Path) -> logging.Handler:
+    handler = logging.FileHandler(path, encoding="utf-8")
+    handler.setFormatter(logging.Formatter(FORMAT, datefmt="%Y-%m-%d %H:%M:%S"))
+    return handler
+
+
+def _measure(logger: logging.Logger, records: int) -> dict:
+    samples = []
+    for i in range(records):
+        start = time.perf_counter()
+        logger.info("尝试填充元素: '#plt', 内容: %s", i)
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    samples.sort()
+    return {
+        "mean_us": statistics.fmean(samples),
+        "p50_us": samples[len(samples) // 2],
+        "p99_us": samples[int(len(samples) * 0.99)],
+    }
+
+
+def run(records: int, queue_size: int) -> dict:
+    results = {"records": records, "queue_size": queue_size}
+    with tempfile.TemporaryDirectory() as tmp:
+        sync_logger = logging.getLogger("bench.sync")
+        sync_logger.propagate = False
+        sync_logger.setLevel(logging.DEBUG)
+        sync_logger.addHandler(_file_handler(Path(tmp) / "sync.log"))
+        results["sync"] = _measure(sync_logger, records)
+
+        file_handler = _file_handler(Path(tmp) / "async.log")
+        log_queue = queue.Queue(maxsize=queue_size)
+        async_logger = logging.getLogger("bench.async")
+        async_logger.propagate = False
+        async_logger.setLevel(logging.DEBUG)
+        queue_handler = _BoundedQueueHandler(log_queue, "block", 1.0)
+        async_logger.addHandler(queue_handler)
+        listener = QueueListener(log_queue, file_handler)
+        listener.start()
+        results["async"] = _measure(async_logger, records)
+        flush_start = time.perf_counter()
+        listener.stop()
+        results["async"]["flush_ms"] = (time.perf_counter() - flush_start) * 1000
+        results["async"]["dropped"] = queue_handler.dropped
+
+        for logger in (sync_logger, async_logger):
+            for handler in logger.handlers:
+                handler.close()
+        file_handler.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="异步日志微基准")
+    parser.add_argument("--records", type=int, default=20000, help="日志条数")
+    parser.add_argument("--queue-size", type=int, default=10000, help="异步队列容量")
+    args = parser.parse_args()
+    print(json.dumps(run(args.records, args.queue_size), indent=2))
+
+
+if __name__ == "__main__":
+    main()
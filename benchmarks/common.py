@@ -0,0 +1,32 @@
+"""基准测试共用的本地页面和计时工具"""
+import time
+from typing import Callable
+
+
+# 本地静态页面：不依赖被测环境，按钮点击计数，输入框和提示文本与被测站点结构一致
+HTML = """
+<!DOCTYPE html>
+<html lang="zh-CN">
+<body>
+<form>
+  <label for="username">用户名</label><input id="username">
+  <label for="plt">PLT</label><input id="plt" value="150">
+  <button type="button" onclick="this.dataset.clicks = (+this.dataset.clicks || 0) + 1">保存</button>
+  <p class="text-sm mt-1 text-green-800">登录成功</p>
+</form>
+</body>
+</html>
+"""
+
+
+def per_second(func: Callable[[int], object], iterations: int) -> float:
+    """func(i) 每秒执行次数"""
+    start = time.perf_counter()
+    for i in range(iterations):
+        func(i)
+    return iterations / (time.perf_counter() - start)
+
+
+def per_call_us(func: Callable[[int], object], iterations: int) -> float:
+    """func(i) 单次平均耗时（微秒）"""
+    return 1_000_000 / per_second(func, iterations)
@@ -1,11 +1,84 @@
+import os
+
+# 测试环境：环境变量 TEST_ENV=local 时使用本地替身服务（local_server），由 conftest 自动启动
+TEST_ENV = os.environ.get("TEST_ENV", "remote")
+LOCAL_SERVER_PORT = int(os.environ.get("LOCAL_SERVER_PORT", "8765"))
+LOCAL_SERVER_LATENCY_MS = float(os.environ.get("LOCAL_SERVER_LATENCY_MS", "0"))  # 替身服务接口延迟(毫秒)
+# 替身服务的接口路径和提示文本：是对真实应用的假设，未与真实环境核对，页面对象不依赖它们
+# （登录接口与接口登录共用下方的 LOGIN_API_PATH）
+LOCAL_BLOOD_ANALYZE_PATH = "api/blood/analyze"  # 血常规分析接口路径（相对 BASE_URL）
+LOCAL_BLOOD_SUCCESS_MESSAGE = "分析成功"  # 血常规分析成功时显示的提示
+
 # 测试环境配置
-BASE_URL = "http://101.200.193.143/"
+BASE_URL = f"http://127.0.0.1:{LOCAL_SERVER_PORT}/" if TEST_ENV == "local" else "http://101.200.193.143/"
 
 # 超时时间(毫秒)
 TIMEOUT = 30000
 
+# 测试数据加载（DataLoader）
+DATA_PRELOAD = True  # 测试会话开始时预加载 test_data 下的 YAML 数据文件（不含多文档数据集）
+DATA_PRELOAD_MAX_KB = 512  # 超过该大小的 YAML 不预加载，首次使用时再解析
+DATA_DISK_CACHE = False  # 将 YAML 解析结果按内容哈希缓存到 .cache/test_data
+
+# 定位器缓存：BasePage 按定位器缓存 Locator 对象，页面导航后失效
+LOCATOR_CACHE = True
+
+# 智能等待（BasePage.wait_for_*）
+SMART_WAIT_ADAPTIVE = True  # 根据历史耗时自适应超时时间
+SMART_WAIT_MIN_TIMEOUT = 5000  # 自适应超时下限(毫秒)
+SMART_WAIT_TIMEOUT_FACTOR = 3  # 自适应超时 = 历史 p95 × 倍数，上限为 TIMEOUT
+SMART_WAIT_IDLE_MS = 500  # 网络/DOM 静默多久视为稳定(毫秒)
+
+# 登录方式（生成认证状态时使用）
+# "api": 直接 POST 登录接口, "ui": 通过登录页面, "auto": 先尝试接口，失败后回退到页面登录
+# 登录接口路径和响应格式只在本地替身服务上确认过，远程环境默认页面登录；
+# 远程环境的接口确认后可用 LOGIN_MODE/LOGIN_API_PATH 环境变量或 pytest --login-mode 开启
+LOGIN_MODE = os.environ.get("LOGIN_MODE", "auto" if TEST_ENV == "local" else "ui")
+LOGIN_API_PATH = os.environ.get("LOGIN_API_PATH", "api/auth/login")  # 登录接口路径（相对 BASE_URL）
+LOGIN_API_TOKEN_FIELD = "token"  # 响应 JSON 中 token 的字段路径，支持 "data.token"；为空表示只依赖 cookie
+LOGIN_API_TOKEN_STORAGE_KEY = "token"  # token 写入 localStorage 时使用的 key
+
+# 浏览器上下文池（pytest --context-pool 启用）
+CONTEXT_POOL_SIZE = 2  # 每种登录状态保留的空闲上下文数量
+CONTEXT_POOL_MAX_USES = 50  # 单个上下文最多复用次数
+
+# 断言报告（utils.assertion.Assertion，可用 pytest --assert-verbosity 覆盖）
+# "full": 每个断言都附加详情, "failures": 只有失败的断言附加详情, "summary": 通过的断言汇总为一个附件
+ASSERTION_VERBOSITY = "full"
+ASSERTION_MAX_VALUE_LENGTH = 500  # 步骤标题、附件和日志中的值超过此长度时截断（字符）
+ASSERTION_TIMEOUT = TIMEOUT  # 页面断言（assert_is_display、assert_text 等）自动重试的超时时间(毫秒)，默认与页面操作超时相同
+
+# BasePage 操作耗时统计（按定位器/页面汇总 p50/p95/p99，会话结束写入 test-results/action_timings.json）
+ACTION_TIMING = True
+
+# 测试耗时回退检查（pytest --perf-gate 等覆盖），基线为 test-results/perf_baseline.json
+PERF_GATE = "warn"  # "off": 不检查, "warn": 只输出回退, "fail": 有回退时运行失败
+PERF_REGRESSION_PCT = 50  # 耗时相对基线中位数增加超过该百分比
+PERF_REGRESSION_SECONDS = 0.5  # 并且增加超过该秒数时才视为回退
+
+# Tracing（pytest --trace-mode 选择模式）
+TRACE_CHUNKS = 5  # chunks 模式每块包含的顶层 Allure 步骤数，失败时保存当前块（最近 1~N 个步骤）
+
+# 网络拦截预设（utils.network_blocker.NETWORK_PROFILES，可用 pytest --network-profile 覆盖）
+# "none": 不拦截, "no-media": 拦截图片/音视频/字体, "forms-only": 另外拦截统计脚本等表单测试不需要的请求
+NETWORK_PROFILE = "none"
+
+# HAR 录制/回放（utils.har_replay.HarReplay，可用 pytest --har-mode 覆盖）
+# "off", "record" 重新录制, "replay" 回放且未命中时访问后端并追加, "replay-strict" 只回放（离线）
+HAR_MODE = "off"
+HAR_URL_PATTERN = "**/api/**"  # 通过 HAR 录制/回放的请求；离线运行整个站点可设为 "**/*"
+
+# 报告附件（trace、失败截图）
+ATTACHMENT_MAX_MB = 200  # 超过该大小的附件不复制到 Allure 结果目录，只记录路径；0 表示不限制
+SCREENSHOT_FULL_PAGE = True  # 失败截图是否截取整个页面
+SCREENSHOT_FORMAT = "png"  # 失败截图格式: "png" 无损, "jpeg" 压缩（体积通常小很多）
+SCREENSHOT_JPEG_QUALITY = 70  # jpeg 截图质量 (0-100)
+
 # 浏览器无头模式
 HEADLESS = False
+
+# 复用常驻浏览器服务（pytest --reuse-browser），停止服务: python -m utils.browser_server stop
+REUSE_BROWSER = False
 # # 有头模式运行
 #   pytest --headed
 
@@ -24,3 +97,9 @@ HEADLESS = False
 LOG_LEVEL = "INFO"  # DEBUG, INFO, WARNING, ERROR
 LOG_TO_CONSOLE = False  # 是否输出到控制台
 LOG_TO_FILE = True  # 是否输出到文件
+LOG_FORMAT = "text"  # 日志格式: "text" 文本, "json" JSON Lines（文件后缀 .jsonl）
+LOG_ASYNC = True  # 异步日志：日志记录放入队列，由后台线程格式化并写入
+LOG_QUEUE_SIZE = 10000  # 异步日志队列容量（条），限制内存占用
+LOG_QUEUE_POLICY = "block"  # 队列满时的策略: "block" 等待队列空出, "drop" 直接丢弃
+LOG_QUEUE_BLOCK_TIMEOUT = 1.0  # block 策略最长等待时间（秒），超时后丢弃
+LOG_FLUSH_TIMEOUT = 10.0  # 会话结束时等待队列中日志写完的最长时间（秒）
@@ -1,10 +1,34 @@
 import allure
 import pytest
-from playwright.sync_api import Browser
+from playwright.sync_api import Browser, BrowserType, Playwright
 from pathlib import Path
-from config.config import HEADLESS, BASE_URL
-import time
+from typing import Optional, Tuple
+from config.config import (
+    HEADLESS, DATA_PRELOAD, LOGIN_MODE, CONTEXT_POOL_SIZE, CONTEXT_POOL_MAX_USES, ASSERTION_VERBOSITY, TRACE_CHUNKS,
+    NETWORK_PROFILE, HAR_MODE, HAR_URL_PATTERN, TEST_ENV, LOCAL_SERVER_PORT, LOCAL_SERVER_LATENCY_MS,
+    PERF_GATE, PERF_REGRESSION_PCT, PERF_REGRESSION_SECONDS, REUSE_BROWSER
+)
+from local_server import start_in_thread
+from utils.action_timing import ActionTimings
+from utils.assertion import Assertion
+from utils.attachments import Attachments
+from utils.auth_state import AuthStateCache
+from utils.browser_server import BrowserServer
+from utils.context_factory import ContextFactory
+from utils.context_pool import ContextPool
+from utils.data_loader import DataLoader
+from utils.dataset import Dataset
+from utils.har_replay import HarReplay
+from utils.logger import Logger
+from utils.network_blocker import NETWORK_PROFILES, NetworkBlocker
+from utils.perf_report import PerfReport
+from utils.sleep_report import SleepRecorder
+from utils.trace_recorder import TraceRecorder
+from utils.wait_history import WaitHistory
 import os
+import re
+import time
+import uuid
 from datetime import datetime
 
 
@@ -15,9 +39,20 @@ STORAGE_STATE_PATH = Path(__file__).parent / "test_data" / "auth_state.json"
 # 可根据实际 token 过期时间调整，默认 1 小时
 AUTH_STATE_EXPIRY = 60 * 60  # 1 hour
 
+# 默认登录角色（login/login_data.yaml 中的账号 key），其状态保存在 STORAGE_STATE_PATH
+# 其他角色保存在同目录的 auth_state_<role>.json
+DEFAULT_AUTH_ROLE = "valid_user"
+
+# 并行模式下等待其他 worker 完成登录的最长时间（秒）
+# 每个角色的状态文件都有对应的 .lock 文件锁，保证整个测试会话只登录一次
+AUTH_LOCK_TIMEOUT = 120
+
 # Trace 文件保存路径
 TRACE_DIR = Path(__file__).parent / "test-results"
 
+# HAR 录制文件目录，按 tests/ 下的模块路径组织：test_data/har/<模块>/<测试文件>/<测试名>.har
+HAR_DIR = Path(__file__).parent / "test_data" / "har"
+
 
 def pytest_addoption(parser):
     """添加自定义命令行选项"""
@@ -25,93 +60,336 @@ def pytest_addoption(parser):
         "--trace-mode",
         action="store",
         default="off",
-        help="启用 Playwright tracing: 'on' 所有测试, 'retain-on-failure' 仅失败测试保留, 'off' 禁用 (默认)"
+        choices=list(TraceRecorder.MODES),
+        help="启用 Playwright tracing: 'on' 所有测试, 'retain-on-failure' 仅失败测试保留, "
+             "'chunks' 按步骤分块录制、失败时只保存最近的块（通过的测试不导出）, 'off' 禁用 (默认)"
+    )
+    parser.addoption(
+        "--trace-chunks",
+        action="store",
+        type=int,
+        default=TRACE_CHUNKS,
+        help=f"chunks 模式每块包含的顶层步骤数，失败时保存最近 1~N 个步骤 (默认 {TRACE_CHUNKS})"
+    )
+    parser.addoption(
+        "--reuse-browser",
+        action="store_true",
+        default=REUSE_BROWSER,
+        help="连接常驻的浏览器服务（首次运行时启动），不再每次运行都启动浏览器；"
+             "停止服务: python -m utils.browser_server stop"
+    )
+    parser.addoption(
+        "--context-pool",
+        action="store_true",
+        default=False,
+        help="复用预热的浏览器上下文：测试结束后重置上下文而不是关闭重建"
+    )
+    parser.addoption(
+        "--context-pool-size",
+        action="store",
+        type=int,
+        default=CONTEXT_POOL_SIZE,
+        help=f"每种登录状态保留的空闲上下文数量 (默认 {CONTEXT_POOL_SIZE})"
+    )
+    parser.addoption(
+        "--auth-check",
+        action="store",
+        default="offline",
+        choices=["offline", "browser"],
+        help="认证状态验证方式: 'offline' 解析 cookie/JWT 过期时间，无法判断时再用浏览器验证 (默认), "
+             "'browser' 始终打开页面验证"
+    )
+    parser.addoption(
+        "--login-mode",
+        action="store",
+        default=LOGIN_MODE,
+        choices=["auto", "api", "ui"],
+        help=f"生成认证状态的登录方式: 'api' 调用登录接口, 'ui' 页面登录, 'auto' 先接口后页面 (默认 {LOGIN_MODE})"
+    )
+    parser.addoption(
+        "--dataset-sample",
+        action="store",
+        type=int,
+        default=None,
+        help="数据驱动用例随机抽取的行数（冒烟运行），默认执行全部行"
+    )
+    parser.addoption(
+        "--dataset-shard",
+        action="store",
+        default=None,
+        help="数据驱动用例分片，格式 K/N（第 K 片，共 N 片），用于多台机器分摊大数据集"
+    )
+    parser.addoption(
+        "--dataset-seed",
+        action="store",
+        type=int,
+        default=0,
+        help="--dataset-sample 抽样的随机种子 (默认 0)"
+    )
+    parser.addoption(
+        "--sleep-report",
+        action="store_true",
+        default=False,
+        help="统计测试中 page.wait_for_timeout 固定等待的调用位置和总耗时，会话结束时输出"
+    )
+    parser.addoption(
+        "--network-profile",
+        action="store",
+        default=NETWORK_PROFILE,
+        choices=list(NETWORK_PROFILES),
+        help="网络拦截预设: 'none' 不拦截, 'no-media' 拦截图片/音视频/字体, "
+             f"'forms-only' 另外拦截统计脚本等 (默认 {NETWORK_PROFILE})；单个测试可用 @pytest.mark.context(network_profile=...)"
+    )
+    parser.addoption(
+        "--har-mode",
+        action="store",
+        default=HAR_MODE,
+        choices=list(HarReplay.MODES),
+        help="后端接口 HAR 录制/回放: 'record' 重新录制, 'replay' 回放且未命中时访问后端并追加, "
+             f"'replay-strict' 只回放, 'off' 禁用 (默认 {HAR_MODE})"
+    )
+    parser.addoption(
+        "--assert-verbosity",
+        action="store",
+        default=ASSERTION_VERBOSITY,
+        choices=["full", "failures", "summary"],
+        help="断言在 Allure 中的详细程度: 'full' 全部附加详情, 'failures' 仅失败附加详情, "
+             f"'summary' 通过的断言汇总为一个附件 (默认 {ASSERTION_VERBOSITY})"
+    )
+    parser.addoption(
+        "--perf-gate",
+        action="store",
+        default=PERF_GATE,
+        choices=["off", "warn", "fail"],
+        help="测试耗时与基线比较: 'warn' 输出回退项, 'fail' 有回退时运行失败, 'off' 不比较 "
+             f"(默认 {PERF_GATE})"
+    )
+    parser.addoption(
+        "--perf-threshold-pct",
+        action="store",
+        type=float,
+        default=PERF_REGRESSION_PCT,
+        help=f"耗时相对基线增加超过该百分比才视为回退，0 表示只看绝对值 (默认 {PERF_REGRESSION_PCT})"
+    )
+    parser.addoption(
+        "--perf-threshold-seconds",
+        action="store",
+        type=float,
+        default=PERF_REGRESSION_SECONDS,
+        help=f"耗时相对基线增加超过该秒数才视为回退，0 表示只看百分比 (默认 {PERF_REGRESSION_SECONDS})"
+    )
+    parser.addoption(
+        "--perf-update-baseline",
+        action="store_true",
+        default=False,
+        help="把本次通过的测试耗时追加到基线（每项保留最近 5 次，按中位数比较）"
     )
 
 
-@pytest.fixture(scope="session")
-def browser_type_launch_args():
-    return {"headless": HEADLESS}
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """并行模式（pytest-xdist）下的配置调整，应用断言报告详细程度，本地环境下启动替身服务"""
+    Assertion.verbosity = config.getoption("--assert-verbosity")
+    # 分片参数在收集前校验，错误时直接报用法错误
+    _dataset_shard(config)
+
+    # 运行标识：主进程生成后通过 --testrunuid 传给 xdist worker，各进程的统计按同一标识合并
+    # （PYTEST_XDIST_TESTRUNUID 环境变量只在 worker 中存在）
+    if hasattr(config, "workerinput"):
+        run_id = config.workerinput["testrunuid"]
+    else:
+        if not getattr(config.option, "testrunuid", None):
+            config.option.testrunuid = uuid.uuid4().hex
+        run_id = config.option.testrunuid
+    PerfReport.run_id = TraceRecorder.run_id = run_id
+
+    # 只允许主进程清理 allure-results，避免后启动的 worker 删除其他 worker 已写入的结果
+    if hasattr(config, "workerinput"):
+        config.option.clean_alluredir = False
+        return
+
+    # 清理上次运行的 trace 和截图；test-results 下的 JSON（等待历史、耗时基线等）跨运行保留
+    if TRACE_DIR.is_dir():
+        for path in TRACE_DIR.iterdir():
+            if path.is_file() and path.suffix in (".zip", ".png", ".jpg", ".jpeg"):
+                path.unlink()
+
+    if TEST_ENV == "local":
+        # 由主进程启动一次，所有 worker 共用；端口已被占用时视为已手动启动（python -m local_server）
+        try:
+            start_in_thread(port=LOCAL_SERVER_PORT, latency_ms=LOCAL_SERVER_LATENCY_MS)
+            print(f"✓ 本地替身服务已启动: 端口 {LOCAL_SERVER_PORT}, 接口延迟 {LOCAL_SERVER_LATENCY_MS:.0f}ms")
+        except OSError:
+            print(f"ℹ 端口 {LOCAL_SERVER_PORT} 已被占用，使用已运行的本地替身服务")
+
+
+def pytest_sessionstart(session):
+    """会话开始：预加载测试数据，后续 DataLoader 调用直接命中缓存"""
+    if DATA_PRELOAD:
+        DataLoader.preload()
+
+
+def pytest_sessionfinish(session):
+    """会话结束：保存智能等待历史耗时、trace 开销和操作耗时，输出统计和 Allure 结果大小，
+    检查测试耗时回退，确保异步日志全部写入"""
+    WaitHistory.save()
+    TraceRecorder.save()
+    NetworkBlocker.save()
+    ActionTimings.save()
+    PerfReport.save()
+    is_worker = hasattr(session.config, "workerinput")
+    if not is_worker:
+        _check_perf(session)
+    if session.config.getoption("--sleep-report"):
+        print(f"\n{SleepRecorder.summary()}")
+    if NetworkBlocker.totals["tests"]:
+        print(f"\n{NetworkBlocker.session_summary()}")
+    timings = ActionTimings.load() if ActionTimings.enabled and not is_worker else None
+    if timings:
+        print(f"\nℹ 操作耗时已导出: {ActionTimings.EXPORT_PATH}\n{ActionTimings.summary(timings)}")
+    if session.config.getoption("--trace-mode") != "off" and not is_worker:
+        print(f"\n{TraceRecorder.summary(TraceRecorder.load())}")
+    alluredir = getattr(session.config.option, "allure_report_dir", None)
+    if alluredir and not is_worker and Path(alluredir).is_dir():
+        files = [f for f in Path(alluredir).iterdir() if f.is_file()]
+        size = sum(f.stat().st_size for f in files)
+        print(f"\nℹ Allure 结果: {len(files)} 个文件, {size / 1024:.1f} KB "
+              f"(断言详细程度: {Assertion.verbosity})")
+    Logger.flush()
+
+
+def _check_perf(session):
+    """输出本次测试耗时，与基线比较；基线中没有的测试自动加入基线"""
+    config = session.config
+    tests = PerfReport.load()
+    if not tests:
+        return
+    print(f"\n{PerfReport.summary(tests)}")
+    gate = config.getoption("--perf-gate")
+    if gate != "off":
+        regressions = PerfReport.compare(
+            tests, config.getoption("--perf-threshold-pct"), config.getoption("--perf-threshold-seconds")
+        )
+        if regressions:
+            print(f"⚠ {PerfReport.format_regressions(regressions)}")
+            if gate == "fail" and session.exitstatus == pytest.ExitCode.OK:
+                session.exitstatus = pytest.ExitCode.TESTS_FAILED
+        else:
+            print("✓ 测试耗时未超过基线阈值")
+    if config.getoption("--perf-update-baseline"):
+        print(f"✓ 已更新 {PerfReport.update_baseline(tests)} 个测试的耗时基线: {PerfReport.BASELINE_PATH}")
+    else:
+        added = PerfReport.update_baseline(tests, only_new=True)
+        if added:
+            print(f"ℹ {added} 个新测试已加入耗时基线: {PerfReport.BASELINE_PATH}")
 
 
-@pytest.fixture(scope="session")
-def browser_context_args():
-    """配置浏览器上下文参数"""
-    return {"viewport": {"width": 1920, "height": 1080}}
+def _dataset_shard(config) -> Optional[Tuple[int, int]]:
+    """解析 --dataset-shard K/N，格式错误或不满足 1 <= K <= N 时报用法错误"""
+    shard = config.getoption("--dataset-shard")
+    if not shard:
+        return None
+    try:
+        number, total = (int(part) for part in shard.split("/"))
+    except ValueError:
+        raise pytest.UsageError(f"--dataset-shard 格式应为 K/N，实际为: {shard}")
+    if not 1 <= number <= total:
+        raise pytest.UsageError(f"--dataset-shard 要求 1 <= K <= N，实际为: {shard}")
+    return number, total
 
 
-def _is_auth_state_valid(browser: Browser) -> bool:
+def pytest_generate_tests(metafunc):
     """
-    验证保存的认证状态是否仍然有效
-    通过尝试访问需要认证的页面并检查关键元素来判断
+    数据驱动参数化：使用 dataset_row 的测试按 @pytest.mark.dataset("文件") 指定的数据集生成用例
+    收集阶段只生成行号，行数据在测试执行时才读取
     """
-    if not STORAGE_STATE_PATH.exists():
-        return False
+    if "dataset_row" not in metafunc.fixturenames:
+        return
+    marker = metafunc.definition.get_closest_marker("dataset")
+    if not marker:
+        raise ValueError(f"{metafunc.definition.nodeid} 使用了 dataset_row，但没有 @pytest.mark.dataset 标记")
+
+    indices = Dataset.open(marker.args[0]).select(
+        sample=metafunc.config.getoption("--dataset-sample"),
+        shard=_dataset_shard(metafunc.config),
+        seed=metafunc.config.getoption("--dataset-seed")
+    )
+    metafunc.parametrize("dataset_row", indices, indirect=True, ids=[f"row{i}" for i in indices])
 
-    try:
-        # 创建使用保存状态的临时上下文
-        context = browser.new_context(storage_state=str(STORAGE_STATE_PATH))
-        page = context.new_page()
 
-        # 访问主页
-        page.goto(BASE_URL, timeout=10000)
-        page.wait_for_timeout(1000)
+@pytest.fixture(scope="function")
+def dataset_row(request) -> dict:
+    """当前用例对应的数据集行（按行号从文件中流式读取）"""
+    marker = request.node.get_closest_marker("dataset")
+    return Dataset.open(marker.args[0]).row(request.param)
 
-        # 检查是否存在登录后才有的元素（如"用药记录"按钮）
-        # 如果找到该元素，说明认证有效；否则可能跳转到了登录页
-        try:
-            page.wait_for_selector("button:has-text('用药记录')", timeout=5000)
-            context.close()
-            return True
-        except:
-            context.close()
-            return False
 
-    except Exception as e:
-        print(f"⚠ 验证认证状态失败: {e}")
-        return False
+def _worker_id() -> str:
+    """当前 worker 标识：并行模式下为 gw0、gw1 ...，串行模式下为 master"""
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
 
 
-def _perform_login(browser: Browser) -> Path:
-    """
-    执行登录并保存认证状态
-    """
-    # 创建临时上下文进行登录
-    context = browser.new_context()
-    page = context.new_page()
+@pytest.fixture(scope="session")
+def browser_type_launch_args():
+    return {"headless": HEADLESS}
 
-    try:
-        # 执行登录流程
-        from pages.common.login.login_page import LoginPage
-        from utils.data_loader import DataLoader
 
-        login_data = DataLoader.get_test_data("login/login_data.yaml", "valid_user")
-        login_page = LoginPage(page)
-        login_page.open()
-        login_page.login(login_data["username"], login_data["password"])
+@pytest.fixture(scope="session")
+def browser_server(browser_type: BrowserType, browser_type_launch_args: dict, pytestconfig) -> Optional[BrowserServer]:
+    """--reuse-browser 时的常驻浏览器服务，否则为 None"""
+    if not pytestconfig.getoption("--reuse-browser"):
+        return None
+    return BrowserServer(browser_type.name, browser_type_launch_args)
 
-        # 等待登录成功 - 等待特定元素出现确保登录完成
-        try:
-            page.wait_for_selector("button:has-text('用药记录')", timeout=5000)
-            print("✓ 登录成功，已检测到主页元素")
-        except:
-            print("⚠ 警告：未检测到登录后的主页元素，但继续保存状态")
-            page.wait_for_timeout(2000)
 
-        # 保存认证状态
-        STORAGE_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
-        context.storage_state(path=str(STORAGE_STATE_PATH))
+@pytest.fixture(scope="session")
+def browser(launch_browser, browser_server: Optional[BrowserServer], browser_type: BrowserType):
+    """
+    覆盖 pytest-playwright 的 browser fixture
+    --reuse-browser 时连接常驻浏览器服务（服务不可用时自动重启），会话结束只断开连接；否则启动新浏览器
+    """
+    if browser_server is None:
+        browser = launch_browser()
+    else:
+        start = time.perf_counter()
+        browser = browser_server.shared_browser(browser_type)
+        print(f"✓ 已连接常驻浏览器服务 ({(time.perf_counter() - start) * 1000:.0f}ms)")
+    yield browser
+    if browser_server is None:
+        browser.close()
+    else:
+        # 服务重启后 browser 已是失效连接，断开的是重连后的共享连接
+        browser_server.disconnect()
 
-        print(f"✓ 登录状态已保存到: {STORAGE_STATE_PATH}")
 
-    finally:
-        context.close()
+@pytest.fixture(scope="session")
+def browser_context_args(browser_context_args):
+    """配置浏览器上下文参数：默认 1920x1080 视口，保留 pytest-playwright 的 --device、--base-url 等参数"""
+    return {"viewport": {"width": 1920, "height": 1080}, **browser_context_args}
 
-    return STORAGE_STATE_PATH
+
+@pytest.fixture(scope="session")
+def auth_state_cache(browser: Browser, playwright: Playwright, browser_server: Optional[BrowserServer],
+                     browser_type: BrowserType, request) -> AuthStateCache:
+    """
+    Session级别的多账号认证状态缓存
+    每个角色（login/login_data.yaml 中的账号）一个 storage state 文件，首次使用时才登录
+    """
+    return AuthStateCache(
+        browser,
+        STORAGE_STATE_PATH.parent,
+        default_role=DEFAULT_AUTH_ROLE,
+        expiry=AUTH_STATE_EXPIRY,
+        check_mode=request.config.getoption("--auth-check"),
+        lock_timeout=AUTH_LOCK_TIMEOUT,
+        playwright=playwright,
+        login_mode=request.config.getoption("--login-mode"),
+        reconnect=(lambda: browser_server.shared_browser(browser_type)) if browser_server else None
+    )
 
 
 @pytest.fixture(scope="session")
-def authenticated_state(browser: Browser) -> Path:
+def authenticated_state(auth_state_cache: AuthStateCache) -> Path:
     """
     Session级别的fixture，执行一次登录并保存认证状态
     其他测试可以复用这个状态，避免重复登录
@@ -119,117 +397,132 @@ def authenticated_state(browser: Browser) -> Path:
     自动检测功能：
     1. 检查文件是否存在
     2. 检查文件是否过期（基于修改时间）
-    3. 验证认证状态是否有效（尝试访问需要认证的页面）
+    3. 验证认证状态是否有效（默认离线解析过期时间，必要时访问需要认证的页面）
     4. 如果无效或过期，自动重新登录
-    """
-    need_refresh = False
-
-    # 检查1：文件是否存在
-    if not STORAGE_STATE_PATH.exists():
-        print("ℹ 认证状态文件不存在，需要登录")
-        need_refresh = True
-
-    # 检查2：文件是否过期（基于修改时间）
-    elif time.time() - os.path.getmtime(STORAGE_STATE_PATH) > AUTH_STATE_EXPIRY:
-        print(f"ℹ 认证状态文件已过期（超过 {AUTH_STATE_EXPIRY/3600} 小时），需要重新登录")
-        need_refresh = True
-
-    # 检查3：验证认证状态是否有效
-    elif not _is_auth_state_valid(browser):
-        print("ℹ 认证状态已失效，需要重新登录")
-        need_refresh = True
-    else:
-        print("✓ 使用现有有效的认证状态")
-
-    # 如果需要刷新，删除旧文件并重新登录
-    if need_refresh:
-        if STORAGE_STATE_PATH.exists():
-            STORAGE_STATE_PATH.unlink()
-        return _perform_login(browser)
 
-    return STORAGE_STATE_PATH
+    并行模式（pytest -n N）下通过文件锁保证所有 worker 只登录一次
+    """
+    return auth_state_cache.get(DEFAULT_AUTH_ROLE)
 
 
 @pytest.fixture(scope="function")
-def page(browser: Browser, request):
-    """默认的page fixture，不带登录状态"""
-    tracing_option = request.config.getoption("--trace-mode")
+def auth_role(request) -> str:
+    """
+    当前测试使用的登录角色，默认 valid_user
 
-    context = browser.new_context(viewport={"width": 1920, "height": 1080})
-    page = context.new_page()
+    角色必须是 login/login_data.yaml 中的账号 key，新角色先在该文件中添加账号
 
-    # 启动 tracing
-    if tracing_option in ["on", "retain-on-failure"]:
-        context.tracing.start(screenshots=True, snapshots=True, sources=True)
+    指定方式：
+    1. 标记：@pytest.mark.auth_role("valid_user")
+    2. 参数化：@pytest.mark.parametrize("auth_role", ["valid_user", "<其他账号 key>"], indirect=True)
+    """
+    if hasattr(request, "param"):
+        return request.param
+    marker = request.node.get_closest_marker("auth_role")
+    if marker:
+        return marker.args[0]
+    return DEFAULT_AUTH_ROLE
 
-    yield page
 
-    # 停止并保存 tracing
-    if tracing_option in ["on", "retain-on-failure"]:
-        # 获取测试结果
-        test_failed = hasattr(request.node, 'rep_call') and request.node.rep_call.failed
+@pytest.fixture(scope="function")
+def role_auth_state(auth_state_cache: AuthStateCache, auth_role: str) -> Path:
+    """当前角色的认证状态文件，同一会话内每个角色只检查/登录一次"""
+    start = time.perf_counter()
+    path = auth_state_cache.get(auth_role)
+    PerfReport.record("auth_state", time.perf_counter() - start)
+    return path
 
-        # 根据策略决定是否保存 trace
-        should_save = (tracing_option == "on") or (tracing_option == "retain-on-failure" and test_failed)
 
-        if should_save:
-            TRACE_DIR.mkdir(parents=True, exist_ok=True)
-            # 生成文件名：测试方法名（去除参数）+ 时间戳
-            test_name = request.node.name.split('[')[0]  # 去除 [chromium] 等参数
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            trace_path = TRACE_DIR / f"{test_name}_{timestamp}.zip"
-            context.tracing.stop(path=str(trace_path))
+@pytest.fixture(scope="session")
+def context_pool(browser: Browser, browser_context_args: dict, request):
+    """
+    Session级别的浏览器上下文池，仅在 --context-pool 时启用，否则为 None
+    会话结束时输出命中/未命中/重置统计
+    """
+    if not request.config.getoption("--context-pool"):
+        yield None
+        return
+
+    pool = ContextPool(
+        browser,
+        browser_context_args,
+        size=request.config.getoption("--context-pool-size"),
+        max_uses=CONTEXT_POOL_MAX_USES
+    )
+    yield pool
 
-            # 将 trace 路径保存到 request.node，供 hook 使用
-            request.node._trace_path = trace_path
-        else:
-            context.tracing.stop()
+    print(f"\n✓ {pool.summary()}")
+    pool.close()
 
-    context.close()
 
+@pytest.fixture(scope="session")
+def context_factory(browser: Browser, playwright: Playwright, browser_context_args: dict, context_pool,
+                    browser_server: Optional[BrowserServer], browser_type: BrowserType, request) -> ContextFactory:
+    """Session级别的上下文工厂，所有 page 类 fixture 通过它创建和回收浏览器上下文
+    创建/回收/trace 耗时计入当前测试的 PerfReport 细分"""
+    factory = ContextFactory(
+        browser,
+        playwright,
+        browser_context_args,
+        pool=context_pool,
+        trace_mode=request.config.getoption("--trace-mode"),
+        trace_dir=TRACE_DIR,
+        trace_chunks=request.config.getoption("--trace-chunks"),
+        sleep_report=request.config.getoption("--sleep-report"),
+        network_profile=request.config.getoption("--network-profile"),
+        har_mode=request.config.getoption("--har-mode"),
+        har_url_pattern=HAR_URL_PATTERN,
+        reconnect=(lambda: browser_server.shared_browser(browser_type)) if browser_server else None
+    )
+    factory.on("create", lambda name, seconds: PerfReport.record("context_create", seconds))
+    factory.on("teardown", lambda name, seconds: PerfReport.record("context_teardown", seconds))
+    factory.on("trace", lambda name, seconds: PerfReport.record("trace_stop", seconds))
+    return factory
 
-@pytest.fixture(scope="function")
-def authenticated_page(browser: Browser, authenticated_state: Path, request):
-    """
-    带登录状态的page fixture
-    使用方法：在测试函数参数中使用 authenticated_page 替代 page
-    """
-    tracing_option = request.config.getoption("--trace-mode")
 
-    context = browser.new_context(
-        storage_state=str(authenticated_state),
-        viewport={"width": 1920, "height": 1080}
+def _har_path(request) -> Path:
+    """当前测试的 HAR 文件路径，参数化用例按参数分别保存"""
+    module = Path(request.node.fspath).with_suffix("")
+    try:
+        module = module.relative_to(Path(__file__).parent / "tests")
+    except ValueError:
+        module = Path(module.name)
+    file_name = re.sub(r"[^\w.-]+", "_", request.node.name).strip("_")
+    return HAR_DIR / module / f"{file_name}.har"
+
+
+def _open_page(context_factory: ContextFactory, request, storage_state: Optional[Path] = None):
+    """创建测试页面，测试结束后回收；@pytest.mark.context(...) 的参数传给 ContextFactory.open"""
+    marker = request.node.get_closest_marker("context")
+    options = marker.kwargs if marker else {}
+
+    # trace 文件名：测试方法名（去除 [chromium] 等参数）+ worker，时间戳由录制器添加
+    test_name = request.node.name.split('[')[0]
+    session = context_factory.open(
+        f"{test_name}_{_worker_id()}", storage_state=storage_state, har=_har_path(request), **options
     )
-    page = context.new_page()
 
-    # 启动 tracing
-    if tracing_option in ["on", "retain-on-failure"]:
-        context.tracing.start(screenshots=True, snapshots=True, sources=True)
+    yield session.page
 
-    yield page
+    # 保存的 trace 文件路径记录到 request.node，供 hook 附加到报告
+    test_failed = hasattr(request.node, 'rep_call') and request.node.rep_call.failed
+    request.node._trace_paths = context_factory.close(session, failed=test_failed)
 
-    # 停止并保存 tracing
-    if tracing_option in ["on", "retain-on-failure"]:
-        # 获取测试结果
-        test_failed = hasattr(request.node, 'rep_call') and request.node.rep_call.failed
 
-        # 根据策略决定是否保存 trace
-        should_save = (tracing_option == "on") or (tracing_option == "retain-on-failure" and test_failed)
-
-        if should_save:
-            TRACE_DIR.mkdir(parents=True, exist_ok=True)
-            # 生成文件名：测试方法名（去除参数）+ 时间戳
-            test_name = request.node.name.split('[')[0]  # 去除 [chromium] 等参数
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            trace_path = TRACE_DIR / f"{test_name}_{timestamp}.zip"
-            context.tracing.stop(path=str(trace_path))
+@pytest.fixture(scope="function")
+def page(context_factory: ContextFactory, request):
+    """默认的page fixture，不带登录状态"""
+    yield from _open_page(context_factory, request)
 
-            # 将 trace 路径保存到 request.node，供 hook 使用
-            request.node._trace_path = trace_path
-        else:
-            context.tracing.stop()
 
-    context.close()
+@pytest.fixture(scope="function")
+def authenticated_page(context_factory: ContextFactory, role_auth_state: Path, request):
+    """
+    带登录状态的page fixture
+    使用方法：在测试函数参数中使用 authenticated_page 替代 page
+    默认使用 valid_user 登录，可通过 auth_role 切换角色
+    """
+    yield from _open_page(context_factory, request, role_auth_state)
 
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
@@ -241,17 +534,26 @@ def pytest_runtest_makereport(item, call):  # noqa: ARG001
     # 保存测试结果到 item，供 fixture 使用
     setattr(item, f"rep_{report.when}", report)
 
+    # summary 模式：当前阶段通过的断言汇总为一个附件
+    Assertion.flush_summary()
+
+    # 各阶段耗时，teardown 后归入本测试（call 通过的测试才参与基线比较）
+    PerfReport.add_phase(report.when, report.duration)
+    if report.when == "teardown":
+        call_report = getattr(item, "rep_call", None)
+        PerfReport.finish_test(item.nodeid, passed=bool(call_report and call_report.passed) and report.passed)
+
     if report.when == "call" and report.failed:
         # 获取页面对象（支持 page 和 authenticated_page）
         page = item.funcargs.get("page") or item.funcargs.get("authenticated_page")
         if page:
             try:
-                # 截图
-                screenshot_bytes = page.screenshot(full_page=True)
-                allure.attach(
-                    screenshot_bytes,
-                    name=f"失败截图_{item.name}",
-                    attachment_type=allure.attachment_type.PNG
+                # 截图写入文件后附加，不在内存中保留截图数据
+                test_name = item.name.split('[')[0]
+                Attachments.attach_screenshot(
+                    page,
+                    TRACE_DIR / f"{test_name}_{_worker_id()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                    name=f"失败截图_{item.name}"
                 )
 
                 # 附加页面 URL
@@ -263,19 +565,20 @@ def pytest_runtest_makereport(item, call):  # noqa: ARG001
             except Exception as e:
                 print(f"截图失败: {e}")
 
-    # 在 teardown 完成后附加 trace（如果存在）
-    if report.when == "teardown" and hasattr(item, '_trace_path'):
-        trace_path = item._trace_path
-        if trace_path.exists():
+    # 在 teardown 完成后附加 trace（如果存在），由 Allure 直接复制文件，不读入内存
+    if report.when == "teardown":
+        # 本测试各 BasePage 操作的耗时：统计总是取出，只在测试失败时附加，通过的测试不增加附件
+        records = ActionTimings.take_test(item.nodeid)
+        failed = any(getattr(item, f"rep_{when}", report).failed for when in ("setup", "call", "teardown"))
+        if records and failed:
+            allure.attach(ActionTimings.format_records(records), name="操作耗时",
+                          attachment_type=allure.attachment_type.TEXT)
+        for trace_path in getattr(item, '_trace_paths', []):
+            if not trace_path.exists():
+                continue
             try:
                 # 使用文件名（去除 .zip 扩展名）作为附件名称
-                trace_name = trace_path.stem  # 例如：test_click_mar_tab_20251230_194328
-                with open(trace_path, 'rb') as f:
-                    allure.attach(
-                        f.read(),
-                        name=f"Trace_{trace_name}",
-                        attachment_type="application/zip",
-                        extension="zip"
-                    )
+                trace_name = trace_path.stem  # 例如：test_click_mar_tab_gw0_20251230_194328
+                Attachments.attach_file(trace_path, f"Trace_{trace_name}", "application/zip", "zip")
             except Exception as e:
                 print(f"附加 trace 失败: {e}")
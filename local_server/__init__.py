@@ -0,0 +1,7 @@
+"""本地替身服务：提供登录、用药记录、血常规录入流程，元素 ID 和角色与被测站点一致
+
+TEST_ENV=local 时 conftest 自动启动，也可以单独运行：python -m local_server
+"""
+from local_server.server import create_server, start_in_thread
+
+__all__ = ["create_server", "start_in_thread"]
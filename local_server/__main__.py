@@ -0,0 +1,25 @@
+import argparse
+from config.config import LOCAL_SERVER_PORT, LOCAL_SERVER_LATENCY_MS
+from local_server.server import create_server
+
+
+def main():
+    """命令行入口：python -m local_server [--port 8765] [--latency 200]"""
+    parser = argparse.ArgumentParser(description="本地替身服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=LOCAL_SERVER_PORT)
+    parser.add_argument("--latency", type=float, default=LOCAL_SERVER_LATENCY_MS, help="接口响应延迟（毫秒）")
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port, args.latency)
+    print(f"✓ 本地替身服务已启动: http://{args.host}:{server.server_port}/ (接口延迟 {args.latency:.0f}ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
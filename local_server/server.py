@@ -0,0 +1,218 @@
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from http.cookies import SimpleCookie
+from pathlib import Path
+from typing import Dict, Optional
+from config.config import LOGIN_API_PATH, LOCAL_BLOOD_ANALYZE_PATH, LOCAL_BLOOD_SUCCESS_MESSAGE
+from utils.data_loader import DataLoader
+
+
+STATIC_DIR = Path(__file__).parent / "static"
+
+# 会话 token 的签名密钥：token 自带签名和过期时间，服务重启后已保存的登录状态仍然有效
+_SECRET = b"local-stand-in-server"
+
+# 会话有效期（秒）
+SESSION_TTL = 60 * 60
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def issue_token(username: str, ttl: int = SESSION_TTL) -> str:
+    """签发 JWT 格式的会话 token（HS256），exp 可被 utils.auth_state 离线解析"""
+    header = _b64(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+    payload = _b64(json.dumps({"sub": username, "exp": int(time.time()) + ttl}).encode())
+    signature = _b64(hmac.new(_SECRET, f"{header}.{payload}".encode(), hashlib.sha256).digest())
+    return f"{header}.{payload}.{signature}"
+
+
+def verify_token(token: str) -> Optional[str]:
+    """校验 token 签名和过期时间，返回用户名；无效时返回 None"""
+    try:
+        header, payload, signature = token.split(".")
+    except (AttributeError, ValueError):
+        return None
+    expected = _b64(hmac.new(_SECRET, f"{header}.{payload}".encode(), hashlib.sha256).digest())
+    if not hmac.compare_digest(signature, expected):
+        return None
+    claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    return claims["sub"] if claims.get("exp", 0) > time.time() else None
+
+
+def load_accounts() -> Dict[str, str]:
+    """可登录的账号：login/login_data.yaml 中没有 expected_error 的条目（即各登录角色）"""
+    accounts = {}
+    for data in DataLoader.load_yaml("login/login_data.yaml").values():
+        if isinstance(data, dict) and data.get("username") and "expected_error" not in data:
+            accounts[data["username"]] = data["password"]
+    return accounts
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """替身服务的请求处理：单页应用 + 登录/用药记录/血常规分析接口"""
+
+    # 由 create_server 设置
+    accounts: Dict[str, str] = {}
+    latency_ms: float = 0
+    # 用户名 -> 用药记录列表（进程内存储）
+    mar_records: Dict[str, list] = {}
+    lock = threading.Lock()
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    # ---------- 工具方法 ----------
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, status: int, data, headers: Optional[Dict[str, str]] = None):
+        self._send(status, json.dumps(data, ensure_ascii=False).encode("utf-8"),
+                   "application/json; charset=utf-8", headers)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return {}
+
+    def _current_user(self) -> Optional[str]:
+        """从 session cookie 或 Authorization 头中识别当前用户"""
+        cookie = SimpleCookie(self.headers.get("Cookie") or "")
+        if "session" in cookie:
+            return verify_token(cookie["session"].value)
+        authorization = self.headers.get("Authorization") or ""
+        if authorization.startswith("Bearer "):
+            return verify_token(authorization[len("Bearer "):])
+        return None
+
+    def _delay(self):
+        """模拟后端延迟（只作用于接口请求）"""
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)  # noqa: sleep
+
+    # ---------- 路由 ----------
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/api/auth/me":
+            self._delay()
+            user = self._current_user()
+            if user:
+                self._json(200, {"username": user})
+            else:
+                self._json(401, {"message": "未登录"})
+        elif path == "/api/mar":
+            self._delay()
+            user = self._current_user()
+            if not user:
+                self._json(401, {"message": "未登录"})
+                return
+            with self.lock:
+                self._json(200, {"records": self.mar_records.get(user, [])})
+        elif path in ("/", "/index.html"):
+            self._send(200, self._index_html(), "text/html; charset=utf-8")
+        else:
+            self._json(404, {"message": "Not Found"})
+
+    @staticmethod
+    def _index_html() -> bytes:
+        """单页应用，注入可配置的接口路径"""
+        paths = {"login": LOGIN_API_PATH.strip("/"), "bloodAnalyze": LOCAL_BLOOD_ANALYZE_PATH.strip("/")}
+        html = (STATIC_DIR / "index.html").read_text(encoding="utf-8")
+        return html.replace("__API_PATHS__", json.dumps(paths)).encode("utf-8")
+
+    def do_POST(self):
+        path = self.path.split("?")[0]
+        self._delay()
+        if path == f"/{LOGIN_API_PATH.strip('/')}":
+            self._login()
+        elif path == "/api/auth/logout":
+            self._json(200, {"ok": True}, {"Set-Cookie": "session=; Path=/; Max-Age=0"})
+        elif path == "/api/mar":
+            self._add_mar()
+        elif path == f"/{LOCAL_BLOOD_ANALYZE_PATH.strip('/')}":
+            self._analyze_blood()
+        else:
+            self._json(404, {"message": "Not Found"})
+
+    def _login(self):
+        body = self._read_json()
+        username, password = body.get("username") or "", body.get("password") or ""
+        if not username:
+            self._json(400, {"message": "Username is required"})
+            return
+        if self.accounts.get(username) != password:
+            self._json(401, {"message": "用户名或密码错误"})
+            return
+        token = issue_token(username)
+        self._json(
+            200,
+            {"token": token, "username": username},
+            {"Set-Cookie": f"session={token}; Path=/; Max-Age={SESSION_TTL}; HttpOnly; SameSite=Lax"}
+        )
+
+    def _add_mar(self):
+        user = self._current_user()
+        if not user:
+            self._json(401, {"message": "未登录"})
+            return
+        record = self._read_json()
+        if not record.get("name"):
+            self._json(400, {"message": "请输入药物名称"})
+            return
+        with self.lock:
+            self.mar_records.setdefault(user, []).append(record)
+        self._json(200, {"message": "保存成功", "record": record})
+
+    def _analyze_blood(self):
+        if not self._current_user():
+            self._json(401, {"message": "未登录"})
+            return
+        data = self._read_json()
+        missing = [name for name in ("plt", "wbc", "rbc", "hgb") if not str(data.get(name) or "").strip()]
+        if missing:
+            self._json(400, {"message": f"请填写: {', '.join(missing)}"})
+            return
+        try:
+            values = {name: float(data[name]) for name in ("plt", "wbc", "rbc", "hgb")}
+        except ValueError:
+            self._json(400, {"message": "指标必须是数字"})
+            return
+        self._json(200, {"message": LOCAL_BLOOD_SUCCESS_MESSAGE, "values": values})
+
+
+def create_server(host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0) -> ThreadingHTTPServer:
+    """创建替身服务（未启动），port 为 0 时自动分配端口"""
+    handler = type("ConfiguredStandInHandler", (StandInHandler,), {
+        "accounts": load_accounts(),
+        "latency_ms": latency_ms,
+        "mar_records": {},
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_thread(host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0) -> ThreadingHTTPServer:
+    """在后台线程中启动替身服务，返回 server（server.server_port 为实际端口）"""
+    server = create_server(host, port, latency_ms)
+    threading.Thread(target=server.serve_forever, name="local-stand-in-server", daemon=True).start()
+    return server
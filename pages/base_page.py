@@ -1,8 +1,77 @@
+import time
+import weakref
 import allure
-from playwright.sync_api import Page, TimeoutError, Locator
-from config.config import TIMEOUT
+from playwright.sync_api import Page, TimeoutError, Locator, Request, Frame
+from config.config import (
+    TIMEOUT, LOCATOR_CACHE, SMART_WAIT_ADAPTIVE, SMART_WAIT_MIN_TIMEOUT, SMART_WAIT_TIMEOUT_FACTOR, SMART_WAIT_IDLE_MS
+)
+from utils.action_timing import timed_action
 from utils.logger import Logger
-from typing import Union, Tuple
+from utils.wait_history import WaitHistory
+from typing import Dict, Iterable, Optional, Union, Tuple
+
+
+# DOM 静默检测脚本：首次调用时安装 MutationObserver，记录最后一次变更时间，
+# 距最后一次变更超过 quietMs 时返回 true
+_DOM_QUIET_SCRIPT = """quietMs => {
+    if (!window.__autotestDomQuiet) {
+        window.__autotestDomQuiet = { last: performance.now() };
+        new MutationObserver(() => { window.__autotestDomQuiet.last = performance.now(); })
+            .observe(document, { childList: true, subtree: true, attributes: true, characterData: true });
+    }
+    return performance.now() - window.__autotestDomQuiet.last >= quietMs;
+}"""
+
+# 批量填充脚本：一次 evaluate 内为所有字段赋值，并派发 input/change 事件；
+# 使用原生 value setter，保证 React/Vue 等框架能感知到值的变化
+# 不能直接赋值 value 的 input 类型，回退到 Playwright 处理
+_FILL_FORM_SKIP_TYPES = ["checkbox", "radio", "file", "button", "submit", "reset", "image"]
+
+_FILL_FORM_SCRIPT = """([fields, skipTypes]) => fields.map(({ selector, xpath, value }) => {
+    let el;
+    try {
+        el = xpath
+            ? document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+            : document.querySelector(selector);
+    } catch (e) {
+        // Playwright 专有语法（:has-text()、text=、>>、nth= 等）不是合法的 CSS
+        return { selector, status: "unsupported" };
+    }
+    if (!el) return { selector, status: "missing" };
+    const type = [HTMLInputElement, HTMLTextAreaElement, HTMLSelectElement].find(t => el instanceof t);
+    if (!type || (el instanceof HTMLInputElement && skipTypes.includes(el.type))) {
+        return { selector, status: "unsupported" };
+    }
+    if (el.disabled || el.readOnly) return { selector, status: "readonly" };
+    el.focus();
+    Object.getOwnPropertyDescriptor(type.prototype, "value").set.call(el, value);
+    el.dispatchEvent(new Event("input", { bubbles: true }));
+    el.dispatchEvent(new Event("change", { bubbles: true }));
+    el.blur();
+    // 读回的值不一致（如 select 没有该选项、number/date 输入框规整了取值）时回退
+    if (el.value !== value) return { selector, status: "mismatch", value: el.value };
+    return { selector, status: "filled", value: el.value };
+})"""
+
+
+# 定位器缓存：每个 Page 一份，同一页面上的所有页面对象共享；导航和关闭的监听每个 Page 只注册一次
+_LOCATOR_CACHES: "weakref.WeakKeyDictionary[Page, Dict]" = weakref.WeakKeyDictionary()
+
+
+def _locator_cache_for(page: Page) -> Dict:
+    """Page 对应的定位器缓存，首次使用时注册监听：主框架导航后清空，页面关闭时释放"""
+    cache = _LOCATOR_CACHES.get(page)
+    if cache is None:
+        cache = _LOCATOR_CACHES[page] = {}
+
+        def on_frame_navigated(frame: Frame):
+            if frame == page.main_frame:
+                cache.clear()
+
+        page.on("framenavigated", on_frame_navigated)
+        # Locator 引用着 Page，关闭时清空，页面对象才能被回收
+        page.on("close", lambda _: cache.clear())
+    return cache
 
 
 class BasePage:
@@ -13,9 +82,16 @@ class BasePage:
         self.timeout = TIMEOUT
         self.logger = Logger(self.__class__.__name__)
 
+        # 定位器缓存：定位器（元组/字符串）-> Locator，页面主框架导航后清空
+        self.locator_cache_enabled = LOCATOR_CACHE
+        self._locator_cache = _locator_cache_for(page)
+
     def _get_locator(self, locator: Union[str, Tuple[str, str]]) -> Locator:
         """智能定位器：自动识别定位器类型并返回 Playwright Locator
 
+        解析结果按定位器缓存，同一页面重复使用的常量定位器只解析一次；
+        页面导航后缓存失效。
+
         Args:
             locator: 定位器，支持三种格式：
                 - 元组 ("role", "name"): 使用 get_by_role
@@ -35,21 +111,44 @@ class BasePage:
             # XPath 定位器
             locator = self._get_locator("//button[@id='submit']")
         """
+        if self.locator_cache_enabled and isinstance(locator, (tuple, str)):
+            cached = self._locator_cache.get(locator)
+            if cached is None:
+                cached = self._locator_cache[locator] = self._build_locator(locator)
+            return cached
+        return self._build_locator(locator)
+
+    @staticmethod
+    def _is_xpath(locator: str) -> bool:
+        return locator.startswith(("//", "(", "./"))
+
+    def _build_locator(self, locator: Union[str, Tuple[str, str]]) -> Locator:
+        """解析定位器类型并创建 Playwright Locator（不经过缓存）"""
+        if isinstance(locator, tuple):
+            self.logger.debug("使用 Role 定位器: role=%s, name=%s", *locator)
+        elif isinstance(locator, str):
+            self.logger.debug("使用 %s 定位器: %s", "XPath" if self._is_xpath(locator) else "CSS", locator)
+        return self.resolve_locator(self.page, locator)
+
+    @classmethod
+    def resolve_locator(cls, page: Page, locator: Union[str, Tuple[str, str], Locator]) -> Locator:
+        """按 _get_locator 的规则解析定位器，不需要 BasePage 实例（供 Assertion 等工具使用）
+
+        Args:
+            page: Playwright Page
+            locator: 元组 ("role", "name")、CSS/XPath 字符串，或已创建的 Locator（原样返回）
+        """
+        if isinstance(locator, Locator):
+            return locator
         if isinstance(locator, tuple):
             # 元组形式：使用 get_by_role
             role, name = locator
-            self.logger.debug(f"使用 Role 定位器: role={role}, name={name}")
-            return self.page.get_by_role(role, name=name)
+            return page.get_by_role(role, name=name)
         elif isinstance(locator, str):
             # 字符串形式：判断是 XPath 还是 CSS
-            if locator.startswith(("//", "(", "./")):
-                # XPath 定位器
-                self.logger.debug(f"使用 XPath 定位器: {locator}")
-                return self.page.locator(f"xpath={locator}")
-            else:
-                # CSS 选择器
-                self.logger.debug(f"使用 CSS 定位器: {locator}")
-                return self.page.locator(locator)
+            if cls._is_xpath(locator):
+                return page.locator(f"xpath={locator}")
+            return page.locator(locator)
         else:
             raise ValueError(f"不支持的定位器类型: {type(locator)}, 值: {locator}")
 
@@ -72,13 +171,14 @@ class BasePage:
     def navigate(self, url: str):
         """导航到指定URL"""
         try:
-            self.logger.info(f"导航到页面: {url}")
+            self.logger.info("导航到页面: %s", url)
             self.page.goto(url)
-            self.logger.info(f"成功加载页面: {url}")
+            self.logger.info("成功加载页面: %s", url)
         except Exception as e:
-            self.logger.error(f"导航失败: {url}, 错误: {str(e)}")
+            self.logger.error("导航失败: %s, 错误: %s", url, e)
             raise
 
+    @timed_action("click")
     @allure.step("点击元素")
     def click(self, locator: Union[str, Tuple[str, str]]):
         """智能点击元素 - 支持 CSS/XPath 字符串或 Role 元组
@@ -91,18 +191,19 @@ class BasePage:
         """
         try:
             loc_desc = self._get_locator_description(locator)
-            self.logger.info(f"尝试点击元素: {loc_desc}")
+            self.logger.info("尝试点击元素: %s", loc_desc)
             self._get_locator(locator).click(timeout=self.timeout)
-            self.logger.info(f"成功点击元素: {loc_desc}")
+            self.logger.info("成功点击元素: %s", loc_desc)
         except TimeoutError:
             error_msg = f"元素未找到或不可点击: {loc_desc}"
             self.logger.error(error_msg)
             # 转换为 AssertionError，让 Allure 显示为 Failed (红色) 而非 Broken (黄色)
             raise AssertionError(error_msg)
         except Exception as e:
-            self.logger.error(f"点击元素失败: {loc_desc}, 错误: {str(e)}")
+            self.logger.error("点击元素失败: %s, 错误: %s", loc_desc, e)
             raise
 
+    @timed_action("fill")
     @allure.step("填充元素")
     def fill(self, locator: Union[str, Tuple[str, str]], text: str):
         """智能填充输入框 - 支持 CSS/XPath 字符串或 Role 元组
@@ -116,18 +217,92 @@ class BasePage:
         """
         try:
             loc_desc = self._get_locator_description(locator)
-            self.logger.info(f"尝试填充元素: {loc_desc}, 内容: {text}")
+            self.logger.info("尝试填充元素: %s, 内容: %s", loc_desc, text)
             self._get_locator(locator).fill(text, timeout=self.timeout)
-            self.logger.info(f"成功填充元素: {loc_desc}")
+            self.logger.info("成功填充元素: %s", loc_desc)
+        except TimeoutError:
+            error_msg = f"输入框未找到: {loc_desc}"
+            self.logger.error(error_msg)
+            # 转换为 AssertionError，让 Allure 显示为 Failed (红色)
+            raise AssertionError(error_msg)
+        except Exception as e:
+            self.logger.error("填充元素失败: %s, 错误: %s", loc_desc, e)
+            raise
+
+    @timed_action("fill_form")
+    @allure.step("批量填充表单")
+    def fill_form(self, fields: Dict[Union[str, Tuple[str, str]], str],
+                  type_fields: Iterable[Union[str, Tuple[str, str]]] = ()):
+        """批量填充表单 - 一次浏览器调用填充所有 CSS/XPath 字段
+
+        CSS/XPath 字段在同一次 evaluate 中赋值并派发 input/change 事件；
+        Role 元组、type_fields 中的字段，以及批量填充失败的字段（Playwright 专有选择器、
+        复选框/单选框/文件输入框、读回值与目标值不一致）逐个回退处理。
+
+        Args:
+            fields: 定位器 -> 文本，定位器格式同 fill
+            type_fields: 需要真实键盘输入的字段（如带输入联想、按键校验的输入框），
+                逐字符输入而不是直接赋值
+
+        Examples:
+            self.fill_form({"#plt": "150", "#wbc": "6.5", ("textbox", "备注"): "无"})
+        """
+        type_fields = set(type_fields)
+        batch, fallback = [], []
+        for locator, text in fields.items():
+            if isinstance(locator, str) and locator not in type_fields:
+                batch.append((locator, text))
+            else:
+                fallback.append((locator, text))
+
+        details = []
+        if batch:
+            # 等待第一个字段出现，确保表单已渲染，随后一次性填充
+            self.wait_for_selector(batch[0][0], state="attached", timeout=self.timeout)
+            results = self.page.evaluate(_FILL_FORM_SCRIPT, [[
+                {"selector": locator, "xpath": self._is_xpath(locator), "value": str(text)}
+                for locator, text in batch
+            ], _FILL_FORM_SKIP_TYPES])
+            for (locator, text), result in zip(batch, results):
+                if result["status"] == "filled":
+                    details.append(f"{self._get_locator_description(locator)}: {text} (批量)")
+                else:
+                    fallback.append((locator, text))
+
+        for locator, text in fallback:
+            if locator in type_fields:
+                self._type(locator, text)
+                details.append(f"{self._get_locator_description(locator)}: {text} (键盘输入)")
+            else:
+                self.fill(locator, text)
+                details.append(f"{self._get_locator_description(locator)}: {text} (逐个填充)")
+
+        self.logger.info("批量填充表单完成: %s 个字段, 批量 %s, 回退 %s", len(fields), len(fields) - len(fallback), len(fallback))
+        allure.attach(
+            "\n".join(details),
+            name="表单字段",
+            attachment_type=allure.attachment_type.TEXT
+        )
+
+    def _type(self, locator: Union[str, Tuple[str, str]], text: str):
+        """清空输入框后逐字符键盘输入"""
+        try:
+            loc_desc = self._get_locator_description(locator)
+            self.logger.info("尝试键盘输入: %s, 内容: %s", loc_desc, text)
+            element = self._get_locator(locator)
+            element.fill("", timeout=self.timeout)
+            element.press_sequentially(text, timeout=self.timeout)
+            self.logger.info("成功键盘输入: %s", loc_desc)
         except TimeoutError:
             error_msg = f"输入框未找到: {loc_desc}"
             self.logger.error(error_msg)
             # 转换为 AssertionError，让 Allure 显示为 Failed (红色)
             raise AssertionError(error_msg)
         except Exception as e:
-            self.logger.error(f"填充元素失败: {loc_desc}, 错误: {str(e)}")
+            self.logger.error("键盘输入失败: %s, 错误: %s", loc_desc, e)
             raise
 
+    @timed_action("get_text")
     @allure.step("获取元素文本")
     def get_text(self, locator: Union[str, Tuple[str, str]]) -> str:
         """智能获取元素文本 - 支持 CSS/XPath 字符串或 Role 元组
@@ -143,9 +318,9 @@ class BasePage:
         """
         try:
             loc_desc = self._get_locator_description(locator)
-            self.logger.info(f"尝试获取元素文本: {loc_desc}")
+            self.logger.info("尝试获取元素文本: %s", loc_desc)
             text = self._get_locator(locator).text_content(timeout=self.timeout)
-            self.logger.info(f"成功获取文本: {loc_desc}, 内容: {text}")
+            self.logger.info("成功获取文本: %s, 内容: %s", loc_desc, text)
             return text
         except TimeoutError:
             error_msg = f"元素未找到,无法获取文本: {loc_desc}"
@@ -153,9 +328,10 @@ class BasePage:
             # 转换为 AssertionError，让 Allure 显示为 Failed (红色)
             raise AssertionError(error_msg)
         except Exception as e:
-            self.logger.error(f"获取文本失败: {loc_desc}, 错误: {str(e)}")
+            self.logger.error("获取文本失败: %s, 错误: %s", loc_desc, e)
             raise
 
+    @timed_action("is_visible")
     @allure.step("检查元素可见性")
     def is_visible(self, locator: Union[str, Tuple[str, str]]) -> bool:
         """智能检查元素是否可见 - 支持 CSS/XPath 字符串或 Role 元组
@@ -173,82 +349,183 @@ class BasePage:
             loc_desc = self._get_locator_description(locator)
             visible = self._get_locator(locator).is_visible()
             if visible:
-                self.logger.info(f"元素可见: {loc_desc}")
+                self.logger.info("元素可见: %s", loc_desc)
             else:
-                self.logger.warning(f"元素不可见: {loc_desc}")
+                self.logger.warning("元素不可见: %s", loc_desc)
             return visible
         except Exception as e:
-            self.logger.error(f"检查元素可见性失败: {loc_desc}, 错误: {str(e)}")
+            self.logger.error("检查元素可见性失败: %s, 错误: %s", loc_desc, e)
             return False
 
-    @allure.step("等待元素出现")
-    def wait_for_selector(self, locator: Union[str, Tuple[str, str]]):
-        """智能等待元素出现 - 支持 CSS/XPath 字符串或 Role 元组
+    def _wait_timeout(self, key: str, timeout: Optional[float]) -> float:
+        """智能等待的超时时间：显式传入优先，否则根据历史耗时自适应"""
+        if timeout is not None:
+            return timeout
+        if not SMART_WAIT_ADAPTIVE:
+            return self.timeout
+        return WaitHistory.timeout_for(key, self.timeout, SMART_WAIT_MIN_TIMEOUT, SMART_WAIT_TIMEOUT_FACTOR)
+
+    def _wait_key(self, kind: str, target: str = "") -> str:
+        return f"{self.__class__.__name__}.{kind}:{target}"
+
+    @timed_action("wait_for_selector")
+    @allure.step("等待元素状态")
+    def wait_for_selector(self, locator: Union[str, Tuple[str, str]], state: str = "visible",
+                          timeout: Optional[float] = None):
+        """智能等待元素达到指定状态 - 支持 CSS/XPath 字符串或 Role 元组
 
         Args:
             locator: 定位器，支持：
                 - CSS: ".loading" 或 "#spinner"
                 - XPath: "//div[@class='loading']"
                 - Role: ("status", "加载中")
+            state: 目标状态："visible"（默认）、"hidden"、"attached"、"detached"
+            timeout: 超时时间（毫秒），不传时根据历史耗时自适应
         """
         try:
             loc_desc = self._get_locator_description(locator)
-            self.logger.info(f"等待元素出现: {loc_desc}")
-            self._get_locator(locator).wait_for(state="visible", timeout=self.timeout)
-            self.logger.info(f"元素已出现: {loc_desc}")
+            key = self._wait_key(f"state={state}", loc_desc)
+            wait_timeout = self._wait_timeout(key, timeout)
+            self.logger.info("等待元素状态: %s, state=%s, 超时: %.0fms", loc_desc, state, wait_timeout)
+            start = time.perf_counter()
+            self._get_locator(locator).wait_for(state=state, timeout=wait_timeout)
+            WaitHistory.record(key, (time.perf_counter() - start) * 1000)
+            self.logger.info("元素已达到状态: %s, state=%s", loc_desc, state)
         except TimeoutError:
-            error_msg = f"等待超时,元素未出现: {loc_desc}"
+            error_msg = f"等待超时,元素未达到状态 {state}: {loc_desc}"
             self.logger.error(error_msg)
             # 转换为 AssertionError，让 Allure 显示为 Failed (红色)
             raise AssertionError(error_msg)
         except Exception as e:
-            self.logger.error(f"等待元素失败: {loc_desc}, 错误: {str(e)}")
+            self.logger.error("等待元素失败: %s, 错误: %s", loc_desc, e)
             raise
 
+    @timed_action("wait_for_network_idle")
+    @allure.step("等待网络空闲: {url_pattern}")
+    def wait_for_network_idle(self, url_pattern: Optional[str] = None, idle_ms: float = SMART_WAIT_IDLE_MS,
+                              timeout: Optional[float] = None, poll_ms: float = 50):
+        """等待匹配的网络请求全部结束，并且静默 idle_ms 毫秒
+
+        只统计调用之后发起的请求；调用时已在进行中的请求不会被感知。
+
+        Args:
+            url_pattern: URL 子串过滤，如 "/api/analysis"；None 表示所有请求
+            idle_ms: 无请求进行中持续多久视为空闲（毫秒）
+            timeout: 超时时间（毫秒），不传时根据历史耗时自适应
+            poll_ms: 检查间隔（毫秒）
+        """
+        key = self._wait_key("network_idle", url_pattern or "*")
+        wait_timeout = self._wait_timeout(key, timeout)
+        inflight = set()
+        last_activity = [time.perf_counter()]
+
+        def matches(request: Request) -> bool:
+            return url_pattern is None or url_pattern in request.url
+
+        def on_request(request: Request):
+            if matches(request):
+                inflight.add(request)
+                last_activity[0] = time.perf_counter()
+
+        def on_done(request: Request):
+            if request in inflight:
+                inflight.discard(request)
+                last_activity[0] = time.perf_counter()
+
+        self.logger.info("等待网络空闲: %s, 超时: %.0fms", url_pattern or '所有请求', wait_timeout)
+        self.page.on("request", on_request)
+        self.page.on("requestfinished", on_done)
+        self.page.on("requestfailed", on_done)
+        start = time.perf_counter()
+        try:
+            while True:
+                now = time.perf_counter()
+                if not inflight and (now - last_activity[0]) * 1000 >= idle_ms:
+                    break
+                if (now - start) * 1000 > wait_timeout:
+                    error_msg = f"等待网络空闲超时: {url_pattern or '所有请求'}, 仍有 {len(inflight)} 个请求未完成"
+                    self.logger.error(error_msg)
+                    raise AssertionError(error_msg)
+                # 轮询间隔，同时让 Playwright 分发网络事件
+                self.page.main_frame.wait_for_timeout(poll_ms)  # noqa: sleep
+        finally:
+            self.page.remove_listener("request", on_request)
+            self.page.remove_listener("requestfinished", on_done)
+            self.page.remove_listener("requestfailed", on_done)
+
+        WaitHistory.record(key, (time.perf_counter() - start) * 1000)
+        self.logger.info("网络已空闲: %s", url_pattern or '所有请求')
+
+    @timed_action("wait_for_dom_stable")
+    @allure.step("等待页面 DOM 稳定")
+    def wait_for_dom_stable(self, quiet_ms: float = SMART_WAIT_IDLE_MS, timeout: Optional[float] = None):
+        """等待页面 DOM 在 quiet_ms 毫秒内没有任何变更
+
+        Args:
+            quiet_ms: DOM 无变更持续多久视为稳定（毫秒）
+            timeout: 超时时间（毫秒），不传时根据历史耗时自适应
+        """
+        key = self._wait_key("dom_stable")
+        wait_timeout = self._wait_timeout(key, timeout)
+        try:
+            self.logger.info("等待 DOM 稳定: 静默 %.0fms, 超时: %.0fms", quiet_ms, wait_timeout)
+            start = time.perf_counter()
+            self.page.wait_for_function(_DOM_QUIET_SCRIPT, arg=quiet_ms, polling=100, timeout=wait_timeout)
+            WaitHistory.record(key, (time.perf_counter() - start) * 1000)
+            self.logger.info("DOM 已稳定")
+        except TimeoutError:
+            error_msg = f"等待 DOM 稳定超时: {wait_timeout:.0f}ms 内页面持续变化"
+            self.logger.error(error_msg)
+            raise AssertionError(error_msg)
+
+    @timed_action("click_by_role")
     @allure.step("点击角色元素: {role} - {name}")
     def click_by_role(self, role: str, name: str):
         """通过角色和名称点击元素 (基于可访问性)"""
         try:
-            self.logger.info(f"尝试点击 {role}: {name}")
-            self.page.get_by_role(role, name=name).click(timeout=self.timeout)
-            self.logger.info(f"成功点击 {role}: {name}")
+            self.logger.info("尝试点击 %s: %s", role, name)
+            self._get_locator((role, name)).click(timeout=self.timeout)
+            self.logger.info("成功点击 %s: %s", role, name)
         except TimeoutError:
-            self.logger.error(f"元素未找到或不可点击: {role} - {name}")
+            self.logger.error("元素未找到或不可点击: %s - %s", role, name)
             raise
         except Exception as e:
-            self.logger.error(f"点击元素失败: {role} - {name}, 错误: {str(e)}")
+            self.logger.error("点击元素失败: %s - %s, 错误: %s", role, name, e)
             raise
 
+    @timed_action("fill_by_role")
     @allure.step("填充角色元素: {role} - {name}, 内容: {text}")
     def fill_by_role(self, role: str, name: str, text: str):
         """通过角色和名称填充输入框 (基于可访问性)"""
         try:
-            self.logger.info(f"尝试填充 {role}: {name}, 内容: {text}")
-            self.page.get_by_role(role, name=name).fill(text, timeout=self.timeout)
-            self.logger.info(f"成功填充 {role}: {name}")
+            self.logger.info("尝试填充 %s: %s, 内容: %s", role, name, text)
+            self._get_locator((role, name)).fill(text, timeout=self.timeout)
+            self.logger.info("成功填充 %s: %s", role, name)
         except TimeoutError:
-            self.logger.error(f"输入框未找到: {role} - {name}")
+            self.logger.error("输入框未找到: %s - %s", role, name)
             raise
         except Exception as e:
-            self.logger.error(f"填充元素失败: {role} - {name}, 错误: {str(e)}")
+            self.logger.error("填充元素失败: %s - %s, 错误: %s", role, name, e)
             raise
 
+    @timed_action("get_text_by_role")
     @allure.step("获取角色元素文本: {role} - {name}")
     def get_text_by_role(self, role: str, name: str) -> str:
         """通过角色和名称获取元素文本 (基于可访问性)"""
         try:
-            self.logger.info(f"尝试获取元素文本: {role} - {name}")
-            text = self.page.get_by_role(role, name=name).text_content(timeout=self.timeout)
-            self.logger.info(f"成功获取文本: {role} - {name}, 内容: {text}")
+            self.logger.info("尝试获取元素文本: %s - %s", role, name)
+            text = self._get_locator((role, name)).text_content(timeout=self.timeout)
+            self.logger.info("成功获取文本: %s - %s, 内容: %s", role, name, text)
             return text
         except TimeoutError:
-            self.logger.error(f"元素未找到,无法获取文本: {role} - {name}")
+            self.logger.error("元素未找到,无法获取文本: %s - %s", role, name)
             raise
         except Exception as e:
-            self.logger.error(f"获取文本失败: {role} - {name}, 错误: {str(e)}")
+            self.logger.error("获取文本失败: %s - %s, 错误: %s", role, name, e)
             raise
         
     
+    @timed_action("is_checked")
     @allure.step("检查元素是否选中")
     def is_checked(self, locator: Union[str, Tuple[str, str]]) -> bool:
         """智能检查元素是否选中 - 支持 CSS/XPath 字符串或 Role 元组
@@ -266,14 +543,15 @@ class BasePage:
             loc_desc = self._get_locator_description(locator)
             checked = self._get_locator(locator).is_checked()
             if checked:
-                self.logger.info(f"元素已选中: {loc_desc}")
+                self.logger.info("元素已选中: %s", loc_desc)
             else:
-                self.logger.warning(f"元素未选中: {loc_desc}")
+                self.logger.warning("元素未选中: %s", loc_desc)
             return checked
         except Exception as e:
-            self.logger.error(f"检查元素是否选中失败: {loc_desc}, 错误: {str(e)}")
+            self.logger.error("检查元素是否选中失败: %s, 错误: %s", loc_desc, e)
             return False
 
+    @timed_action("check")
     @allure.step("选中元素")
     def check(self, locator: Union[str, Tuple[str, str]]):
         """智能选中元素 - 支持 CSS/XPath 字符串或 Role 元组
@@ -286,18 +564,19 @@ class BasePage:
         """
         try:
             loc_desc = self._get_locator_description(locator)
-            self.logger.info(f"尝试选中元素: {loc_desc}")
+            self.logger.info("尝试选中元素: %s", loc_desc)
             self._get_locator(locator).check(timeout=self.timeout)
-            self.logger.info(f"成功选中元素: {loc_desc}")
+            self.logger.info("成功选中元素: %s", loc_desc)
         except TimeoutError:
             error_msg = f"元素未找到: {loc_desc}"
             self.logger.error(error_msg)
             # 转换为 AssertionError，让 Allure 显示为 Failed (红色)
             raise AssertionError(error_msg)
         except Exception as e:
-            self.logger.error(f"选中元素失败: {loc_desc}, 错误: {str(e)}")
+            self.logger.error("选中元素失败: %s, 错误: %s", loc_desc, e)
             raise
 
+    @timed_action("uncheck")
     @allure.step("取消选中元素")
     def uncheck(self, locator: Union[str, Tuple[str, str]]):
         """智能取消选中元素 - 支持 CSS/XPath 字符串或 Role 元组
@@ -310,18 +589,19 @@ class BasePage:
         """
         try:
             loc_desc = self._get_locator_description(locator)
-            self.logger.info(f"尝试取消选中元素: {loc_desc}")
+            self.logger.info("尝试取消选中元素: %s", loc_desc)
             self._get_locator(locator).uncheck(timeout=self.timeout)
-            self.logger.info(f"成功取消选中元素: {loc_desc}")
+            self.logger.info("成功取消选中元素: %s", loc_desc)
         except TimeoutError:
             error_msg = f"元素未找到: {loc_desc}"
             self.logger.error(error_msg)
             # 转换为 AssertionError，让 Allure 显示为 Failed (红色)
             raise AssertionError(error_msg)
         except Exception as e:
-            self.logger.error(f"取消选中元素失败: {loc_desc}, 错误: {str(e)}")
+            self.logger.error("取消选中元素失败: %s, 错误: %s", loc_desc, e)
             raise
 
+    @timed_action("is_checked_by_role")
     @allure.step("检查角色元素是否选中: {role} - {name}")
     def is_checked_by_role(self, role: str, name: str) -> bool:
         """检查角色元素是否选中（基于可访问性）
@@ -341,20 +621,21 @@ class BasePage:
             is_selected = self.is_checked_by_role("radio", "男")
         """
         try:
-            self.logger.info(f"尝试检查 {role}: {name} 是否选中")
-            checked = self.page.get_by_role(role, name=name).is_checked(timeout=self.timeout)
+            self.logger.info("尝试检查 %s: %s 是否选中", role, name)
+            checked = self._get_locator((role, name)).is_checked(timeout=self.timeout)
             if checked:
-                self.logger.info(f"元素已选中: {role} - {name}")
+                self.logger.info("元素已选中: %s - %s", role, name)
             else:
-                self.logger.warning(f"元素未选中: {role} - {name}")
+                self.logger.warning("元素未选中: %s - %s", role, name)
             return checked
         except TimeoutError:
-            self.logger.error(f"元素未找到: {role} - {name}")
+            self.logger.error("元素未找到: %s - %s", role, name)
             raise
         except Exception as e:
-            self.logger.error(f"检查元素是否选中失败: {role} - {name}, 错误: {str(e)}")
+            self.logger.error("检查元素是否选中失败: %s - %s, 错误: %s", role, name, e)
             return False
 
+    @timed_action("check_by_role")
     @allure.step("选中角色元素: {role} - {name}")
     def check_by_role(self, role: str, name: str):
         """选中角色元素（复选框/单选按钮）
@@ -368,16 +649,17 @@ class BasePage:
             self.check_by_role("checkbox", "记住我")
         """
         try:
-            self.logger.info(f"尝试选中 {role}: {name}")
-            self.page.get_by_role(role, name=name).check(timeout=self.timeout)
-            self.logger.info(f"成功选中 {role}: {name}")
+            self.logger.info("尝试选中 %s: %s", role, name)
+            self._get_locator((role, name)).check(timeout=self.timeout)
+            self.logger.info("成功选中 %s: %s", role, name)
         except TimeoutError:
-            self.logger.error(f"元素未找到: {role} - {name}")
+            self.logger.error("元素未找到: %s - %s", role, name)
             raise
         except Exception as e:
-            self.logger.error(f"选中元素失败: {role} - {name}, 错误: {str(e)}")
+            self.logger.error("选中元素失败: %s - %s, 错误: %s", role, name, e)
             raise
 
+    @timed_action("uncheck_by_role")
     @allure.step("取消选中角色元素: {role} - {name}")
     def uncheck_by_role(self, role: str, name: str):
         """取消选中角色元素（复选框）
@@ -391,12 +673,12 @@ class BasePage:
             self.uncheck_by_role("checkbox", "记住我")
         """
         try:
-            self.logger.info(f"尝试取消选中 {role}: {name}")
-            self.page.get_by_role(role, name=name).uncheck(timeout=self.timeout)
-            self.logger.info(f"成功取消选中 {role}: {name}")
+            self.logger.info("尝试取消选中 %s: %s", role, name)
+            self._get_locator((role, name)).uncheck(timeout=self.timeout)
+            self.logger.info("成功取消选中 %s: %s", role, name)
         except TimeoutError:
-            self.logger.error(f"元素未找到: {role} - {name}")
+            self.logger.error("元素未找到: %s - %s", role, name)
             raise
         except Exception as e:
-            self.logger.error(f"取消选中元素失败: {role} - {name}, 错误: {str(e)}")
+            self.logger.error("取消选中元素失败: %s - %s, 错误: %s", role, name, e)
             raise
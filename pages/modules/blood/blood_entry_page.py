@@ -1,3 +1,4 @@
+from playwright.sync_api import TimeoutError
 from pages.base_page import BasePage
 from config.config import BASE_URL
 from typing import Optional
@@ -29,7 +30,7 @@ class BloodEntryPage(BasePage):
         self.click(self.BLOOD_ENTRY_BUTTON)
 
     def fill_blood_data(self, plt: str = "", wbc: str = "", rbc: str = "", hgb: str = "", test_date: Optional[str] = None):
-        """填充血常规数据 - 使用 CSS 定位器
+        """填充血常规数据 - 使用 CSS 定位器批量填充
 
         Args:
             plt: 血小板计数
@@ -38,17 +39,15 @@ class BloodEntryPage(BasePage):
             hgb: 血红蛋白
             test_date: 检测日期 (可选), 格式: YYYY-MM-DD
         """
-        # CSS 定位器也直接传递，方法会自动识别
-        if plt:
-            self.fill(self.PLT_INPUT, plt)
-        if wbc:
-            self.fill(self.WBC_INPUT, wbc)
-        if rbc:
-            self.fill(self.RBC_INPUT, rbc)
-        if hgb:
-            self.fill(self.HGB_INPUT, hgb)
-        if test_date:
-            self.fill(self.TEST_DATE_INPUT, test_date)
+        # 一次浏览器调用填充所有非空字段
+        fields = {
+            self.PLT_INPUT: plt,
+            self.WBC_INPUT: wbc,
+            self.RBC_INPUT: rbc,
+            self.HGB_INPUT: hgb,
+            self.TEST_DATE_INPUT: test_date,
+        }
+        self.fill_form({locator: value for locator, value in fields.items() if value})
 
     def submit_blood_data(self):
         """提交血常规数据 - 使用 Role 定位器"""
@@ -68,6 +67,21 @@ class BloodEntryPage(BasePage):
         self.fill_blood_data(plt, wbc, rbc, hgb, test_date)
         self.submit_blood_data()
 
+    def wait_for_analysis(self):
+        """等待 AI 分析结果（成功或错误提示）显示在页面上
+
+        两个提示通过 or_ 合并后取第一个，同时出现时不会触发严格模式冲突
+        """
+        result = self._get_locator(self.SUCCESS_MESSAGE).or_(self._get_locator(self.ERROR_MESSAGE)).first
+        try:
+            result.wait_for(state="visible", timeout=self.timeout)
+        except TimeoutError:
+            error_msg = "等待超时,AI 分析结果未显示"
+            self.logger.error(error_msg)
+            # 转换为 AssertionError，让 Allure 显示为 Failed (红色)
+            raise AssertionError(error_msg)
+        self.logger.info("AI 分析结果已显示")
+
     def get_error_message(self) -> str:
         """获取错误消息文本 - 使用 CSS 定位器"""
         return self.get_text(self.ERROR_MESSAGE)
@@ -24,8 +24,8 @@ class MarPage(BasePage):
         """点击用药记录tab按钮 - 新方式：直接传递元组"""
         # 不再需要 * 解包，直接传递定位器即可
         self.click(self.MAR_TAB_BUTTON)
-        # 添加等待，确保页面加载完成
-        self.page.wait_for_timeout(2000)
+        # 等待用药记录页面渲染出"添加用药记录"按钮，而不是固定等待
+        self.wait_for_selector(self.ADD_MAR_BUTTON)
         self.click(self.ADD_MAR_BUTTON)
 
         # 检查复选框是否选中
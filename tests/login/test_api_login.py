@@ -0,0 +1,56 @@
+import json
+import time
+import allure
+import pytest
+from playwright.sync_api import Playwright
+from local_server import start_in_thread
+from utils.api_login import api_login
+from utils.auth_state import decode_jwt_expiry
+from utils.data_loader import DataLoader
+from utils.logger import Logger
+from utils.assertion import Assertion
+
+logger = Logger.get_logger("TestApiLogin")
+assertion = Assertion("TestApiLogin")
+
+
+@pytest.fixture(scope="module")
+def stub_base_url():
+    """启动本地替身服务（自动分配端口），返回其地址"""
+    server = start_in_thread(port=0)
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    server.server_close()
+
+
+@allure.feature("用户登录")
+class TestApiLogin:
+    @allure.story("接口登录")
+    @allure.title("测试接口登录生成认证状态")
+    @allure.description("直接 POST 登录接口，验证生成的 storage state 包含会话 cookie 和 token")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_api_login_success(self, playwright: Playwright, stub_base_url: str, tmp_path):
+        user = DataLoader.get_test_data("login/login_data.yaml", "valid_user")
+        state_path = tmp_path / "auth_state.json"
+
+        state = api_login(playwright, user["username"], user["password"],
+                          base_url=stub_base_url, state_path=state_path)
+
+        cookies = {cookie["name"]: cookie["value"] for cookie in state["cookies"]}
+        token = state["origins"][0]["localStorage"][0]["value"]
+        with open(state_path, "r", encoding="utf-8") as f:
+            saved_state = json.load(f)
+        with assertion.soft("认证状态验证"):
+            assertion.assert_in("session", cookies, "会话 cookie 验证")
+            assertion.assert_equal(token, cookies.get("session"), "token 写入 localStorage 验证")
+            assertion.assert_greater(decode_jwt_expiry(token) or 0, time.time(), "token 过期时间验证")
+            assertion.assert_equal(saved_state, state, "认证状态文件内容验证")
+
+    @allure.story("接口登录")
+    @allure.title("测试接口登录使用无效凭证")
+    @allure.description("登录接口返回 401 时应抛出异常，由调用方回退到页面登录")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_api_login_invalid_credentials(self, playwright: Playwright, stub_base_url: str):
+        invalid_data = DataLoader.get_test_data("login/login_data.yaml", "invalid_user")
+        with pytest.raises(RuntimeError, match="401"):
+            api_login(playwright, invalid_data["username"], invalid_data["password"], base_url=stub_base_url)
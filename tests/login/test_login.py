@@ -21,9 +21,7 @@ class TestLogin:
         login_page = LoginPage(page)
         login_page.open()
         login_page.login(success_data["username"], success_data["password"])
-        # page.wait_for_timeout(5000)
-        success = login_page.get_success_message()
-        assertion.assert_equal(success, success_data["expected_success"], "登录成功消息验证")
+        assertion.assert_text(login_page, login_page.LOGIN_SUCCESS, success_data["expected_success"], "登录成功消息验证")
 
     @allure.story("登录失败")
     @allure.title("测试用户使用无效凭证登录")
@@ -31,11 +29,10 @@ class TestLogin:
     @allure.severity(allure.severity_level.NORMAL)
     def test_login_invalid_credentials(self, page: Page):
         invalid_data = DataLoader.get_test_data("login/login_data.yaml", "invalid_user")
-        logger.debug(f"测试数据: {invalid_data}")
+        logger.debug("测试数据: %s", invalid_data)
         login_page = LoginPage(page)
         login_page.open()
         login_page.login(invalid_data["username"], invalid_data["password"])
-        # page.wait_for_timeout(5000)
-        error = login_page.get_error_message()
-        assertion.assert_contains(error, invalid_data["expected_error"], "登录失败错误消息验证")
+        assertion.assert_text_contains(login_page, login_page.ERROR_MESSAGE, invalid_data["expected_error"],
+                                       "登录失败错误消息验证")
         
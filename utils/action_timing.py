@@ -0,0 +1,173 @@
+import functools
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from filelock import FileLock
+from config.config import ACTION_TIMING
+
+
+class ActionTimings:
+    """BasePage 操作耗时统计
+
+    每次操作记录 (页面类.操作:定位器, 耗时毫秒)，测试结束时由 conftest 调用 take_test
+    归入本测试；会话结束时 save() 把样本合并写入 test-results/action_timings.json，
+    并按定位器、按页面类汇总 p50/p95/p99，用于找出最慢的定位器和页面。
+    历史样本跨运行累计，每个定位器保留最近 MAX_SAMPLES 个。
+
+    Examples:
+        records = ActionTimings.take_test("tests/login/test_login.py::test_login")
+        print(ActionTimings.format_records(records))
+        ActionTimings.save()
+    """
+
+    EXPORT_PATH = Path(__file__).parent.parent / "test-results" / "action_timings.json"
+
+    # 每个定位器保留的样本数量
+    MAX_SAMPLES = 1000
+
+    enabled = ACTION_TIMING
+
+    # 当前测试尚未归档的记录
+    _pending: List[Tuple[str, float]] = []
+    _new_samples: Dict[str, List[float]] = {}
+    # 定位器 -> 本进程最慢的一次 {"ms", "test"}
+    _slowest: Dict[str, dict] = {}
+
+    @staticmethod
+    def key(page_class: str, action: str, target: str) -> str:
+        return f"{page_class}.{action}:{target}"
+
+    @classmethod
+    def record(cls, key: str, duration_ms: float):
+        """记录一次操作耗时（热路径，只追加）"""
+        cls._pending.append((key, duration_ms))
+
+    @classmethod
+    def take_test(cls, test_id: str) -> List[Tuple[str, float]]:
+        """取出当前测试的操作记录，计入会话样本，返回 [(key, 毫秒)]"""
+        records, cls._pending = cls._pending, []
+        for key, duration_ms in records:
+            cls._new_samples.setdefault(key, []).append(round(duration_ms, 1))
+            slowest = cls._slowest.get(key)
+            if slowest is None or duration_ms > slowest["ms"]:
+                cls._slowest[key] = {"ms": round(duration_ms, 1), "test": test_id}
+        return records
+
+    @staticmethod
+    def format_records(records: List[Tuple[str, float]]) -> str:
+        lines = [f"{duration_ms:9.1f} ms  {key}" for key, duration_ms in records]
+        total = sum(duration_ms for _, duration_ms in records)
+        lines.append(f"共 {len(records)} 次操作, 合计 {total:.1f} ms")
+        return "\n".join(lines)
+
+    @staticmethod
+    def percentiles(samples: List[float]) -> dict:
+        """样本的 count / p50 / p95 / p99 / max（毫秒）"""
+        ordered = sorted(samples)
+        count = len(ordered)
+
+        def rank(p: float) -> float:
+            return ordered[min(count - 1, int(count * p))]
+
+        return {"count": count, "p50": rank(0.5), "p95": rank(0.95), "p99": rank(0.99), "max": ordered[-1]}
+
+    @classmethod
+    def _aggregate(cls, samples: Dict[str, List[float]], slowest: Dict[str, dict]) -> dict:
+        locators, by_page = [], {}
+        for key, values in samples.items():
+            if not values:
+                continue
+            page_class, rest = key.split(".", 1)
+            action, target = rest.split(":", 1)
+            locators.append({"page": page_class, "action": action, "locator": target,
+                             **cls.percentiles(values), "slowest": slowest.get(key)})
+            by_page.setdefault(page_class, []).extend(values)
+        pages = [{"page": page_class, **cls.percentiles(values)} for page_class, values in by_page.items()]
+        return {
+            "locators": sorted(locators, key=lambda item: item["p95"], reverse=True),
+            "pages": sorted(pages, key=lambda item: item["p95"], reverse=True),
+        }
+
+    @classmethod
+    def save(cls) -> Optional[dict]:
+        """将本进程的样本合并写入文件（并行 worker 之间加锁），返回合并后的汇总"""
+        cls.take_test("-")
+        if not cls._new_samples:
+            return None
+        cls.EXPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(str(cls.EXPORT_PATH) + ".lock"):
+            try:
+                with open(cls.EXPORT_PATH, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            samples = data.get("samples", {})
+            slowest = data.get("slowest", {})
+            for key, values in cls._new_samples.items():
+                samples[key] = (samples.get(key, []) + values)[-cls.MAX_SAMPLES:]
+                if key not in slowest or cls._slowest[key]["ms"] > slowest[key]["ms"]:
+                    slowest[key] = cls._slowest[key]
+            data = {**cls._aggregate(samples, slowest), "slowest": slowest, "samples": samples}
+            with open(cls.EXPORT_PATH, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+        cls._new_samples = {}
+        cls._slowest = {}
+        return data
+
+    @classmethod
+    def load(cls) -> Optional[dict]:
+        """读取导出文件（xdist 主进程在 worker 写入后读取）"""
+        try:
+            with open(cls.EXPORT_PATH, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def summary(data: dict, top: int = 5) -> str:
+        lines = ["操作耗时 p95 最高的定位器:"]
+        for item in data["locators"][:top]:
+            lines.append(f"  {item['p95']:8.1f} ms  {item['page']}.{item['action']} {item['locator']}"
+                         f" (n={item['count']})")
+        lines.append("操作耗时 p95 最高的页面:")
+        for item in data["pages"][:top]:
+            lines.append(f"  {item['p95']:8.1f} ms  {item['page']} (n={item['count']})")
+        return "\n".join(lines)
+
+
+def _describe(func_name: str, args: tuple, kwargs: dict) -> str:
+    """根据被调用方法的参数生成定位器描述（与 BasePage._get_locator_description 一致）"""
+    if func_name.endswith("_by_role"):
+        role = args[0] if args else kwargs.get("role")
+        name = args[1] if len(args) > 1 else kwargs.get("name")
+        return f"Role({role}, '{name}')"
+    target = args[0] if args else kwargs.get("locator", kwargs.get("fields", kwargs.get("url_pattern")))
+    if isinstance(target, tuple):
+        return f"Role({target[0]}, '{target[1]}')"
+    if isinstance(target, dict):
+        return f"表单({len(target)} 个字段)"
+    return f"'{target}'" if isinstance(target, str) else "-"
+
+
+def timed_action(action: str):
+    """BasePage 方法装饰器：记录操作耗时到 ActionTimings
+
+    放在 @allure.step 之上（allure 按被装饰函数的参数名格式化步骤标题）。
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not ActionTimings.enabled:
+                return func(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                duration_ms = (time.perf_counter() - start) * 1000
+                ActionTimings.record(
+                    ActionTimings.key(type(self).__name__, action, _describe(func.__name__, args, kwargs)),
+                    duration_ms
+                )
+        return wrapper
+    return decorator
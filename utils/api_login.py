@@ -0,0 +1,89 @@
+import json
+from pathlib import Path
+from typing import Optional, Union
+from urllib.parse import urlsplit
+from playwright.sync_api import Playwright, APIResponse
+from config.config import (
+    BASE_URL, LOGIN_API_PATH, LOGIN_API_TOKEN_FIELD, LOGIN_API_TOKEN_STORAGE_KEY
+)
+from utils.logger import Logger
+
+logger = Logger.get_logger("ApiLogin")
+
+
+def _extract_token(response: APIResponse, token_field: str) -> Optional[str]:
+    """按字段路径（如 "data.token"）从响应 JSON 中取出 token"""
+    if not token_field:
+        return None
+    try:
+        value = response.json()
+    except Exception:
+        return None
+    for key in token_field.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value if isinstance(value, str) and value else None
+
+
+def api_login(playwright: Playwright, username: str, password: str,
+              base_url: str = BASE_URL,
+              login_path: str = LOGIN_API_PATH,
+              token_field: str = LOGIN_API_TOKEN_FIELD,
+              token_storage_key: str = LOGIN_API_TOKEN_STORAGE_KEY,
+              state_path: Optional[Union[str, Path]] = None,
+              timeout: float = 10000) -> dict:
+    """通过 APIRequestContext 直接调用登录接口，生成与页面登录相同格式的 storage state
+
+    服务端通过 Set-Cookie 下发的会话会保存在 cookies 中；响应 JSON 中的 token
+    （如果配置了 token_field）会写入被测站点 origin 的 localStorage。
+
+    Args:
+        playwright: Playwright 实例
+        username: 用户名
+        password: 密码
+        base_url: 被测站点地址
+        login_path: 登录接口路径（相对 base_url）
+        token_field: 响应 JSON 中 token 的字段路径，为空表示只依赖 cookie
+        token_storage_key: token 写入 localStorage 时使用的 key
+        state_path: storage state 保存路径，为 None 时不写文件
+        timeout: 请求超时时间（毫秒）
+
+    Returns:
+        storage state 内容
+
+    Raises:
+        RuntimeError: 接口返回非 2xx，或响应中既没有 cookie 也没有 token
+    """
+    request_context = playwright.request.new_context(base_url=base_url)
+    try:
+        logger.info("接口登录: %s, 用户: %s", login_path, username)
+        response = request_context.post(
+            login_path,
+            data={"username": username, "password": password},
+            timeout=timeout
+        )
+        if not response.ok:
+            raise RuntimeError(f"登录接口返回 {response.status}: {response.status_text}")
+
+        state = request_context.storage_state()
+        token = _extract_token(response, token_field)
+        if token:
+            parts = urlsplit(base_url)
+            state["origins"] = [{
+                "origin": f"{parts.scheme}://{parts.netloc}",
+                "localStorage": [{"name": token_storage_key, "value": token}]
+            }]
+
+        if not state.get("cookies") and not token:
+            raise RuntimeError("登录接口未返回会话 cookie 或 token")
+
+        if state_path:
+            Path(state_path).parent.mkdir(parents=True, exist_ok=True)
+            with open(state_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+
+        logger.info("接口登录成功: %s", username)
+        return state
+    finally:
+        request_context.dispose()
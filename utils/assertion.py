@@ -1,247 +1,366 @@
 import allure
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Tuple, Union
+from playwright.sync_api import Error as PlaywrightError, Locator, expect
+from config.config import ASSERTION_VERBOSITY, ASSERTION_MAX_VALUE_LENGTH, ASSERTION_TIMEOUT
+from pages.base_page import BasePage
 from utils.logger import Logger
 
 
 class Assertion:
-    """断言封装类，集成 Allure 报告"""
+    """断言封装类，集成 Allure 报告
+
+    Allure 输出详细程度由 verbosity 控制（默认取 ASSERTION_VERBOSITY）：
+        - "full": 每个断言一个步骤，通过和失败都附加详情
+        - "failures": 每个断言一个步骤，只有失败时附加详情
+        - "summary": 通过的断言不生成步骤，测试结束时汇总为一个附件；失败时同 full
+    附件、步骤标题和日志中的值超过 ASSERTION_MAX_VALUE_LENGTH 时截断。
+
+    页面断言（assert_is_display、assert_text 等）基于 Playwright expect，在超时时间内
+    自动重试直到条件满足，调用前不需要固定等待；定位器格式与 BasePage._get_locator 相同。
+
+    在 soft() 上下文中，断言失败不会立即抛出，而是在退出上下文时汇总为一个附件并统一抛出。
+    """
+
+    verbosity = ASSERTION_VERBOSITY
+    max_value_length = ASSERTION_MAX_VALUE_LENGTH
+    timeout = ASSERTION_TIMEOUT
+
+    # summary 模式下当前测试已通过的断言，测试结束时由 conftest 调用 flush_summary 输出
+    _passed: List[str] = []
 
     def __init__(self, name: str = "Assertion"):
         self.logger = Logger.get_logger(name)
+        # soft() 上下文中收集的失败 (步骤标题, 详情, 失败说明)，不在上下文中时为 None
+        self._soft_failures: Optional[List[tuple]] = None
 
-    @allure.step("断言相等: 期望 '{expected}' 等于 '{actual}'")
-    def assert_equal(self, actual, expected, message: str = ""):
-        """断言两个值相等"""
-        try:
-            assert actual == expected, message or f"期望值: {expected}, 实际值: {actual}"
-            self.logger.info(f"✓ 断言成功: {actual} == {expected}")
+    @classmethod
+    def _short(cls, value) -> str:
+        """值的字符串形式，过长时截断"""
+        text = str(value)
+        if len(text) > cls.max_value_length:
+            return f"{text[:cls.max_value_length]}...(共 {len(text)} 字符)"
+        return text
+
+    @classmethod
+    def flush_summary(cls):
+        """将当前测试通过的断言汇总为一个 Allure 附件（summary 模式）"""
+        if cls._passed:
             allure.attach(
-                f"期望值: {expected}\n实际值: {actual}\n结果: 通过",
-                name="断言结果",
+                "\n".join(f"✓ {title}" for title in cls._passed),
+                name=f"断言汇总: {len(cls._passed)} 条通过",
                 attachment_type=allure.attachment_type.TEXT
             )
-        except AssertionError as e:
-            self.logger.error(f"✗ 断言失败: {actual} != {expected}")
+            cls._passed = []
+
+    def _report(self, passed: bool, title: str, detail: str, message: str, default_message: str,
+                success_log: tuple, failure_log: tuple):
+        """记录断言结果，失败时抛出 AssertionError
+
+        Args:
+            passed: 断言是否通过
+            title: Allure 步骤标题
+            detail: 附件中的详情（期望值/实际值等）
+            message: 调用方传入的失败说明
+            default_message: 调用方未传 message 时的失败说明
+            success_log: 通过时的日志 (格式, 参数...)
+            failure_log: 失败时的日志 (格式, 参数...)
+        """
+        if passed:
+            self.logger.info(*success_log)
+            if self.verbosity == "summary":
+                Assertion._passed.append(title)
+                return
+            with allure.step(title):
+                if self.verbosity == "full":
+                    allure.attach(
+                        f"{detail}\n结果: 通过",
+                        name="断言结果",
+                        attachment_type=allure.attachment_type.TEXT
+                    )
+            return
+
+        self.logger.error(*failure_log)
+        self._fail(title, f"{detail}\n结果: 失败\n{message}", message or default_message)
+
+    def _fail(self, title: str, detail: str, error: str):
+        """断言失败：soft() 上下文中记录下来，否则生成失败步骤并抛出 AssertionError"""
+        if self._soft_failures is not None:
+            self._soft_failures.append((title, detail, error))
+            return
+        with allure.step(title):
+            allure.attach(detail, name="断言失败详情", attachment_type=allure.attachment_type.TEXT)
+            raise AssertionError(error)
+
+    @contextmanager
+    def soft(self, name: str = "软断言"):
+        """软断言上下文：收集块内所有断言失败，退出时统一报告
+
+        块内的断言失败只记录，不中断执行；退出时生成一个步骤和一个汇总附件，
+        有失败则抛出包含全部失败说明的 AssertionError。块内发生其他异常时，
+        已收集的失败照常附加到报告，原异常继续抛出。嵌套使用时合并到最外层。
+
+        Examples:
+            with assertion.soft():
+                assertion.assert_equal(page.get_text(NAME), "张三", "姓名")
+                assertion.assert_equal(page.get_text(AGE), "35", "年龄")
+        """
+        if self._soft_failures is not None:
+            yield self
+            return
+
+        self._soft_failures = []
+        try:
+            yield self
+        except BaseException:
+            self._report_soft(name, raise_error=False)
+            raise
+        self._report_soft(name, raise_error=True)
+
+    def _report_soft(self, name: str, raise_error: bool):
+        """输出 soft() 上下文收集的失败"""
+        failures, self._soft_failures = self._soft_failures, None
+        if not failures:
+            return
+
+        self.logger.error("✗ %s: %d 项断言失败", name, len(failures))
+        summary = "\n".join(f"{i}. {error}" for i, (_, _, error) in enumerate(failures, 1))
+        with allure.step(f"{name}: {len(failures)} 项断言失败"):
             allure.attach(
-                f"期望值: {expected}\n实际值: {actual}\n结果: 失败\n{message}",
-                name="断言失败详情",
+                "\n\n".join(f"[{i}] {title}\n{detail}" for i, (title, detail, _) in enumerate(failures, 1)),
+                name="软断言失败汇总",
                 attachment_type=allure.attachment_type.TEXT
             )
-            raise AssertionError(str(e))
+            if raise_error:
+                raise AssertionError(f"{len(failures)} 项断言失败:\n{summary}")
+
+    def assert_equal(self, actual, expected, message: str = ""):
+        """断言两个值相等"""
+        a, e = self._short(actual), self._short(expected)
+        self._report(
+            actual == expected,
+            f"断言相等: 期望 '{e}' 等于 '{a}'",
+            f"期望值: {e}\n实际值: {a}",
+            message, f"期望值: {e}, 实际值: {a}",
+            ("✓ 断言成功: %s == %s", a, e),
+            ("✗ 断言失败: %s != %s", a, e)
+        )
 
-    @allure.step("断言不相等: '{actual}' 不等于 '{not_expected}'")
     def assert_not_equal(self, actual, not_expected, message: str = ""):
         """断言两个值不相等"""
-        try:
-            assert actual != not_expected, message or f"期望值不等于: {not_expected}, 实际值: {actual}"
-            self.logger.info(f"✓ 断言成功: {actual} != {not_expected}")
-            allure.attach(
-                f"不期望值: {not_expected}\n实际值: {actual}\n结果: 通过",
-                name="断言结果",
-                attachment_type=allure.attachment_type.TEXT
-            )
-        except AssertionError as e:
-            self.logger.error(f"✗ 断言失败: {actual} == {not_expected}")
-            allure.attach(
-                f"不期望值: {not_expected}\n实际值: {actual}\n结果: 失败\n{message}",
-                name="断言失败详情",
-                attachment_type=allure.attachment_type.TEXT
-            )
-            raise AssertionError(str(e))
+        a, n = self._short(actual), self._short(not_expected)
+        self._report(
+            actual != not_expected,
+            f"断言不相等: '{a}' 不等于 '{n}'",
+            f"不期望值: {n}\n实际值: {a}",
+            message, f"期望值不等于: {n}, 实际值: {a}",
+            ("✓ 断言成功: %s != %s", a, n),
+            ("✗ 断言失败: %s == %s", a, n)
+        )
 
-    @allure.step("断言包含: '{actual}' 包含 '{expected}'")
     def assert_contains(self, actual: str, expected: str, message: str = ""):
         """断言字符串包含某个子串"""
-        try:
-            assert expected in actual, message or f"'{actual}' 不包含 '{expected}'"
-            self.logger.info(f"✓ 断言成功: '{actual}' 包含 '{expected}'")
-            allure.attach(
-                f"期望包含: {expected}\n实际值: {actual}\n结果: 通过",
-                name="断言结果",
-                attachment_type=allure.attachment_type.TEXT
-            )
-        except AssertionError as e:
-            self.logger.error(f"✗ 断言失败: '{actual}' 不包含 '{expected}'")
-            allure.attach(
-                f"期望包含: {expected}\n实际值: {actual}\n结果: 失败\n{message}",
-                name="断言失败详情",
-                attachment_type=allure.attachment_type.TEXT
-            )
-            raise AssertionError(str(e))
+        a, e = self._short(actual), self._short(expected)
+        self._report(
+            expected in actual,
+            f"断言包含: '{a}' 包含 '{e}'",
+            f"期望包含: {e}\n实际值: {a}",
+            message, f"'{a}' 不包含 '{e}'",
+            ("✓ 断言成功: '%s' 包含 '%s'", a, e),
+            ("✗ 断言失败: '%s' 不包含 '%s'", a, e)
+        )
 
-    @allure.step("断言不包含: '{actual}' 不包含 '{not_expected}'")
     def assert_not_contains(self, actual: str, not_expected: str, message: str = ""):
         """断言字符串不包含某个子串"""
-        try:
-            assert not_expected not in actual, message or f"'{actual}' 包含 '{not_expected}'"
-            self.logger.info(f"✓ 断言成功: '{actual}' 不包含 '{not_expected}'")
-            allure.attach(
-                f"不期望包含: {not_expected}\n实际值: {actual}\n结果: 通过",
-                name="断言结果",
-                attachment_type=allure.attachment_type.TEXT
-            )
-        except AssertionError as e:
-            self.logger.error(f"✗ 断言失败: '{actual}' 包含 '{not_expected}'")
-            allure.attach(
-                f"不期望包含: {not_expected}\n实际值: {actual}\n结果: 失败\n{message}",
-                name="断言失败详情",
-                attachment_type=allure.attachment_type.TEXT
-            )
-            raise AssertionError(str(e))
+        a, n = self._short(actual), self._short(not_expected)
+        self._report(
+            not_expected not in actual,
+            f"断言不包含: '{a}' 不包含 '{n}'",
+            f"不期望包含: {n}\n实际值: {a}",
+            message, f"'{a}' 包含 '{n}'",
+            ("✓ 断言成功: '%s' 不包含 '%s'", a, n),
+            ("✗ 断言失败: '%s' 包含 '%s'", a, n)
+        )
 
-    @allure.step("断言为真: {condition}")
     def assert_true(self, condition, message: str = ""):
         """断言条件为真"""
-        try:
-            assert condition is True or condition, message or f"期望为 True, 实际为 {condition}"
-            self.logger.info(f"✓ 断言成功: 条件为 True")
-            allure.attach(
-                f"条件: {condition}\n结果: 通过",
-                name="断言结果",
-                attachment_type=allure.attachment_type.TEXT
-            )
-        except AssertionError as e:
-            self.logger.error(f"✗ 断言失败: 条件为 False")
-            allure.attach(
-                f"条件: {condition}\n结果: 失败\n{message}",
-                name="断言失败详情",
-                attachment_type=allure.attachment_type.TEXT
-            )
-            raise AssertionError(str(e))
+        c = self._short(condition)
+        self._report(
+            condition is True or bool(condition),
+            f"断言为真: {c}",
+            f"条件: {c}",
+            message, f"期望为 True, 实际为 {c}",
+            ("✓ 断言成功: 条件为 True",),
+            ("✗ 断言失败: 条件为 False",)
+        )
 
-    @allure.step("断言为假: {condition}")
     def assert_false(self, condition, message: str = ""):
         """断言条件为假"""
-        try:
-            assert condition is False or not condition, message or f"期望为 False, 实际为 {condition}"
-            self.logger.info(f"✓ 断言成功: 条件为 False")
-            allure.attach(
-                f"条件: {condition}\n结果: 通过",
-                name="断言结果",
-                attachment_type=allure.attachment_type.TEXT
-            )
-        except AssertionError as e:
-            self.logger.error(f"✗ 断言失败: 条件为 True")
-            allure.attach(
-                f"条件: {condition}\n结果: 失败\n{message}",
-                name="断言失败详情",
-                attachment_type=allure.attachment_type.TEXT
-            )
-            raise AssertionError(str(e))
+        c = self._short(condition)
+        self._report(
+            condition is False or not condition,
+            f"断言为假: {c}",
+            f"条件: {c}",
+            message, f"期望为 False, 实际为 {c}",
+            ("✓ 断言成功: 条件为 False",),
+            ("✗ 断言失败: 条件为 True",)
+        )
 
-    @allure.step("断言大于: {actual} > {expected}")
     def assert_greater(self, actual, expected, message: str = ""):
         """断言实际值大于期望值"""
-        try:
-            assert actual > expected, message or f"{actual} 不大于 {expected}"
-            self.logger.info(f"✓ 断言成功: {actual} > {expected}")
-            allure.attach(
-                f"实际值: {actual}\n期望大于: {expected}\n结果: 通过",
-                name="断言结果",
-                attachment_type=allure.attachment_type.TEXT
-            )
-        except AssertionError as e:
-            self.logger.error(f"✗ 断言失败: {actual} <= {expected}")
-            allure.attach(
-                f"实际值: {actual}\n期望大于: {expected}\n结果: 失败\n{message}",
-                name="断言失败详情",
-                attachment_type=allure.attachment_type.TEXT
-            )
-            raise AssertionError(str(e))
+        a, e = self._short(actual), self._short(expected)
+        self._report(
+            actual > expected,
+            f"断言大于: {a} > {e}",
+            f"实际值: {a}\n期望大于: {e}",
+            message, f"{a} 不大于 {e}",
+            ("✓ 断言成功: %s > %s", a, e),
+            ("✗ 断言失败: %s <= %s", a, e)
+        )
 
-    @allure.step("断言小于: {actual} < {expected}")
     def assert_less(self, actual, expected, message: str = ""):
         """断言实际值小于期望值"""
-        try:
-            assert actual < expected, message or f"{actual} 不小于 {expected}"
-            self.logger.info(f"✓ 断言成功: {actual} < {expected}")
-            allure.attach(
-                f"实际值: {actual}\n期望小于: {expected}\n结果: 通过",
-                name="断言结果",
-                attachment_type=allure.attachment_type.TEXT
-            )
-        except AssertionError as e:
-            self.logger.error(f"✗ 断言失败: {actual} >= {expected}")
-            allure.attach(
-                f"实际值: {actual}\n期望小于: {expected}\n结果: 失败\n{message}",
-                name="断言失败详情",
-                attachment_type=allure.attachment_type.TEXT
-            )
-            raise AssertionError(str(e))
+        a, e = self._short(actual), self._short(expected)
+        self._report(
+            actual < expected,
+            f"断言小于: {a} < {e}",
+            f"实际值: {a}\n期望小于: {e}",
+            message, f"{a} 不小于 {e}",
+            ("✓ 断言成功: %s < %s", a, e),
+            ("✗ 断言失败: %s >= %s", a, e)
+        )
 
-    @allure.step("断言在列表中: '{item}' 在 {items}")
     def assert_in(self, item, items, message: str = ""):
         """断言元素在列表中"""
-        try:
-            assert item in items, message or f"'{item}' 不在 {items} 中"
-            self.logger.info(f"✓ 断言成功: '{item}' 在列表中")
-            allure.attach(
-                f"元素: {item}\n列表: {items}\n结果: 通过",
-                name="断言结果",
-                attachment_type=allure.attachment_type.TEXT
-            )
-        except AssertionError as e:
-            self.logger.error(f"✗ 断言失败: '{item}' 不在列表中")
-            allure.attach(
-                f"元素: {item}\n列表: {items}\n结果: 失败\n{message}",
-                name="断言失败详情",
-                attachment_type=allure.attachment_type.TEXT
-            )
-            raise AssertionError(str(e))
+        i, s = self._short(item), self._short(items)
+        self._report(
+            item in items,
+            f"断言在列表中: '{i}' 在 {s}",
+            f"元素: {i}\n列表: {s}",
+            message, f"'{i}' 不在 {s} 中",
+            ("✓ 断言成功: '%s' 在列表中", i),
+            ("✗ 断言失败: '%s' 不在列表中", i)
+        )
 
-    @allure.step("断言元素可见: {selector}")
-    def assert_is_display(self, page, selector: str, message: str = ""):
-        """断言页面元素可见"""
-        try:
-            is_visible = page.is_visible(selector)
-            assert is_visible, message or f"元素 '{selector}' 不可见"
-            self.logger.info(f"✓ 断言成功: 元素 '{selector}' 可见")
-            allure.attach(
-                f"选择器: {selector}\n可见性: 是\n结果: 通过",
-                name="断言结果",
-                attachment_type=allure.attachment_type.TEXT
-            )
-        except AssertionError as e:
-            self.logger.error(f"✗ 断言失败: 元素 '{selector}' 不可见")
-            allure.attach(
-                f"选择器: {selector}\n可见性: 否\n结果: 失败\n{message}",
-                name="断言失败详情",
-                attachment_type=allure.attachment_type.TEXT
-            )
-            raise AssertionError(str(e))
-        except Exception as e:
-            self.logger.error(f"✗ 断言失败: 检查元素 '{selector}' 时出错 - {str(e)}")
-            allure.attach(
-                f"选择器: {selector}\n错误: {str(e)}\n结果: 失败",
-                name="断言失败详情",
-                attachment_type=allure.attachment_type.TEXT
-            )
-            raise AssertionError(f"检查元素可见性时出错: {str(e)}")
+    @staticmethod
+    def _locator(page, locator) -> Locator:
+        """按 BasePage._get_locator 的规则解析定位器；传入页面对象时复用其定位器缓存"""
+        if isinstance(page, BasePage):
+            return locator if isinstance(locator, Locator) else page._get_locator(locator)
+        return BasePage.resolve_locator(page, locator)
 
-    @allure.step("断言元素不可见: {selector}")
-    def assert_not_display(self, page, selector: str, message: str = ""):
-        """断言页面元素不可见"""
+    @staticmethod
+    def _describe(locator) -> str:
+        if isinstance(locator, tuple):
+            return f"Role({locator[0]}, '{locator[1]}')"
+        return str(locator)
+
+    def _expect(self, check: Callable[[], None], title: str, detail: str, message: str,
+                default_message: str, success_log: tuple, failure_log: tuple):
+        """执行 Playwright expect 断言（自动重试直到条件满足或超时），结果按 _report 记录"""
         try:
-            is_visible = page.is_visible(selector)
-            assert not is_visible, message or f"元素 '{selector}' 可见"
-            self.logger.info(f"✓ 断言成功: 元素 '{selector}' 不可见")
-            allure.attach(
-                f"选择器: {selector}\n可见性: 否\n结果: 通过",
-                name="断言结果",
-                attachment_type=allure.attachment_type.TEXT
-            )
+            check()
+            error = None
         except AssertionError as e:
-            self.logger.error(f"✗ 断言失败: 元素 '{selector}' 可见")
-            allure.attach(
-                f"选择器: {selector}\n可见性: 是\n结果: 失败\n{message}",
-                name="断言失败详情",
-                attachment_type=allure.attachment_type.TEXT
-            )
-            raise AssertionError(str(e))
-        except Exception as e:
-            self.logger.error(f"✗ 断言失败: 检查元素 '{selector}' 时出错 - {str(e)}")
-            allure.attach(
-                f"选择器: {selector}\n错误: {str(e)}\n结果: 失败",
-                name="断言失败详情",
-                attachment_type=allure.attachment_type.TEXT
-            )
-            raise AssertionError(f"检查元素可见性时出错: {str(e)}")
+            # 超时仍未满足条件
+            error = str(e)
+        except PlaywrightError as e:
+            # 定位器无效、页面已关闭等
+            error = f"检查元素时出错: {e.message}"
+            default_message = error.splitlines()[0]
+        self._report(
+            error is None, title,
+            detail if error is None else f"{detail}\n{self._short(error)}",
+            message, default_message, success_log, failure_log
+        )
+
+    def assert_is_display(self, page, locator: Union[str, Tuple[str, str], Locator], message: str = "",
+                          timeout: Optional[float] = None):
+        """断言页面元素可见，在超时时间内自动重试
+
+        Args:
+            page: Playwright Page 或页面对象（BasePage 子类实例）
+            locator: 元组 ("role", "name")、CSS/XPath 字符串或 Locator
+            message: 失败说明
+            timeout: 超时时间(毫秒)，默认 ASSERTION_TIMEOUT
+        """
+        target = self._describe(locator)
+        element = self._locator(page, locator)
+        self._expect(
+            lambda: expect(element).to_be_visible(timeout=timeout or self.timeout),
+            f"断言元素可见: {target}",
+            f"定位器: {target}",
+            message, f"元素 '{target}' 不可见",
+            ("✓ 断言成功: 元素 '%s' 可见", target),
+            ("✗ 断言失败: 元素 '%s' 不可见", target)
+        )
+
+    def assert_not_display(self, page, locator: Union[str, Tuple[str, str], Locator], message: str = "",
+                           timeout: Optional[float] = None):
+        """断言页面元素不可见（不存在或隐藏），在超时时间内自动重试"""
+        target = self._describe(locator)
+        element = self._locator(page, locator)
+        self._expect(
+            lambda: expect(element).to_be_hidden(timeout=timeout or self.timeout),
+            f"断言元素不可见: {target}",
+            f"定位器: {target}",
+            message, f"元素 '{target}' 可见",
+            ("✓ 断言成功: 元素 '%s' 不可见", target),
+            ("✗ 断言失败: 元素 '%s' 可见", target)
+        )
+
+    def assert_text(self, page, locator: Union[str, Tuple[str, str], Locator], expected: str,
+                    message: str = "", timeout: Optional[float] = None):
+        """断言元素文本等于期望值，在超时时间内自动重试"""
+        target, e = self._describe(locator), self._short(expected)
+        element = self._locator(page, locator)
+        self._expect(
+            lambda: expect(element).to_have_text(expected, timeout=timeout or self.timeout),
+            f"断言元素文本: {target} 等于 '{e}'",
+            f"定位器: {target}\n期望文本: {e}",
+            message, f"元素 '{target}' 文本不等于 '{e}'",
+            ("✓ 断言成功: 元素 '%s' 文本为 '%s'", target, e),
+            ("✗ 断言失败: 元素 '%s' 文本不为 '%s'", target, e)
+        )
+
+    def assert_text_contains(self, page, locator: Union[str, Tuple[str, str], Locator], expected: str,
+                             message: str = "", timeout: Optional[float] = None):
+        """断言元素文本包含期望子串，在超时时间内自动重试"""
+        target, e = self._describe(locator), self._short(expected)
+        element = self._locator(page, locator)
+        self._expect(
+            lambda: expect(element).to_contain_text(expected, timeout=timeout or self.timeout),
+            f"断言元素文本: {target} 包含 '{e}'",
+            f"定位器: {target}\n期望包含: {e}",
+            message, f"元素 '{target}' 文本不包含 '{e}'",
+            ("✓ 断言成功: 元素 '%s' 文本包含 '%s'", target, e),
+            ("✗ 断言失败: 元素 '%s' 文本不包含 '%s'", target, e)
+        )
+
+    def assert_count(self, page, locator: Union[str, Tuple[str, str], Locator], expected: int,
+                     message: str = "", timeout: Optional[float] = None):
+        """断言匹配定位器的元素数量，在超时时间内自动重试"""
+        target = self._describe(locator)
+        element = self._locator(page, locator)
+        self._expect(
+            lambda: expect(element).to_have_count(expected, timeout=timeout or self.timeout),
+            f"断言元素数量: {target} 共 {expected} 个",
+            f"定位器: {target}\n期望数量: {expected}",
+            message, f"元素 '{target}' 数量不等于 {expected}",
+            ("✓ 断言成功: 元素 '%s' 数量为 %s", target, expected),
+            ("✗ 断言失败: 元素 '%s' 数量不为 %s", target, expected)
+        )
+
+    def assert_attribute(self, page, locator: Union[str, Tuple[str, str], Locator], name: str, value: str,
+                         message: str = "", timeout: Optional[float] = None):
+        """断言元素属性值，在超时时间内自动重试"""
+        target, v = self._describe(locator), self._short(value)
+        element = self._locator(page, locator)
+        self._expect(
+            lambda: expect(element).to_have_attribute(name, value, timeout=timeout or self.timeout),
+            f"断言元素属性: {target} [{name}='{v}']",
+            f"定位器: {target}\n属性: {name}\n期望值: {v}",
+            message, f"元素 '{target}' 属性 {name} 不等于 '{v}'",
+            ("✓ 断言成功: 元素 '%s' 属性 %s='%s'", target, name, v),
+            ("✗ 断言失败: 元素 '%s' 属性 %s!='%s'", target, name, v)
+        )
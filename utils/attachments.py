@@ -0,0 +1,75 @@
+import hashlib
+import allure
+from pathlib import Path
+from typing import Dict
+from playwright.sync_api import Page
+from config.config import ATTACHMENT_MAX_MB, SCREENSHOT_FULL_PAGE, SCREENSHOT_FORMAT, SCREENSHOT_JPEG_QUALITY
+
+
+class Attachments:
+    """Allure 附件处理：以文件方式附加
+
+    - 附件通过 allure.attach.file 由 Allure 直接复制文件，不读入内存
+    - 超过 ATTACHMENT_MAX_MB 的文件不附加，只记录文件路径
+    - 截图可选 JPEG 压缩以减小体积；内容相同的截图只附加一次
+    """
+
+    # 已附加截图的内容哈希 -> 首次附加时的名称
+    _screenshot_hashes: Dict[str, str] = {}
+
+    @classmethod
+    def attach_file(cls, path: Path, name: str, attachment_type, extension: str,
+                    max_mb: float = ATTACHMENT_MAX_MB) -> bool:
+        """附加文件，超过大小上限时只附加文件路径说明
+
+        Returns:
+            是否附加了文件内容
+        """
+        size_mb = path.stat().st_size / 1024 / 1024
+        if max_mb and size_mb > max_mb:
+            allure.attach(
+                f"文件过大未附加: {size_mb:.1f} MB（上限 {max_mb} MB）\n路径: {path.resolve()}",
+                name=f"{name}（未附加）",
+                attachment_type=allure.attachment_type.TEXT
+            )
+            return False
+        allure.attach.file(str(path), name=name, attachment_type=attachment_type, extension=extension)
+        return True
+
+    @classmethod
+    def attach_screenshot(cls, page: Page, path: Path, name: str):
+        """截图写入文件后附加；与之前某张截图内容相同时只附加引用说明
+
+        传入 path 时 Playwright 仍会把截图字节返回给 Python（page.screenshot 总是返回内容），
+        这里直接用返回值计算哈希，不再重新读取文件。
+
+        Args:
+            page: 要截图的页面
+            path: 截图文件路径（不含后缀，按 SCREENSHOT_FORMAT 补充）
+            name: 附件名称
+        """
+        jpeg = SCREENSHOT_FORMAT == "jpeg"
+        path = path.with_suffix(".jpg" if jpeg else ".png")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = page.screenshot(
+            path=str(path),
+            full_page=SCREENSHOT_FULL_PAGE,
+            type="jpeg" if jpeg else "png",
+            quality=SCREENSHOT_JPEG_QUALITY if jpeg else None
+        )
+
+        digest = hashlib.sha1(data).hexdigest()
+        if digest in cls._screenshot_hashes:
+            allure.attach(
+                f"截图与 {cls._screenshot_hashes[digest]} 相同，未重复附加",
+                name=name,
+                attachment_type=allure.attachment_type.TEXT
+            )
+            path.unlink(missing_ok=True)
+            return
+        cls._screenshot_hashes[digest] = name
+        cls.attach_file(
+            path, name,
+            allure.attachment_type.JPG if jpeg else allure.attachment_type.PNG,
+            "jpg" if jpeg else "png"
+        )
@@ -0,0 +1,349 @@
+import base64
+import json
+import re
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+from filelock import FileLock
+from playwright.sync_api import Browser, Playwright
+from config.config import BASE_URL, LOGIN_MODE
+from utils.api_login import api_login
+from utils.data_loader import DataLoader
+
+
+# JWT 格式：三段 base64url，header 固定以 eyJ（即 '{"'）开头
+_JWT_PATTERN = re.compile(r"eyJ[\w-]+\.[\w-]+\.[\w-]*")
+
+
+def decode_jwt_expiry(token: str) -> Optional[float]:
+    """解析 JWT payload 中的 exp 字段（不校验签名）
+
+    Args:
+        token: JWT 字符串
+
+    Returns:
+        过期时间戳（秒），无法解析时返回 None
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+        return float(exp) if exp is not None else None
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return None
+
+
+def _find_jwt_expiries(values: Iterable[str]) -> List[float]:
+    """从一组字符串（cookie 值、localStorage 值）中找出所有 JWT 的过期时间"""
+    expiries = []
+    for value in values:
+        for token in _JWT_PATTERN.findall(value or ""):
+            exp = decode_jwt_expiry(token)
+            if exp is not None:
+                expiries.append(exp)
+    return expiries
+
+
+def _matches_host(domain: str, host: str) -> bool:
+    domain = domain.lstrip(".")
+    return host == domain or host.endswith("." + domain)
+
+
+def get_storage_state_expiry(state: dict, base_url: str = BASE_URL) -> Optional[float]:
+    """从 storage state 推断认证过期时间
+
+    优先使用 cookie/localStorage 中 JWT 的 exp；没有 JWT 时使用目标站点 cookie 的 expires。
+    目标站点存在会话 cookie（expires = -1）时无法判断：认证可能就保存在这个 cookie 中，
+    其他 cookie 的有效期不代表登录状态，返回 None。
+
+    Args:
+        state: Playwright storage state 内容
+        base_url: 被测站点地址，用于筛选相关的 cookie 和 origin
+
+    Returns:
+        最早的过期时间戳（秒），无法判断时返回 None
+    """
+    parts = urlsplit(base_url)
+    host = parts.hostname or ""
+    origin = f"{parts.scheme}://{parts.netloc}"
+
+    cookies = [c for c in state.get("cookies", []) if _matches_host(c.get("domain", ""), host)]
+    storage_values = [
+        item.get("value", "")
+        for entry in state.get("origins", []) if entry.get("origin") == origin
+        for item in entry.get("localStorage", [])
+    ]
+
+    jwt_expiries = _find_jwt_expiries([c.get("value", "") for c in cookies] + storage_values)
+    if jwt_expiries:
+        return min(jwt_expiries)
+
+    if not cookies or any(c.get("expires", -1) <= 0 for c in cookies):
+        return None
+    return min(c["expires"] for c in cookies)
+
+
+def check_storage_state_offline(path: Union[str, Path], margin: int = 60,
+                                base_url: str = BASE_URL) -> Optional[bool]:
+    """离线检查认证状态是否有效，不启动浏览器
+
+    Args:
+        path: storage state 文件路径
+        margin: 提前判定过期的秒数，避免测试执行过程中 token 恰好过期
+        base_url: 被测站点地址
+
+    Returns:
+        True 有效，False 已过期或没有任何认证信息，None 无法判断（需要浏览器验证）
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    if not state.get("cookies") and not any(entry.get("localStorage") for entry in state.get("origins", [])):
+        return False
+
+    expiry = get_storage_state_expiry(state, base_url)
+    if expiry is None:
+        return None
+    return expiry - margin > time.time()
+
+
+# 登录后才会出现的主页元素，用于判断登录是否成功/认证是否有效
+HOME_SELECTOR = "button:has-text('用药记录')"
+
+# 认证状态验证结果缓存：(文件路径, 修改时间) -> 是否有效，同一进程内不重复验证
+_VALIDATION_CACHE: Dict[Tuple[str, int], bool] = {}
+
+
+class AuthStateCache:
+    """按账号/角色缓存登录状态
+
+    每个角色对应 login/login_data.yaml 中的一个账号，拥有独立的 storage state 文件、
+    有效期和文件锁；第一次使用某个角色时才检查并按需登录，之后同一会话内直接复用。
+    登录优先直接调用登录接口（需要传入 playwright），页面登录作为回退。
+
+    Examples:
+        cache = AuthStateCache(browser, Path("test_data"))
+        state_path = cache.get("valid_user")
+        context = browser.new_context(storage_state=str(state_path))
+    """
+
+    # 账号数据文件
+    ACCOUNTS_FILE = "login/login_data.yaml"
+
+    def __init__(self, browser: Browser, state_dir: Path, default_role: str = "valid_user",
+                 expiry: int = 60 * 60, check_mode: str = "offline", lock_timeout: int = 120,
+                 playwright: Optional[Playwright] = None, login_mode: str = LOGIN_MODE,
+                 reconnect: Optional[Callable[[], Browser]] = None):
+        """
+        Args:
+            browser: 用于页面登录和浏览器验证的浏览器
+            state_dir: storage state 文件保存目录
+            default_role: 默认角色，其状态文件为 auth_state.json
+            expiry: 默认有效期（秒），账号数据中的 auth_expiry 可单独覆盖
+            check_mode: 认证状态验证方式，'offline' 或 'browser'
+            lock_timeout: 等待其他 worker 完成登录的最长时间（秒）
+            playwright: Playwright 实例，接口登录时使用
+            login_mode: 登录方式，'api'、'ui' 或 'auto'（先接口后页面）
+            reconnect: 浏览器连接断开时重新连接的回调（常驻浏览器服务重启后使用）
+        """
+        self.browser = browser
+        self.state_dir = Path(state_dir)
+        self.default_role = default_role
+        self.expiry = expiry
+        self.check_mode = check_mode
+        self.lock_timeout = lock_timeout
+        self.playwright = playwright
+        self.login_mode = login_mode
+        self.reconnect = reconnect
+        self._resolved: Dict[str, Path] = {}
+
+    def path_for(self, role: str) -> Path:
+        """角色对应的 storage state 文件路径"""
+        if role == self.default_role:
+            return self.state_dir / "auth_state.json"
+        return self.state_dir / f"auth_state_{role}.json"
+
+    def _account(self, role: str) -> dict:
+        account = DataLoader.get_test_data(self.ACCOUNTS_FILE, role)
+        if not account.get("username"):
+            raise ValueError(f"未找到角色 '{role}' 的账号数据: {self.ACCOUNTS_FILE}")
+        return account
+
+    def _live_browser(self) -> Browser:
+        """当前可用的浏览器，连接已断开且提供了 reconnect 时重新连接"""
+        if self.reconnect and not self.browser.is_connected():
+            self.browser = self.reconnect()
+        return self.browser
+
+    def _probe_in_browser(self, path: Path) -> bool:
+        """
+        通过浏览器验证保存的认证状态是否仍然有效
+        尝试访问需要认证的页面并检查关键元素来判断
+        """
+        try:
+            # 创建使用保存状态的临时上下文
+            context = self._live_browser().new_context(storage_state=str(path))
+            page = context.new_page()
+
+            # 访问主页
+            page.goto(BASE_URL, timeout=10000)
+
+            # 检查是否存在登录后才有的元素（如"用药记录"按钮）
+            # 如果找到该元素，说明认证有效；否则可能跳转到了登录页
+            try:
+                page.wait_for_selector(HOME_SELECTOR, timeout=5000)
+                context.close()
+                return True
+            except:
+                context.close()
+                return False
+
+        except Exception as e:
+            print(f"⚠ 验证认证状态失败: {e}")
+            return False
+
+    def is_valid(self, path: Path) -> bool:
+        """
+        验证保存的认证状态是否仍然有效
+
+        offline 模式直接读取 storage state，根据 cookie/JWT 的过期时间判断，
+        只有无法确定过期时间时才回退到浏览器验证；结果按文件修改时间缓存在进程内
+        """
+        if not path.exists():
+            return False
+
+        cache_key = (str(path), path.stat().st_mtime_ns)
+        if cache_key in _VALIDATION_CACHE:
+            return _VALIDATION_CACHE[cache_key]
+
+        valid = None
+        if self.check_mode == "offline":
+            valid = check_storage_state_offline(path)
+            if valid is None:
+                print("ℹ 无法从认证状态中解析过期时间，使用浏览器验证")
+
+        if valid is None:
+            valid = self._probe_in_browser(path)
+
+        _VALIDATION_CACHE[cache_key] = valid
+        return valid
+
+    def login(self, role: str) -> Path:
+        """
+        执行登录并保存认证状态
+        auto 模式下先调用登录接口，失败后回退到页面登录
+        """
+        if self.login_mode in ("api", "auto") and self.playwright is not None:
+            try:
+                return self._login_via_api(role)
+            except Exception as e:
+                if self.login_mode == "api":
+                    raise
+                print(f"⚠ [{role}] 接口登录失败，改用页面登录: {e}")
+        return self._login_via_ui(role)
+
+    def _login_via_api(self, role: str) -> Path:
+        """通过登录接口获取会话，在浏览器中验证能打开主页后才保存认证状态
+
+        接口返回 2xx 并带有 cookie 不代表登录成功（如负载均衡 cookie、SPA 的 200 兜底页），
+        未经验证的状态一旦保存会在整个有效期内被复用
+        """
+        path = self.path_for(role)
+        account = self._account(role)
+        pending = path.with_name(f"{path.stem}.pending{path.suffix}")
+        api_login(self.playwright, account["username"], account["password"], state_path=pending)
+        if not self._probe_in_browser(pending):
+            pending.unlink(missing_ok=True)
+            raise RuntimeError("接口登录返回的会话无法进入主页（未检测到登录后的主页元素）")
+        pending.replace(path)
+        print(f"✓ [{role}] 接口登录成功，登录状态已验证并保存到: {path}")
+        return path
+
+    def _login_via_ui(self, role: str) -> Path:
+        """通过登录页面登录并保存认证状态"""
+        from pages.common.login.login_page import LoginPage
+
+        path = self.path_for(role)
+        account = self._account(role)
+
+        # 创建临时上下文进行登录
+        context = self._live_browser().new_context()
+        page = context.new_page()
+
+        try:
+            # 执行登录流程
+            login_page = LoginPage(page)
+            login_page.open()
+            login_page.login(account["username"], account["password"])
+
+            # 等待登录成功 - 等待特定元素出现确保登录完成
+            try:
+                page.wait_for_selector(HOME_SELECTOR, timeout=5000)
+                print(f"✓ [{role}] 登录成功，已检测到主页元素")
+            except:
+                print(f"⚠ [{role}] 警告：未检测到登录后的主页元素，但继续保存状态")
+                page.wait_for_load_state("networkidle")
+
+            # 保存认证状态
+            path.parent.mkdir(parents=True, exist_ok=True)
+            context.storage_state(path=str(path))
+
+            print(f"✓ [{role}] 登录状态已保存到: {path}")
+
+        finally:
+            context.close()
+
+        return path
+
+    def get(self, role: Optional[str] = None) -> Path:
+        """
+        获取角色的认证状态文件，必要时登录
+
+        检测流程：
+        1. 检查文件是否存在
+        2. 检查文件是否过期（基于修改时间和角色有效期）
+        3. 验证认证状态是否有效（默认离线解析过期时间，必要时访问需要认证的页面）
+        4. 如果无效或过期，自动重新登录
+
+        并行模式下持文件锁检查并刷新，第一个拿到锁的 worker 负责登录，其余 worker 直接复用
+        """
+        role = role or self.default_role
+        if role in self._resolved:
+            return self._resolved[role]
+
+        path = self.path_for(role)
+        expiry = self._account(role).get("auth_expiry", self.expiry)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with FileLock(str(path) + ".lock", timeout=self.lock_timeout):
+            need_refresh = False
+
+            # 检查1：文件是否存在
+            if not path.exists():
+                print(f"ℹ [{role}] 认证状态文件不存在，需要登录")
+                need_refresh = True
+
+            # 检查2：文件是否过期（基于修改时间）
+            elif time.time() - path.stat().st_mtime > expiry:
+                print(f"ℹ [{role}] 认证状态文件已过期（超过 {expiry/3600} 小时），需要重新登录")
+                need_refresh = True
+
+            # 检查3：验证认证状态是否有效
+            elif not self.is_valid(path):
+                print(f"ℹ [{role}] 认证状态已失效，需要重新登录")
+                need_refresh = True
+            else:
+                print(f"✓ [{role}] 使用现有有效的认证状态")
+
+            # 如果需要刷新，删除旧文件并重新登录
+            if need_refresh:
+                if path.exists():
+                    path.unlink()
+                self.login(role)
+
+        self._resolved[role] = path
+        return path
@@ -0,0 +1,230 @@
+import argparse
+import json
+import os
+import queue
+import signal
+import socket
+import subprocess
+import threading
+from importlib.metadata import version
+from pathlib import Path
+from typing import Optional, Tuple
+from urllib.parse import urlsplit
+import playwright
+from filelock import FileLock
+from playwright.sync_api import Browser, BrowserType, Error as PlaywrightError
+from utils.logger import Logger
+
+
+# 在 Playwright 自带的 node 中启动 browserType.launchServer（Python API 没有 launch_server），
+# 输出 ws 地址后常驻；浏览器退出时进程随之退出，便于健康检查发现。
+# launchServer 默认监听所有网卡（GET /json 会返回 ws 路径），这里强制只监听本机回环地址
+_LAUNCH_SCRIPT = """
+const net = require("net");
+const listen = net.Server.prototype.listen;
+net.Server.prototype.listen = function (port, ...rest) {
+  if ((port === undefined || typeof port === "number") && typeof rest[0] !== "string") {
+    rest.unshift("127.0.0.1");
+  }
+  return listen.call(this, port, ...rest);
+};
+const [packageDir, browserName, options] = process.argv.slice(1);
+const playwright = require(packageDir);
+playwright[browserName].launchServer(JSON.parse(options)).then(server => {
+  console.log(server.wsEndpoint());
+  server.on("close", () => process.exit(0));
+  const close = () => server.close().then(() => process.exit(0));
+  process.on("SIGTERM", close);
+  process.on("SIGINT", close);
+}).catch(error => {
+  console.error(error);
+  process.exit(1);
+});
+"""
+
+# Python launch 参数 -> launchServer 参数
+_OPTION_NAMES = {
+    "headless": "headless",
+    "channel": "channel",
+    "args": "args",
+    "slow_mo": "slowMo",
+    "executable_path": "executablePath",
+    "devtools": "devtools",
+}
+
+
+def _driver_paths() -> Tuple[Path, Path]:
+    """Playwright 自带的 node 可执行文件和 playwright-core 包目录（查找方式与 driver/playwright.sh 一致）"""
+    driver = Path(playwright.__file__).parent / "driver"
+    node = os.environ.get("PLAYWRIGHT_NODEJS_PATH") or driver / ("node.exe" if os.name == "nt" else "node")
+    return Path(node), driver / "package"
+
+
+class BrowserServer:
+    """跨 pytest 运行常驻的浏览器服务
+
+    第一次运行时通过 launchServer 启动浏览器服务，ws 地址和进程号写入 .cache/browser_server.json；
+    之后的运行（以及并行 worker）直接 connect 复用，省去每次启动浏览器的时间。
+    测试之间的隔离由每个测试独立的上下文保证。
+
+    服务进程或浏览器退出、启动参数变化（如 headless）、Playwright 版本变化时自动重启。
+    停止服务：python -m utils.browser_server stop
+
+    Examples:
+        server = BrowserServer("chromium", {"headless": True})
+        browser = server.connect(playwright.chromium)
+        ...
+        browser.close()  # 只断开连接，服务继续运行
+    """
+
+    STATE_PATH = Path(__file__).parent.parent / ".cache" / "browser_server.json"
+    LOG_PATH = Path(__file__).parent.parent / ".cache" / "browser_server.log"
+
+    # 等待服务输出 ws 地址的最长时间（秒）
+    START_TIMEOUT = 60
+
+    # connect 超时（毫秒）
+    CONNECT_TIMEOUT = 10000
+
+    def __init__(self, browser_name: str, launch_args: Optional[dict] = None):
+        self.browser_name = browser_name
+        self.options = {
+            _OPTION_NAMES[key]: value for key, value in (launch_args or {}).items() if key in _OPTION_NAMES
+        }
+        self.logger = Logger(self.__class__.__name__)
+        self._browser: Optional[Browser] = None
+
+    def _signature(self) -> dict:
+        return {"browser": self.browser_name, "options": self.options, "playwright": version("playwright")}
+
+    @classmethod
+    def _read_state(cls) -> Optional[dict]:
+        try:
+            with open(cls.STATE_PATH, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def is_healthy(state: dict) -> bool:
+        """健康检查：服务进程存在，且 ws 端口可以连接"""
+        # Windows 上 os.kill 会直接结束进程，只检查端口
+        if os.name != "nt":
+            try:
+                os.kill(state["pid"], 0)
+            except (OSError, KeyError):
+                return False
+        parts = urlsplit(state.get("ws_endpoint", ""))
+        try:
+            with socket.create_connection((parts.hostname, parts.port), timeout=1):
+                return True
+        except (OSError, TypeError):
+            return False
+
+    @staticmethod
+    def _kill(state: dict):
+        try:
+            os.kill(state["pid"], signal.SIGTERM)
+        except (OSError, KeyError):
+            pass
+
+    def _start(self) -> dict:
+        node, package = _driver_paths()
+        self.STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.LOG_PATH, "ab") as log:
+            process = subprocess.Popen(
+                [str(node), "-e", _LAUNCH_SCRIPT, str(package), self.browser_name, json.dumps(self.options)],
+                stdout=subprocess.PIPE,
+                stderr=log,
+                stdin=subprocess.DEVNULL,
+                # 独立的进程组：pytest 结束（包括 Ctrl+C）时服务不随之退出
+                start_new_session=os.name != "nt",
+                creationflags=getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0),
+            )
+        lines: "queue.Queue[str]" = queue.Queue()
+        threading.Thread(target=lambda: lines.put(process.stdout.readline().decode().strip()), daemon=True).start()
+        try:
+            endpoint = lines.get(timeout=self.START_TIMEOUT)
+        except queue.Empty:
+            endpoint = ""
+        if not endpoint.startswith("ws://"):
+            process.kill()
+            raise RuntimeError(f"浏览器服务启动失败，详见 {self.LOG_PATH}")
+        state = {"ws_endpoint": endpoint, "pid": process.pid, **self._signature()}
+        with open(self.STATE_PATH, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        print(f"✓ 浏览器服务已启动: {endpoint} (pid {process.pid})")
+        return state
+
+    def endpoint(self, failed_endpoint: Optional[str] = None) -> str:
+        """返回可用服务的 ws 地址，服务不存在、不健康或参数变化时（重新）启动
+
+        Args:
+            failed_endpoint: 调用方连接失败的地址；其他 worker 已经重启过时直接返回新地址
+        """
+        with FileLock(str(self.STATE_PATH) + ".lock"):
+            state = self._read_state()
+            if state:
+                reusable = (
+                    state.get("ws_endpoint") != failed_endpoint
+                    and {key: state.get(key) for key in self._signature()} == self._signature()
+                    and self.is_healthy(state)
+                )
+                if reusable:
+                    return state["ws_endpoint"]
+                self.logger.info("浏览器服务不可用或启动参数已变化，重新启动: %s", state.get("ws_endpoint"))
+                self._kill(state)
+            return self._start()["ws_endpoint"]
+
+    def connect(self, browser_type: BrowserType) -> Browser:
+        """连接浏览器服务，连接失败时重启服务后重试一次"""
+        endpoint = self.endpoint()
+        try:
+            return browser_type.connect(endpoint, timeout=self.CONNECT_TIMEOUT)
+        except PlaywrightError as e:
+            self.logger.warning("连接浏览器服务失败，重启服务: %s, 错误: %s", endpoint, e)
+            return browser_type.connect(self.endpoint(failed_endpoint=endpoint), timeout=self.CONNECT_TIMEOUT)
+
+    def shared_browser(self, browser_type: BrowserType) -> Browser:
+        """进程内共享的连接，连接断开（服务被重启等）时重新连接
+
+        browser fixture、上下文工厂和认证状态缓存都通过它取浏览器，重连后各处拿到的是同一个新连接。
+        """
+        if self._browser is None or not self._browser.is_connected():
+            self._browser = self.connect(browser_type)
+        return self._browser
+
+    def disconnect(self):
+        """断开共享连接，服务继续运行"""
+        if self._browser is not None:
+            self._browser.close()
+            self._browser = None
+
+    @classmethod
+    def stop(cls) -> bool:
+        """停止常驻的浏览器服务，返回是否有服务被停止"""
+        with FileLock(str(cls.STATE_PATH) + ".lock"):
+            state = cls._read_state()
+            if not state:
+                return False
+            cls._kill(state)
+            cls.STATE_PATH.unlink(missing_ok=True)
+            return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="常驻浏览器服务（pytest --reuse-browser）")
+    parser.add_argument("command", choices=["status", "stop"])
+    args = parser.parse_args()
+    if args.command == "stop":
+        print("✓ 浏览器服务已停止" if BrowserServer.stop() else "ℹ 没有运行中的浏览器服务")
+        return
+    state = BrowserServer._read_state()
+    if state and BrowserServer.is_healthy(state):
+        print(f"✓ 浏览器服务运行中: {state['ws_endpoint']} (pid {state['pid']}, {state['browser']}, {state['options']})")
+    else:
+        print("ℹ 没有运行中的浏览器服务")
+
+
+if __name__ == "__main__":
+    main()
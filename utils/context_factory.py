@@ -0,0 +1,179 @@
+import time
+import allure
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Union
+from playwright.sync_api import Browser, BrowserContext, Page, Playwright
+from utils.context_pool import ContextPool
+from utils.har_replay import HarReplay
+from utils.logger import Logger
+from utils.network_blocker import NetworkBlocker
+from utils.sleep_report import SleepRecorder
+from utils.trace_recorder import TraceRecorder
+
+
+class PageSession:
+    """ContextFactory.open 返回的句柄：测试使用的上下文、页面、trace 录制器、网络拦截和 HAR 回放"""
+
+    def __init__(self, name: str, context: BrowserContext, page: Page, tracer: TraceRecorder,
+                 blocker: NetworkBlocker, har: Optional[HarReplay], storage_state: Optional[Union[str, Path]],
+                 pooled: bool):
+        self.name = name
+        self.context = context
+        self.page = page
+        self.tracer = tracer
+        self.blocker = blocker
+        self.har = har
+        self.storage_state = storage_state
+        self.pooled = pooled
+
+
+class ContextFactory:
+    """测试用浏览器上下文的统一创建和回收
+
+    page / authenticated_page 等 fixture 都通过该工厂创建上下文，上下文参数、tracing、
+    HAR 录制、网络拦截、设备模拟和上下文池只在这里处理一次。
+
+    单个测试可通过 @pytest.mark.context(...) 传入 open() 的参数，例如：
+        @pytest.mark.context(device="iPhone 13", network_profile="forms-only")
+
+    计时钩子：on("create" | "teardown" | "trace", callback)，callback(name, seconds) 在每次
+    创建/回收上下文、停止 tracing 后调用（teardown 包含 trace）；stats 中累计次数和耗时。
+
+    Examples:
+        factory = ContextFactory(browser, playwright, {"viewport": {"width": 1920, "height": 1080}})
+        session = factory.open("test_login", storage_state=state_path)
+        ...
+        trace_paths = factory.close(session, failed=False)
+    """
+
+    EVENTS = ("create", "teardown", "trace")
+
+    def __init__(self, browser: Browser, playwright: Playwright, context_args: Optional[dict] = None,
+                 pool: Optional[ContextPool] = None, trace_mode: str = "off", trace_dir: Path = Path("test-results"),
+                 trace_chunks: int = 5, sleep_report: bool = False, network_profile: str = "none",
+                 har_mode: str = "off", har_url_pattern: str = "**/api/**",
+                 reconnect: Optional[Callable[[], Browser]] = None):
+        """
+        Args:
+            browser: 用于创建上下文的浏览器
+            playwright: Playwright 实例（设备模拟时读取 playwright.devices）
+            context_args: 创建上下文的默认参数（browser_context_args）
+            pool: 上下文池，为 None 时每个测试新建上下文
+            trace_mode: TraceRecorder 模式
+            trace_dir: trace 文件保存目录
+            trace_chunks: chunks 模式每块包含的顶层步骤数
+            sleep_report: 是否记录 page.wait_for_timeout 固定等待
+            network_profile: 默认的网络拦截预设（NETWORK_PROFILES 中的 key）
+            har_mode: HarReplay 模式，open() 传入 har 路径时生效
+            har_url_pattern: 通过 HAR 录制/回放的请求 URL 通配符
+            reconnect: 浏览器连接断开时重新连接的回调（常驻浏览器服务重启后使用）
+        """
+        self.browser = browser
+        self.playwright = playwright
+        self.context_args = context_args or {}
+        self.pool = pool
+        self.trace_mode = trace_mode
+        self.trace_dir = trace_dir
+        self.trace_chunks = trace_chunks
+        self.sleep_report = sleep_report
+        self.network_profile = network_profile
+        self.har_mode = har_mode
+        self.har_url_pattern = har_url_pattern
+        self.reconnect = reconnect
+        self.logger = Logger(self.__class__.__name__)
+
+        self._hooks: Dict[str, List[Callable[[str, float], None]]] = {event: [] for event in self.EVENTS}
+        self.stats = {"created": 0, "create_seconds": 0.0, "teardown_seconds": 0.0, "trace_seconds": 0.0}
+
+    def on(self, event: str, callback: Callable[[str, float], None]):
+        """注册计时钩子"""
+        if event not in self._hooks:
+            raise ValueError(f"不支持的事件: {event}, 可选: {', '.join(self.EVENTS)}")
+        self._hooks[event].append(callback)
+
+    def _emit(self, event: str, name: str, seconds: float):
+        self.stats[f"{event}_seconds"] += seconds
+        for callback in self._hooks[event]:
+            callback(name, seconds)
+
+    def _build_args(self, device: Optional[str], record_har: Optional[Union[str, Path]], context_args: dict) -> dict:
+        args = dict(self.context_args)
+        if device:
+            args.update(self.playwright.devices[device])
+        if record_har:
+            Path(record_har).parent.mkdir(parents=True, exist_ok=True)
+            args["record_har_path"] = str(record_har)
+        args.update(context_args)
+        return args
+
+    def open(self, name: str, storage_state: Optional[Union[str, Path]] = None, device: Optional[str] = None,
+             record_har: Optional[Union[str, Path]] = None, network_profile: Optional[str] = None,
+             block: Iterable[str] = (), block_urls: Iterable[str] = (), har: Optional[Path] = None,
+             **context_args) -> PageSession:
+        """创建测试使用的上下文和页面，并按 trace 模式开始录制
+
+        Args:
+            name: 测试名称（用于 trace 文件名和计时钩子）
+            storage_state: 登录状态文件，None 表示不带登录状态
+            device: 模拟的设备名称（playwright.devices 中的 key）
+            record_har: 录制 HAR 的文件路径
+            network_profile: 网络拦截预设，默认使用工厂的 network_profile
+            block: 在预设之外额外拦截的资源类型
+            block_urls: 在预设之外额外拦截的 URL 通配符
+            har: 本测试的 HAR 文件路径，按工厂的 har_mode 录制/回放
+            **context_args: 其他 browser.new_context 参数，覆盖默认参数
+        """
+        start = time.perf_counter()
+        if self.reconnect and not self.browser.is_connected():
+            self.logger.warning("浏览器连接已断开，重新连接")
+            self.browser = self.reconnect()
+            if self.pool:
+                # 池中旧浏览器的上下文在取用时健康检查失败并被丢弃
+                self.pool.browser = self.browser
+        blocker = NetworkBlocker.from_profile(network_profile or self.network_profile, block, block_urls)
+        use_har = har is not None and self.har_mode != "off"
+        # 上下文池中的上下文参数相同，只有使用默认参数时才从池中取用；
+        # 拦截路由在归还时由池移除，HAR 回放（route_from_har）无法移除，启用 HAR 时不使用池
+        pooled = self.pool is not None and not (device or record_har or context_args or use_har)
+        if pooled:
+            context = self.pool.acquire(storage_state)
+        else:
+            args = self._build_args(device, record_har, context_args)
+            if storage_state:
+                args["storage_state"] = str(storage_state)
+            context = self.browser.new_context(**args)
+        blocker.install(context)
+        har_replay = None
+        if use_har:
+            har_replay = HarReplay(context, self.har_mode, Path(har), self.har_url_pattern)
+            har_replay.install()
+
+        page = context.new_page()
+        if self.sleep_report:
+            SleepRecorder.install(page)
+
+        tracer = TraceRecorder(context, self.trace_mode, self.trace_dir, name, chunks=self.trace_chunks)
+        tracer.start()
+
+        self.stats["created"] += 1
+        self._emit("create", name, time.perf_counter() - start)
+        return PageSession(name, context, page, tracer, blocker, har_replay, storage_state, pooled)
+
+    def close(self, session: PageSession, failed: bool) -> List[Path]:
+        """停止 tracing 并回收上下文（放回池中或关闭），返回保存的 trace 文件列表"""
+        start = time.perf_counter()
+        trace_paths = session.tracer.stop(failed=failed)
+        self._emit("trace", session.name, time.perf_counter() - start)
+        summary = session.blocker.finish()
+        if session.blocker.enabled:
+            self.logger.info("%s %s", session.name, summary)
+            allure.attach(summary, name="网络拦截统计", attachment_type=allure.attachment_type.TEXT)
+        if session.pooled:
+            self.pool.release(session.context, session.storage_state)
+        else:
+            # HAR 录制在上下文关闭时写入文件
+            session.context.close()
+            if session.har:
+                session.har.finish()
+        self._emit("teardown", session.name, time.perf_counter() - start)
+        return trace_paths
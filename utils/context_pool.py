@@ -0,0 +1,250 @@
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+from playwright.sync_api import Browser, BrowserContext
+from config.config import BASE_URL
+from utils.logger import Logger
+
+
+# 匿名上下文（不带登录状态）在池中的分组键
+ANONYMOUS_KEY = "anonymous"
+
+# 重置 storage 时使用的脚本：清空当前源的存储，再写回 storage state 中保存的 localStorage
+_RESET_STORAGE_SCRIPT = """items => {
+    window.localStorage.clear();
+    window.sessionStorage.clear();
+    for (const item of items) {
+        window.localStorage.setItem(item.name, item.value);
+    }
+}"""
+
+
+class ContextPool:
+    """浏览器上下文池，按 storage state 分组保持预热的 BrowserContext
+
+    测试结束后上下文不会被关闭，而是重置（清空 cookies、storage、权限和路由）后放回池中，
+    下一个使用相同 storage state 的测试直接取用，省去创建上下文和加载认证状态的开销。
+
+    Examples:
+        pool = ContextPool(browser, {"viewport": {"width": 1920, "height": 1080}}, size=2)
+        context = pool.acquire(storage_state)
+        ...
+        pool.release(context, storage_state)
+    """
+
+    def __init__(self, browser: Browser, context_args: Optional[dict] = None,
+                 size: int = 2, max_uses: int = 50):
+        """
+        Args:
+            browser: 用于创建上下文的浏览器
+            context_args: 创建上下文时的通用参数（如 viewport）
+            size: 每个 storage state 分组最多保留的空闲上下文数量
+            max_uses: 单个上下文最多复用次数，超过后关闭重建，避免状态累积
+        """
+        self.browser = browser
+        self.context_args = context_args or {}
+        self.size = size
+        self.max_uses = max_uses
+        self.logger = Logger(self.__class__.__name__)
+
+        self._idle: Dict[str, List[BrowserContext]] = {}
+        self._uses: Dict[BrowserContext, int] = {}
+        self._states: Dict[str, Optional[dict]] = {}
+        # 上下文 -> 通过 route 注册、尚未移除的路由；None 表示注册过无法移除的路由（route_from_har）
+        self._routes: Dict[BrowserContext, Optional[List[Tuple[Any, Any]]]] = {}
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "resets": 0,
+            "discarded": 0,
+            "hit_seconds": 0.0,
+            "miss_seconds": 0.0,
+            "reset_seconds": 0.0,
+        }
+
+    @staticmethod
+    def _key(storage_state: Optional[Union[str, Path]]) -> str:
+        return str(storage_state) if storage_state else ANONYMOUS_KEY
+
+    def _load_state(self, storage_state: Optional[Union[str, Path]]) -> Optional[dict]:
+        """读取 storage state 内容，用于重置后恢复 cookies 和 localStorage"""
+        key = self._key(storage_state)
+        if key not in self._states:
+            if storage_state and Path(storage_state).exists():
+                with open(storage_state, "r", encoding="utf-8") as f:
+                    self._states[key] = json.load(f)
+            else:
+                self._states[key] = None
+        return self._states[key]
+
+    def _create(self, storage_state: Optional[Union[str, Path]]) -> BrowserContext:
+        args = dict(self.context_args)
+        if storage_state:
+            args["storage_state"] = str(storage_state)
+        context = self.browser.new_context(**args)
+        self._uses[context] = 0
+        self._track_routes(context)
+        return context
+
+    def _track_routes(self, context: BrowserContext):
+        """记录测试在上下文上注册的路由，重置时逐个移除
+
+        Playwright 1.40 没有 unroute_all，公开 API 也无法查询已注册的路由
+        """
+        self._routes[context] = []
+        route, unroute, route_from_har = context.route, context.unroute, context.route_from_har
+
+        def tracked_route(url, handler, **kwargs):
+            if self._routes.get(context) is not None:
+                self._routes[context].append((url, handler))
+            return route(url, handler, **kwargs)
+
+        def tracked_unroute(url, handler=None):
+            if self._routes.get(context):
+                self._routes[context] = [
+                    (u, h) for u, h in self._routes[context] if not (u == url and handler in (None, h))
+                ]
+            return unroute(url, handler)
+
+        def tracked_route_from_har(*args, **kwargs):
+            self._routes[context] = None
+            return route_from_har(*args, **kwargs)
+
+        context.route = tracked_route
+        context.unroute = tracked_unroute
+        context.route_from_har = tracked_route_from_har
+
+    def _is_healthy(self, context: BrowserContext) -> bool:
+        """健康检查：浏览器仍连接，且上下文能正常响应协议调用"""
+        if not self.browser.is_connected():
+            return False
+        try:
+            context.cookies()
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, context: BrowserContext):
+        self.stats["discarded"] += 1
+        self._uses.pop(context, None)
+        self._routes.pop(context, None)
+        try:
+            context.close()
+        except Exception:
+            pass
+
+    def _reset(self, context: BrowserContext, storage_state: Optional[Union[str, Path]]):
+        """重置上下文到刚创建时的状态"""
+        for page in list(context.pages):
+            page.close()
+
+        routes = self._routes.get(context, [])
+        if routes is None:
+            raise RuntimeError("上下文注册了无法移除的路由（route_from_har）")
+        for url, handler in routes:
+            context.unroute(url, handler)
+
+        context.clear_cookies()
+        context.clear_permissions()
+        context.set_offline(False)
+
+        state = self._load_state(storage_state) or {}
+        if state.get("cookies"):
+            context.add_cookies(state["cookies"])
+
+        # 清空各源的 localStorage/sessionStorage 并恢复 storage state 中的数据；
+        # 拦截所有请求返回空页面，不产生真实网络请求
+        origins = {item["origin"]: item.get("localStorage", []) for item in state.get("origins", [])}
+        base = urlsplit(BASE_URL)
+        origins.setdefault(f"{base.scheme}://{base.netloc}", [])
+
+        page = context.new_page()
+        try:
+            page.route("**/*", lambda route: route.fulfill(status=200, content_type="text/html", body=""))
+            for origin, items in origins.items():
+                page.goto(origin)
+                page.evaluate(_RESET_STORAGE_SCRIPT, items)
+        finally:
+            page.close()
+
+    def acquire(self, storage_state: Optional[Union[str, Path]] = None) -> BrowserContext:
+        """从池中取出一个上下文，池中没有可用上下文时新建
+
+        Args:
+            storage_state: 认证状态文件路径，None 表示不带登录状态
+
+        Returns:
+            可直接使用的 BrowserContext
+        """
+        start = time.perf_counter()
+        idle = self._idle.setdefault(self._key(storage_state), [])
+
+        while idle:
+            context = idle.pop()
+            if self._is_healthy(context):
+                self.stats["hits"] += 1
+                self.stats["hit_seconds"] += time.perf_counter() - start
+                return context
+            self.logger.warning("上下文健康检查失败，已丢弃")
+            self._discard(context)
+
+        context = self._create(storage_state)
+        self.stats["misses"] += 1
+        self.stats["miss_seconds"] += time.perf_counter() - start
+        return context
+
+    def release(self, context: BrowserContext, storage_state: Optional[Union[str, Path]] = None):
+        """归还上下文：重置后放回池中，池已满或超过复用次数时直接关闭"""
+        idle = self._idle.setdefault(self._key(storage_state), [])
+        self._uses[context] = self._uses.get(context, 0) + 1
+
+        if len(idle) >= self.size or self._uses[context] >= self.max_uses:
+            self._uses.pop(context, None)
+            self._routes.pop(context, None)
+            context.close()
+            return
+
+        start = time.perf_counter()
+        try:
+            self._reset(context, storage_state)
+        except Exception as e:
+            self.logger.warning("上下文重置失败，已丢弃: %s", e)
+            self._discard(context)
+            return
+
+        self.stats["resets"] += 1
+        self.stats["reset_seconds"] += time.perf_counter() - start
+        idle.append(context)
+
+    def warm(self, storage_state: Optional[Union[str, Path]] = None, count: Optional[int] = None):
+        """预先创建上下文放入池中"""
+        idle = self._idle.setdefault(self._key(storage_state), [])
+        target = min(count or self.size, self.size)
+        while len(idle) < target:
+            idle.append(self._create(storage_state))
+
+    def close(self):
+        """关闭池中所有空闲上下文"""
+        for idle in self._idle.values():
+            for context in idle:
+                try:
+                    context.close()
+                except Exception:
+                    pass
+            idle.clear()
+        self._uses.clear()
+        self._routes.clear()
+
+    def summary(self) -> str:
+        """统计信息：命中、未命中、重置次数以及平均耗时"""
+        hits, misses, resets = self.stats["hits"], self.stats["misses"], self.stats["resets"]
+        hit_ms = self.stats["hit_seconds"] / hits * 1000 if hits else 0.0
+        miss_ms = self.stats["miss_seconds"] / misses * 1000 if misses else 0.0
+        reset_ms = self.stats["reset_seconds"] / resets * 1000 if resets else 0.0
+        return (
+            f"上下文池: 命中 {hits}, 未命中 {misses}, 重置 {resets}, 丢弃 {self.stats['discarded']}, "
+            f"平均耗时 命中 {hit_ms:.1f}ms / 新建 {miss_ms:.1f}ms / 重置 {reset_ms:.1f}ms"
+        )
@@ -1,15 +1,106 @@
+import copy
+import hashlib
+import os
+import pickle
 import yaml
 from pathlib import Path
+from typing import Dict, Tuple
+from config.config import DATA_DISK_CACHE, DATA_PRELOAD_MAX_KB
+
+# 优先使用 libyaml 的 C 加速解析器
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
 
 class DataLoader:
-    @staticmethod
-    def load_yaml(file_name: str) -> dict:
-        file_path = Path(__file__).parent.parent / "test_data" / file_name
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+    """测试数据加载器
+
+    解析结果按（路径, 修改时间, 文件大小）缓存在进程内，同一文件只解析一次；
+    开启 DATA_DISK_CACHE 时解析结果还会按文件内容哈希缓存到磁盘，跨进程/跨运行复用。
+    返回值均为副本，测试修改数据不会影响缓存。
+    """
+
+    DATA_DIR = Path(__file__).parent.parent / "test_data"
+    CACHE_DIR = Path(__file__).parent.parent / ".cache" / "test_data"
+
+    # 文件路径 -> ((mtime_ns, size), 解析结果)
+    _cache: Dict[str, Tuple[Tuple[int, int], dict]] = {}
+
+    @classmethod
+    def _parse(cls, file_path: Path) -> dict:
+        """解析 YAML 文件，开启磁盘缓存时按内容哈希读取/写入编译结果"""
+        content = file_path.read_bytes()
+        if not DATA_DISK_CACHE:
+            return yaml.load(content, Loader=_YamlLoader)
+
+        cache_file = cls.CACHE_DIR / f"{hashlib.sha256(content).hexdigest()}.pickle"
+        try:
+            with open(cache_file, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+
+        data = yaml.load(content, Loader=_YamlLoader)
+        cls.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_file.replace(cache_file)
+        return data
+
+    @classmethod
+    def _load_cached(cls, file_name: str) -> dict:
+        """返回缓存中的解析结果（共享对象，调用方不得修改）"""
+        file_path = cls.DATA_DIR / file_name
+        stat = file_path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        cached = cls._cache.get(str(file_path))
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        data = cls._parse(file_path)
+        cls._cache[str(file_path)] = (signature, data)
+        return data
+
+    @classmethod
+    def load_yaml(cls, file_name: str) -> dict:
+        return copy.deepcopy(cls._load_cached(file_name))
+
+    @classmethod
+    def get_test_data(cls, file_name: str, key: str) -> dict:
+        data = cls._load_cached(file_name) or {}
+        return copy.deepcopy(data.get(key, {}))
 
     @staticmethod
-    def get_test_data(file_name: str, key: str) -> dict:
-        data = DataLoader.load_yaml(file_name)
-        return data.get(key, {})
+    def _is_document_stream(file_path: Path) -> bool:
+        """是否为多文档 YAML（Dataset 数据集，以 --- 分隔多条数据），只扫描行首不解析"""
+        seen_content = False
+        with open(file_path, "rb") as f:
+            for line in f:
+                if line.startswith(b"---"):
+                    if seen_content:
+                        return True
+                elif line.strip() and not line.lstrip().startswith(b"#"):
+                    seen_content = True
+        return False
+
+    @classmethod
+    def preload(cls) -> int:
+        """预加载 test_data 目录下的单文档 YAML 数据文件，返回加载的文件数量
+
+        多文档数据集（由 Dataset 流式读取）和超过 DATA_PRELOAD_MAX_KB 的文件跳过，
+        解析失败的文件只输出警告，留到测试实际使用时再报错。
+        """
+        count = 0
+        for file_path in sorted(cls.DATA_DIR.rglob("*.y*ml")):
+            if file_path.stat().st_size > DATA_PRELOAD_MAX_KB * 1024 or cls._is_document_stream(file_path):
+                continue
+            try:
+                cls._load_cached(str(file_path.relative_to(cls.DATA_DIR)))
+                count += 1
+            except yaml.YAMLError as e:
+                print(f"⚠ 预加载测试数据失败: {file_path.relative_to(cls.DATA_DIR)}, 错误: {e}")
+        return count
@@ -0,0 +1,171 @@
+import csv
+import io
+import json
+import random
+import yaml
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+# 优先使用 libyaml 的 C 加速解析器
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+
+def _is_document_start(line: bytes) -> bool:
+    """YAML 文档分隔行：以 --- 开头，后面为空白或行内内容"""
+    return line.startswith(b"---") and (len(line) == 3 or line[3:4].isspace())
+
+
+def _is_yaml_content(line: bytes) -> bool:
+    """非空行、非注释、非 ... 结束标记和 % 指令"""
+    text = line.strip()
+    return bool(text) and not text.startswith((b"#", b"...", b"%"))
+
+
+class Dataset:
+    """大数据集的流式读取，用于数据驱动参数化
+
+    支持三种格式（按后缀识别）：
+        - .csv: 首行为表头，每条记录一条数据（引号内可以包含换行）
+        - .jsonl: 每行一个 JSON 对象
+        - .yaml/.yml: 多文档流，每个文档（以 --- 分隔）一条数据
+
+    收集阶段扫描一遍文件建立记录偏移索引（每条数据一个整数），不解析数据；
+    测试执行时按偏移直接定位，只解析对应的一条记录。
+    CSV 按引号配对判断记录边界，YAML 按 --- 分隔行判断文档边界。
+
+    Examples:
+        dataset = Dataset.open("blood/blood_panel.csv")
+        indices = dataset.select(sample=100, shard=(1, 4))
+        row = dataset.row(indices[0])
+    """
+
+    DATA_DIR = Path(__file__).parent.parent / "test_data"
+
+    _instances: Dict[str, "Dataset"] = {}
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self.path = self.DATA_DIR / file_name
+        self.format = self.path.suffix.lstrip(".").replace("yml", "yaml")
+        if self.format not in ("csv", "jsonl", "yaml"):
+            raise ValueError(f"不支持的数据集格式: {self.path.suffix}, 文件: {file_name}")
+
+        self._header: Optional[List[str]] = None
+        self._offsets: Optional[List[int]] = None
+
+    @classmethod
+    def open(cls, file_name: str) -> "Dataset":
+        """获取数据集实例（同一进程内按文件复用，共享记录偏移索引）"""
+        if file_name not in cls._instances:
+            cls._instances[file_name] = cls(file_name)
+        return cls._instances[file_name]
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def _index(self) -> List[int]:
+        if self._offsets is None:
+            self._build_offsets()
+        return self._offsets
+
+    def _read_record(self, f: BinaryIO) -> bytes:
+        """从当前位置读取一条完整记录的原始字节"""
+        if self.format == "csv":
+            # 引号个数为奇数说明换行在引号内，记录延续到下一行（转义的 "" 不影响奇偶）
+            record = f.readline()
+            while record.count(b'"') % 2:
+                line = f.readline()
+                if not line:
+                    break
+                record += line
+            return record
+        if self.format == "yaml":
+            lines = [f.readline()]
+            for line in iter(f.readline, b""):
+                if _is_document_start(line):
+                    break
+                lines.append(line)
+            return b"".join(lines)
+        return f.readline()
+
+    def _build_offsets(self):
+        """扫描一遍文件（不解析数据），记录每条数据的字节偏移"""
+        offsets = []
+        with open(self.path, "rb") as f:
+            if self.format == "yaml":
+                # 只记录有内容的文档，与 safe_load_all 跳过空文档一致
+                start, has_content, position = 0, False, 0
+                for line in iter(f.readline, b""):
+                    if _is_document_start(line):
+                        if has_content:
+                            offsets.append(start)
+                        start, has_content = position, _is_yaml_content(line[3:])
+                    elif not has_content:
+                        has_content = _is_yaml_content(line)
+                    position = f.tell()
+                if has_content:
+                    offsets.append(start)
+            else:
+                if self.format == "csv":
+                    self._header = self._parse_csv(self._read_record(f).decode("utf-8-sig"))
+                position = f.tell()
+                for record in iter(lambda: self._read_record(f), b""):
+                    if record.strip():
+                        offsets.append(position)
+                    position = f.tell()
+        self._offsets = offsets
+
+    @staticmethod
+    def _parse_csv(record: str) -> List[str]:
+        return next(csv.reader(io.StringIO(record, newline="")))
+
+    def row(self, index: int) -> dict:
+        """读取第 index 条数据（从 0 开始）"""
+        offsets = self._index()
+        with open(self.path, "rb") as f:
+            f.seek(offsets[index])
+            record = self._read_record(f).decode("utf-8")
+        if self.format == "csv":
+            return dict(zip(self._header, self._parse_csv(record)))
+        if self.format == "yaml":
+            return yaml.load(record, Loader=_YamlLoader)
+        return json.loads(record)
+
+    def iter_rows(self) -> Iterator[dict]:
+        """按顺序流式遍历所有数据"""
+        if self.format == "yaml":
+            with open(self.path, "r", encoding="utf-8") as f:
+                yield from (document for document in yaml.load_all(f, Loader=_YamlLoader) if document is not None)
+            return
+        with open(self.path, "r", encoding="utf-8-sig", newline="") as f:
+            if self.format == "csv":
+                yield from csv.DictReader(f)
+            else:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def select(self, sample: Optional[int] = None, shard: Optional[Tuple[int, int]] = None,
+               seed: int = 0) -> List[int]:
+        """选择要执行的行号
+
+        Args:
+            sample: 随机抽取的行数（冒烟运行），None 表示全部
+            shard: (第几片, 总片数)，片号从 1 开始，按行号取模分片
+            seed: 抽样随机种子，保证各个 worker 收集到相同的用例
+
+        Returns:
+            升序排列的行号列表
+        """
+        indices = range(len(self))
+        if shard:
+            number, total = shard
+            if not 1 <= number <= total:
+                raise ValueError(f"数据集分片无效: {number}/{total}，要求 1 <= K <= N")
+            indices = indices[number - 1::total]
+        if sample is not None and sample < len(indices):
+            indices = sorted(random.Random(seed).sample(indices, sample))
+        return list(indices)
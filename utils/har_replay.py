@@ -0,0 +1,147 @@
+import hashlib
+import json
+import mimetypes
+from pathlib import Path
+from typing import List, Optional
+from playwright.sync_api import BrowserContext, Request, Route
+from utils.logger import Logger
+
+
+# HAR 中与回放无关、每次录制都会变化的字段，写入前统一为固定值，便于 diff
+_EPOCH = "1970-01-01T00:00:00.000Z"
+_NO_TIMINGS = {"send": -1, "wait": -1, "receive": -1}
+
+
+class HarReplay:
+    """按测试录制/回放后端接口响应（HAR）
+
+    模式：
+        - "off": 不使用 HAR
+        - "record": 访问真实后端，匹配 url_pattern 的响应全部重新录制到 HAR
+        - "replay": 匹配的请求从 HAR 返回；HAR 中没有的请求访问真实后端，
+          并把响应追加到 HAR（update-on-miss），下次运行直接回放
+        - "replay-strict": 只从 HAR 返回，HAR 中没有的请求直接中止（离线运行）
+
+    HAR 使用 Playwright 的 attach 格式：响应内容按 sha1 保存为 HAR 同目录下的独立文件，
+    相同内容只保存一份；HAR 本身以缩进 JSON 写入，时间等易变字段固定为常量，便于代码评审时 diff。
+
+    Examples:
+        har = HarReplay(context, "replay", Path("test_data/har/blood/test_submit.har"), "**/api/**")
+        har.install()
+        ...
+        context.close()
+        har.finish()
+    """
+
+    MODES = ("off", "record", "replay", "replay-strict")
+
+    def __init__(self, context: BrowserContext, mode: str, path: Path, url_pattern: str = "**/api/**"):
+        if mode not in self.MODES:
+            raise ValueError(f"不支持的 HAR 模式: {mode}, 可选: {', '.join(self.MODES)}")
+        self.context = context
+        self.mode = mode
+        self.path = path
+        self.url_pattern = url_pattern
+        self.logger = Logger(self.__class__.__name__)
+        self._misses: List[dict] = []
+
+    def install(self):
+        """在上下文上注册 HAR 路由，需在创建页面之前调用"""
+        if self.mode == "off":
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.mode == "record":
+            self.context.route_from_har(
+                self.path, url=self.url_pattern, update=True, update_content="attach", update_mode="minimal"
+            )
+            return
+
+        # 后注册的路由先匹配：HAR 未命中时 fallback 到先注册的 _record_miss
+        if self.mode == "replay":
+            self.context.route(self.url_pattern, self._record_miss)
+        if self.path.exists():
+            self.context.route_from_har(
+                self.path, url=self.url_pattern, not_found="fallback" if self.mode == "replay" else "abort"
+            )
+        elif self.mode == "replay-strict":
+            raise FileNotFoundError(f"HAR 文件不存在: {self.path}，请先使用 --har-mode record 或 replay 录制")
+
+    def _record_miss(self, route: Route):
+        """HAR 未命中：请求真实后端，返回响应并记录，测试结束后追加到 HAR"""
+        response = route.fetch()
+        body = response.body()
+        self._misses.append(self._entry(route.request, response.status, response.status_text,
+                                        response.headers_array(), body))
+        self.logger.info("HAR 未命中，已从后端获取: %s %s", route.request.method, route.request.url)
+        route.fulfill(response=response, body=body)
+
+    def _save_content(self, body: bytes, mime_type: str) -> str:
+        """响应内容保存为 HAR 同目录下的 <sha1>.<ext> 文件（与 Playwright attach 格式一致）"""
+        extension = mimetypes.guess_extension(mime_type.split(";")[0].strip()) or ".dat"
+        file_name = f"{hashlib.sha1(body).hexdigest()}{extension}"
+        content_path = self.path.parent / file_name
+        if not content_path.exists():
+            content_path.write_bytes(body)
+        return file_name
+
+    def _entry(self, request: Request, status: int, status_text: str, headers: List[dict], body: bytes) -> dict:
+        mime_type = next((h["value"] for h in headers if h["name"].lower() == "content-type"), "")
+        entry_request = {
+            "method": request.method,
+            "url": request.url,
+            "httpVersion": "HTTP/1.1",
+            "cookies": [],
+            "headers": [],
+            "queryString": [],
+            "headersSize": -1,
+            "bodySize": -1,
+        }
+        post_data = request.post_data
+        if post_data is not None:
+            entry_request["postData"] = {"mimeType": request.headers.get("content-type", ""), "text": post_data}
+        return {
+            "startedDateTime": _EPOCH,
+            "time": 0,
+            "request": entry_request,
+            "response": {
+                "status": status,
+                "statusText": status_text,
+                "httpVersion": "HTTP/1.1",
+                "cookies": [],
+                "headers": headers,
+                "content": {"size": len(body), "mimeType": mime_type, "_file": self._save_content(body, mime_type)},
+                "redirectURL": "",
+                "headersSize": -1,
+                "bodySize": -1,
+            },
+            "cache": {},
+            "timings": dict(_NO_TIMINGS),
+        }
+
+    def finish(self) -> Optional[Path]:
+        """上下文关闭后调用：追加未命中的响应，并规范化 HAR 格式；返回更新过的 HAR 路径"""
+        if self.mode not in ("record", "replay") or (self.mode == "replay" and not self._misses):
+            return None
+        if not self.path.exists():
+            if not self._misses:
+                return None
+            har = {"log": {"version": "1.2", "creator": {"name": "HarReplay", "version": "1.0"}, "entries": []}}
+        else:
+            with open(self.path, "r", encoding="utf-8") as f:
+                har = json.load(f)
+
+        entries = har["log"]["entries"] + self._misses
+        for entry in entries:
+            entry["startedDateTime"] = _EPOCH
+            entry["time"] = 0
+            entry["timings"] = dict(_NO_TIMINGS)
+        har["log"]["entries"] = entries
+        har["log"].pop("pages", None)
+
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(har, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        if self._misses:
+            self.logger.info("HAR 追加 %d 条响应: %s", len(self._misses), self.path)
+            self._misses = []
+        return self.path
@@ -1,62 +1,215 @@
+import atexit
+import copy
+import json
 import logging
+import os
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from datetime import datetime
+from typing import List
+from config.config import (
+    LOG_LEVEL, LOG_TO_CONSOLE, LOG_TO_FILE, LOG_FORMAT,
+    LOG_ASYNC, LOG_QUEUE_SIZE, LOG_QUEUE_POLICY, LOG_QUEUE_BLOCK_TIMEOUT, LOG_FLUSH_TIMEOUT
+)
+
+
+class _TestContextFilter(logging.Filter):
+    """在产生日志的线程上记录当前测试和 worker，供 JSON 格式输出（异步模式下格式化在后台线程进行）"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        test = os.environ.get("PYTEST_CURRENT_TEST")
+        record.test = test.rsplit(" ", 1)[0] if test else None
+        record.worker = os.environ.get("PYTEST_XDIST_WORKER", "master")
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """JSON Lines 格式：每条日志一行 JSON，日志采集端无需正则解析"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "worker": getattr(record, "worker", None),
+            "test": getattr(record, "test", None),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            # 异步模式下异常在放入队列前已展开为文本
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _BoundedQueueHandler(QueueHandler):
+    """有界队列 handler：队列满时按策略阻塞等待或丢弃，并统计丢弃数量"""
+
+    def __init__(self, log_queue: queue.Queue, policy: str, block_timeout: float):
+        super().__init__(log_queue)
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self._exception_formatter = logging.Formatter()
+        # 后台线程停止后改为同步写入这些 handler，避免日志积压在无人消费的队列中
+        self.direct_handlers: List[logging.Handler] = []
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 与标准库 QueueHandler 一样在产生日志的线程上合并 msg % args、展开异常：
+        # 参数对象在后台线程格式化前可能已被修改，traceback 也会让整条调用栈留在队列中。
+        # 时间、级别等格式化仍在后台线程进行
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or self._exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.direct_handlers:
+            for handler in self.direct_handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+            return
+        try:
+            if self.policy == "block":
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
 
 
 class Logger:
-    """日志工具类,用于记录测试执行过程"""
+    """日志工具类,用于记录测试执行过程
+
+    日志级别、输出目标和格式分别由 LOG_LEVEL、LOG_TO_CONSOLE/LOG_TO_FILE、LOG_FORMAT 配置。
+    所有 Logger 实例共享同一组文件/控制台 handler。开启 LOG_ASYNC 时，
+    日志消息合并参数后放入有界队列，由后台线程按格式输出并写入，磁盘 I/O 不占用测试线程。
+    """
 
     _initialized = False
+    _handlers: List[logging.Handler] = []
+    _queue_handler: _BoundedQueueHandler = None
+    _listener: QueueListener = None
 
     def __init__(self, name: str):
         self.logger = logging.getLogger(name)
-        self.logger.setLevel(logging.DEBUG)
+        self.logger.setLevel(LOG_LEVEL)
 
         # 避免重复添加handler
         if not self.logger.handlers:
             self._setup_handlers()
+            if LOG_FORMAT == "json":
+                self.logger.addFilter(_TestContextFilter())
 
     def _setup_handlers(self):
-        """配置日志处理器"""
-        # 创建logs目录
-        log_dir = Path(__file__).parent.parent / "logs"
-        log_dir.mkdir(exist_ok=True)
-
-        # 文件handler - 记录所有日志
-        log_file = log_dir / f"test_{datetime.now().strftime('%Y%m%d')}.log"
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(logging.DEBUG)
+        """为当前 logger 挂载共享的处理器"""
+        if not Logger._initialized:
+            Logger._create_handlers()
 
-        # 控制台handler - 只显示INFO及以上
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
+        if Logger._queue_handler:
+            self.logger.addHandler(Logger._queue_handler)
+        else:
+            for handler in Logger._handlers:
+                self.logger.addHandler(handler)
 
+    @classmethod
+    def _create_handlers(cls):
+        """创建共享的处理器，异步模式下同时启动后台写日志线程"""
         # 日志格式
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
+        if LOG_FORMAT == "json":
+            formatter = JsonLinesFormatter(datefmt='%Y-%m-%d %H:%M:%S')
+        else:
+            formatter = logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                datefmt='%Y-%m-%d %H:%M:%S'
+            )
+
+        handlers = []
+        if LOG_TO_FILE:
+            # 创建logs目录
+            log_dir = Path(__file__).parent.parent / "logs"
+            log_dir.mkdir(exist_ok=True)
+
+            # 文件handler
+            suffix = "jsonl" if LOG_FORMAT == "json" else "log"
+            log_file = log_dir / f"test_{datetime.now().strftime('%Y%m%d')}.{suffix}"
+            handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
+
+        if LOG_TO_CONSOLE:
+            # 控制台handler
+            handlers.append(logging.StreamHandler())
+
+        if not handlers:
+            # 文件和控制台都关闭时丢弃日志，避免落到 logging 的默认 stderr 输出
+            handlers.append(logging.NullHandler())
+
+        for handler in handlers:
+            handler.setLevel(LOG_LEVEL)
+            handler.setFormatter(formatter)
+        cls._handlers = handlers
+
+        if LOG_ASYNC:
+            log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+            cls._queue_handler = _BoundedQueueHandler(log_queue, LOG_QUEUE_POLICY, LOG_QUEUE_BLOCK_TIMEOUT)
+            cls._listener = QueueListener(log_queue, *cls._handlers, respect_handler_level=True)
+            cls._listener.start()
+            atexit.register(cls.shutdown)
+
+        cls._initialized = True
+
+    @classmethod
+    def flush(cls, timeout: float = LOG_FLUSH_TIMEOUT):
+        """等待队列中的日志全部写入（测试会话结束时调用），最多等待 timeout 秒"""
+        if cls._listener:
+            log_queue = cls._listener.queue
+            deadline = time.monotonic() + timeout
+            with log_queue.all_tasks_done:
+                while log_queue.unfinished_tasks:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        print(f"⚠ 日志队列 {timeout} 秒内未写完，剩余 {log_queue.unfinished_tasks} 条")
+                        break
+                    log_queue.all_tasks_done.wait(remaining)
+        for handler in cls._handlers:
+            handler.flush()
+        if cls._queue_handler and cls._queue_handler.dropped:
+            print(f"⚠ 日志队列已满，丢弃 {cls._queue_handler.dropped} 条日志")
+            cls._queue_handler.dropped = 0
+
+    @classmethod
+    def shutdown(cls):
+        """停止后台写日志线程，剩余日志写入后关闭"""
+        if cls._listener:
+            cls._listener.stop()
+            cls._listener = None
+            cls._queue_handler.direct_handlers = cls._handlers
+        for handler in cls._handlers:
+            handler.flush()
 
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+    # 以下方法支持 %-格式的延迟格式化：logger.info("填充元素: %s", locator)，
+    # 级别被过滤时不会进行字符串格式化
 
-    def debug(self, message: str):
+    def debug(self, message: str, *args):
         """调试信息"""
-        self.logger.debug(message)
+        self.logger.debug(message, *args)
 
-    def info(self, message: str):
+    def info(self, message: str, *args):
         """一般信息"""
-        self.logger.info(message)
+        self.logger.info(message, *args)
 
-    def warning(self, message: str):
+    def warning(self, message: str, *args):
         """警告信息"""
-        self.logger.warning(message)
+        self.logger.warning(message, *args)
 
-    def error(self, message: str):
+    def error(self, message: str, *args):
         """错误信息"""
-        self.logger.error(message)
+        self.logger.error(message, *args)
 
     @classmethod
     def get_logger(cls, name: str = "TestLogger"):
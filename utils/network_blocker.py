@@ -0,0 +1,173 @@
+import json
+import re
+from fnmatch import translate
+from pathlib import Path
+from typing import Dict, Iterable
+from urllib.parse import urlsplit
+from filelock import FileLock
+from playwright.sync_api import BrowserContext, Response, Route
+
+
+# 常见统计/广告脚本，表单测试不需要
+ANALYTICS_URL_PATTERNS = [
+    "*google-analytics.com/*",
+    "*googletagmanager.com/*",
+    "*doubleclick.net/*",
+    "*hm.baidu.com/*",
+    "*cnzz.com/*",
+    "*sentry.io/*",
+]
+
+# 网络拦截预设：拦截的资源类型（Playwright request.resource_type）和 URL 通配符
+# stylesheet 和 script 不拦截，元素可见性和页面逻辑依赖它们
+NETWORK_PROFILES: Dict[str, Dict[str, list]] = {
+    "none": {"resource_types": [], "url_patterns": []},
+    "no-media": {"resource_types": ["image", "media", "font"], "url_patterns": []},
+    "forms-only": {
+        "resource_types": ["image", "media", "font", "texttrack", "manifest"],
+        "url_patterns": ANALYTICS_URL_PATTERNS,
+    },
+}
+
+# 记录大小的资源类型（可能被预设拦截的类型）
+_SIZED_RESOURCE_TYPES = frozenset(t for preset in NETWORK_PROFILES.values() for t in preset["resource_types"])
+
+
+class NetworkBlocker:
+    """通过上下文路由拦截不需要的请求，并统计每个测试节省的请求数和流量
+
+    被拦截的请求没有响应，节省的字节数按资源大小表估算：未被拦截时加载过的资源
+    会记录 Content-Length（test-results/resource_sizes.json），之后被拦截时按记录累计；
+    从未加载过的资源只计请求数。
+
+    Examples:
+        blocker = NetworkBlocker.from_profile("forms-only")
+        blocker.install(context)
+        ...
+        print(blocker.summary())
+    """
+
+    SIZES_PATH = Path(__file__).parent.parent / "test-results" / "resource_sizes.json"
+
+    # 资源大小表最多保留的条目数
+    MAX_SIZES = 5000
+
+    _sizes: Dict[str, int] = None
+    _new_sizes: Dict[str, int] = {}
+
+    # 本进程所有测试的累计拦截统计
+    totals = {"tests": 0, "requests": 0, "bytes": 0}
+
+    def __init__(self, resource_types: Iterable[str] = (), url_patterns: Iterable[str] = (),
+                 profile: str = "custom"):
+        self.profile = profile
+        self.resource_types = frozenset(resource_types)
+        patterns = list(url_patterns)
+        self._url_regex = re.compile("|".join(translate(p) for p in patterns)) if patterns else None
+        self.requests = 0
+        self.bytes = 0
+        self.by_type: Dict[str, int] = {}
+        self._context: BrowserContext = None
+
+    @classmethod
+    def from_profile(cls, profile: str, resource_types: Iterable[str] = (),
+                     url_patterns: Iterable[str] = ()) -> "NetworkBlocker":
+        """按预设创建，可附加额外的资源类型和 URL 通配符"""
+        if profile not in NETWORK_PROFILES:
+            raise ValueError(f"不支持的网络拦截预设: {profile}, 可选: {', '.join(NETWORK_PROFILES)}")
+        preset = NETWORK_PROFILES[profile]
+        return cls(
+            list(preset["resource_types"]) + list(resource_types),
+            list(preset["url_patterns"]) + list(url_patterns),
+            profile=profile
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.resource_types or self._url_regex)
+
+    @staticmethod
+    def _size_key(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.netloc}{parts.path}"
+
+    @classmethod
+    def _load_sizes(cls) -> Dict[str, int]:
+        if cls._sizes is None:
+            try:
+                with open(cls.SIZES_PATH, "r", encoding="utf-8") as f:
+                    cls._sizes = json.load(f)
+            except (OSError, ValueError):
+                cls._sizes = {}
+        return cls._sizes
+
+    def _should_block(self, resource_type: str, url: str) -> bool:
+        return resource_type in self.resource_types or bool(self._url_regex and self._url_regex.match(url))
+
+    def _handle(self, route: Route):
+        request = route.request
+        if not self._should_block(request.resource_type, request.url):
+            route.fallback()
+            return
+        self.requests += 1
+        self.by_type[request.resource_type] = self.by_type.get(request.resource_type, 0) + 1
+        self.bytes += self._load_sizes().get(self._size_key(request.url), 0)
+        route.abort("blockedbyclient")
+
+    @classmethod
+    def _learn_size(cls, response: Response):
+        """记录可拦截类型资源的大小，供之后的拦截运行估算节省的流量"""
+        length = response.headers.get("content-length")
+        if length and length.isdigit() and response.request.resource_type in _SIZED_RESOURCE_TYPES:
+            key = cls._size_key(response.url)
+            cls._load_sizes()[key] = cls._new_sizes[key] = int(length)
+
+    def install(self, context: BrowserContext):
+        """在上下文上注册拦截路由（预设为空时只记录资源大小）"""
+        self._context = context
+        context.on("response", self._learn_size)
+        if self.enabled:
+            context.route("**/*", self._handle)
+
+    def finish(self) -> str:
+        """测试结束：移除资源大小监听（上下文可能被池复用），启用拦截时累计到会话统计，返回本测试的统计说明"""
+        if self._context:
+            self._context.remove_listener("response", self._learn_size)
+            self._context = None
+        if self.enabled:
+            NetworkBlocker.totals["tests"] += 1
+            NetworkBlocker.totals["requests"] += self.requests
+            NetworkBlocker.totals["bytes"] += self.bytes
+        return self.summary()
+
+    def summary(self) -> str:
+        by_type = ", ".join(f"{t} {n}" for t, n in sorted(self.by_type.items())) or "无"
+        return (f"网络拦截（{self.profile}）: 拦截 {self.requests} 个请求, "
+                f"估算节省 {self.bytes / 1024:.1f} KB\n按类型: {by_type}")
+
+    @classmethod
+    def session_summary(cls) -> str:
+        totals = cls.totals
+        if not totals["tests"]:
+            return "网络拦截: 本次运行未启用"
+        return (f"网络拦截: {totals['tests']} 个测试共拦截 {totals['requests']} 个请求, "
+                f"估算节省 {totals['bytes'] / 1024 / 1024:.1f} MB")
+
+    @classmethod
+    def save(cls):
+        """将本进程新记录的资源大小合并写入文件（并行 worker 之间加锁）"""
+        if not cls._new_sizes:
+            return
+        cls.SIZES_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(str(cls.SIZES_PATH) + ".lock"):
+            try:
+                with open(cls.SIZES_PATH, "r", encoding="utf-8") as f:
+                    sizes = json.load(f)
+            except (OSError, ValueError):
+                sizes = {}
+            sizes.update(cls._new_sizes)
+            if len(sizes) > cls.MAX_SIZES:
+                sizes = dict(list(sizes.items())[-cls.MAX_SIZES:])
+            with open(cls.SIZES_PATH, "w", encoding="utf-8") as f:
+                json.dump(sizes, f, ensure_ascii=False, indent=2)
+        cls._new_sizes = {}
@@ -0,0 +1,162 @@
+import json
+import uuid
+from pathlib import Path
+from statistics import median
+from typing import Dict, List, Tuple
+from filelock import FileLock
+
+
+class PerfReport:
+    """测试耗时报告和性能回退检查
+
+    每个测试记录 setup / call / teardown 三个阶段的耗时，以及 fixture 中的细分耗时：
+        - context_create: 创建浏览器上下文和页面
+        - context_teardown: 回收上下文（包含 trace_stop）
+        - trace_stop: 停止 tracing 并保存 trace 文件
+        - auth_state: 认证状态检查（必要时登录）
+
+    本次运行（含所有 xdist worker）的结果合并写入 test-results/perf_results.json；
+    基线文件 test-results/perf_baseline.json 保存每个测试每项指标最近 BASELINE_SAMPLES 次的耗时，
+    与基线中位数比较，耗时增加同时超过百分比和绝对值阈值时视为回退。
+
+    Examples:
+        PerfReport.record("context_create", 0.35)
+        PerfReport.add_phase("call", report.duration)
+        PerfReport.finish_test(item.nodeid, passed=True)
+        PerfReport.save()
+    """
+
+    RESULTS_PATH = Path(__file__).parent.parent / "test-results" / "perf_results.json"
+    BASELINE_PATH = Path(__file__).parent.parent / "test-results" / "perf_baseline.json"
+
+    PHASES = ("setup", "call", "teardown")
+    COMPONENTS = ("context_create", "context_teardown", "trace_stop", "auth_state")
+
+    # 基线中每项指标保留的样本数量
+    BASELINE_SAMPLES = 5
+
+    # 短于该值（秒）的指标不参与回退检查，避免毫秒级波动被放大成百分比回退
+    MIN_SECONDS = 0.05
+
+    # 同一次 pytest 运行（含所有 xdist worker）共享的标识，由 conftest 在 pytest_configure 中设置
+    run_id = uuid.uuid4().hex
+
+    # 当前测试的阶段和细分耗时（秒）
+    _current: Dict[str, float] = {}
+    # 本进程已结束的测试: nodeid -> 指标耗时
+    _tests: Dict[str, Dict[str, float]] = {}
+
+    @classmethod
+    def record(cls, component: str, seconds: float):
+        """累计当前测试的一项细分耗时"""
+        cls._current[component] = cls._current.get(component, 0.0) + seconds
+
+    @classmethod
+    def add_phase(cls, phase: str, seconds: float):
+        cls._current[phase] = seconds
+
+    @classmethod
+    def finish_test(cls, nodeid: str, passed: bool):
+        """测试结束（teardown 之后）：只保留通过的测试，失败/跳过的耗时不具可比性"""
+        current, cls._current = cls._current, {}
+        if passed:
+            cls._tests[nodeid] = {name: round(seconds, 4) for name, seconds in current.items()}
+
+    @staticmethod
+    def _read(path: Path) -> dict:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @classmethod
+    def save(cls):
+        """将本进程的结果合并写入本次运行的结果文件（并行 worker 之间加锁）"""
+        if not cls._tests:
+            return
+        cls.RESULTS_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(str(cls.RESULTS_PATH) + ".lock"):
+            results = cls._read(cls.RESULTS_PATH)
+            if results.get("run") != cls.run_id:
+                results = {"run": cls.run_id, "tests": {}}
+            results["tests"].update(cls._tests)
+            with open(cls.RESULTS_PATH, "w", encoding="utf-8") as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+        cls._tests = {}
+
+    @classmethod
+    def load(cls) -> Dict[str, Dict[str, float]]:
+        """本次运行所有测试的结果（其他运行留下的文件返回空）"""
+        results = cls._read(cls.RESULTS_PATH)
+        return results.get("tests", {}) if results.get("run") == cls.run_id else {}
+
+    @classmethod
+    def compare(cls, tests: Dict[str, Dict[str, float]], threshold_pct: float,
+                threshold_seconds: float) -> List[Tuple[str, str, float, float]]:
+        """与基线比较，返回回退列表 [(nodeid, 指标, 基线秒, 本次秒)]
+
+        Args:
+            tests: 本次运行的结果
+            threshold_pct: 相对基线中位数增加的百分比阈值，0 表示只看绝对值
+            threshold_seconds: 增加的绝对值阈值（秒），0 表示只看百分比
+        """
+        baseline = cls._read(cls.BASELINE_PATH)
+        regressions = []
+        for nodeid, metrics in sorted(tests.items()):
+            for name, seconds in metrics.items():
+                samples = baseline.get(nodeid, {}).get(name)
+                if not samples or seconds < cls.MIN_SECONDS:
+                    continue
+                base = median(samples)
+                increase = seconds - base
+                if increase > threshold_seconds and increase > base * threshold_pct / 100:
+                    regressions.append((nodeid, name, base, seconds))
+        return regressions
+
+    @classmethod
+    def update_baseline(cls, tests: Dict[str, Dict[str, float]], only_new: bool = False) -> int:
+        """把本次结果追加到基线，返回更新的测试数
+
+        Args:
+            tests: 本次运行的结果
+            only_new: 只添加基线中还没有的测试（已有测试的基线保持不变）
+        """
+        cls.BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(str(cls.BASELINE_PATH) + ".lock"):
+            baseline = cls._read(cls.BASELINE_PATH)
+            updated = 0
+            for nodeid, metrics in tests.items():
+                if only_new and nodeid in baseline:
+                    continue
+                entry = baseline.setdefault(nodeid, {})
+                for name, seconds in metrics.items():
+                    entry[name] = (entry.get(name, []) + [seconds])[-cls.BASELINE_SAMPLES:]
+                updated += 1
+            with open(cls.BASELINE_PATH, "w", encoding="utf-8") as f:
+                json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+        return updated
+
+    @classmethod
+    def summary(cls, tests: Dict[str, Dict[str, float]], top: int = 5) -> str:
+        """各阶段和 fixture 细分耗时合计，以及最慢的测试"""
+        totals: Dict[str, float] = {}
+        for metrics in tests.values():
+            for name, seconds in metrics.items():
+                totals[name] = totals.get(name, 0.0) + seconds
+        phases = ", ".join(f"{name} {totals.get(name, 0):.1f}s" for name in cls.PHASES)
+        components = ", ".join(f"{name} {totals[name]:.1f}s" for name in cls.COMPONENTS if name in totals) or "无"
+        lines = [f"测试耗时: {len(tests)} 个通过的测试, {phases}", f"fixture 细分: {components}", "最慢的测试:"]
+        slowest = sorted(tests.items(), key=lambda item: sum(item[1].get(p, 0) for p in cls.PHASES), reverse=True)
+        for nodeid, metrics in slowest[:top]:
+            total = sum(metrics.get(p, 0) for p in cls.PHASES)
+            lines.append(f"  {total:7.2f}s  {nodeid}")
+        return "\n".join(lines)
+
+    @staticmethod
+    def format_regressions(regressions: List[Tuple[str, str, float, float]]) -> str:
+        lines = [f"性能回退: {len(regressions)} 项超过阈值"]
+        for nodeid, name, base, seconds in regressions:
+            lines.append(f"  {nodeid} [{name}] {base:.2f}s -> {seconds:.2f}s (+{(seconds / base - 1) * 100:.0f}%)"
+                         if base else f"  {nodeid} [{name}] 0s -> {seconds:.2f}s")
+        return "\n".join(lines)
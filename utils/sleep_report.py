@@ -0,0 +1,113 @@
+import ast
+import os
+import sys
+import traceback
+from pathlib import Path
+from typing import Dict, List, Optional
+from playwright.sync_api import Page
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# 扫描时跳过的目录
+_SKIP_DIRS = {".git", ".venv", "venv", "__pycache__", ".pytest_cache", "test-results", "allure-results"}
+
+
+def _sleep_ms(node: ast.Call) -> Optional[float]:
+    """识别固定等待调用并返回等待毫秒数：page.wait_for_timeout(ms) / time.sleep(s)"""
+    func = node.func
+    if not isinstance(func, ast.Attribute) or not node.args:
+        return None
+    arg = node.args[0]
+    value = arg.value if isinstance(arg, ast.Constant) and isinstance(arg.value, (int, float)) else None
+    if func.attr == "wait_for_timeout":
+        return float(value) if value is not None else float("nan")
+    if func.attr == "sleep" and isinstance(func.value, ast.Name) and func.value.id == "time":
+        return float(value) * 1000 if value is not None else float("nan")
+    return None
+
+
+def scan_fixed_sleeps(root: Path = PROJECT_ROOT) -> List[dict]:
+    """静态扫描项目中的固定等待
+
+    Returns:
+        [{"file": 相对路径, "line": 行号, "ms": 毫秒数（非常量参数为 nan）, "code": 源码}]
+    """
+    results = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in _SKIP_DIRS]
+        for filename in filenames:
+            if not filename.endswith(".py"):
+                continue
+            path = Path(dirpath) / filename
+            source = path.read_text(encoding="utf-8")
+            try:
+                tree = ast.parse(source)
+            except SyntaxError:
+                continue
+            lines = source.splitlines()
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Call):
+                    ms = _sleep_ms(node)
+                    # 轮询间隔等有意为之的等待可以用 "# noqa: sleep" 标记跳过
+                    if ms is not None and "noqa: sleep" not in lines[node.lineno - 1]:
+                        results.append({
+                            "file": str(path.relative_to(root)),
+                            "line": node.lineno,
+                            "ms": ms,
+                            "code": lines[node.lineno - 1].strip(),
+                        })
+    return sorted(results, key=lambda r: (r["file"], r["line"]))
+
+
+class SleepRecorder:
+    """运行时记录 page.wait_for_timeout 固定等待的调用位置和耗时
+
+    由 conftest 在 --sleep-report 模式下安装到每个测试的 page 上，
+    会话结束时汇总每个调用位置的次数和总耗时。
+    """
+
+    # 调用位置 -> {"count": 次数, "ms": 总毫秒数}
+    records: Dict[str, Dict[str, float]] = {}
+
+    @classmethod
+    def install(cls, page: Page):
+        original = page.wait_for_timeout
+
+        def wait_for_timeout(timeout: float):
+            caller = traceback.extract_stack(limit=2)[0]
+            try:
+                location = str(Path(caller.filename).resolve().relative_to(PROJECT_ROOT))
+            except ValueError:
+                location = caller.filename
+            record = cls.records.setdefault(f"{location}:{caller.lineno}", {"count": 0, "ms": 0.0})
+            record["count"] += 1
+            record["ms"] += timeout
+            return original(timeout)
+
+        page.wait_for_timeout = wait_for_timeout
+
+    @classmethod
+    def summary(cls) -> str:
+        if not cls.records:
+            return "固定等待: 本次运行没有调用 wait_for_timeout"
+        total = sum(r["ms"] for r in cls.records.values())
+        lines = [f"固定等待: 共 {sum(int(r['count']) for r in cls.records.values())} 次, 总耗时 {total / 1000:.1f}s"]
+        for location, record in sorted(cls.records.items(), key=lambda item: -item[1]["ms"]):
+            lines.append(f"  {location}  {int(record['count'])} 次, {record['ms'] / 1000:.1f}s")
+        return "\n".join(lines)
+
+
+def main() -> int:
+    """命令行入口：python -m utils.sleep_report，列出项目中剩余的固定等待"""
+    results = scan_fixed_sleeps()
+    for item in results:
+        ms = "?" if item["ms"] != item["ms"] else f"{item['ms']:.0f}ms"
+        print(f"{item['file']}:{item['line']}  {ms}  {item['code']}")
+    known = [item["ms"] for item in results if item["ms"] == item["ms"]]
+    print(f"共 {len(results)} 处固定等待, 各执行一次合计 {sum(known) / 1000:.1f}s")
+    return 1 if results else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
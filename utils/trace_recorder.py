@@ -0,0 +1,186 @@
+import json
+import time
+import uuid
+import allure_commons
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+from filelock import FileLock
+from playwright.sync_api import BrowserContext
+
+
+class TraceRecorder:
+    """单个测试的 Playwright tracing 录制，并统计各 trace 模式的开销
+
+    模式：
+        - "off": 不录制（仍统计测试耗时，作为开销对比的基准）
+        - "on": 录制整个测试并保存
+        - "retain-on-failure": 录制整个测试，仅失败时保存
+        - "chunks": 按顶层 Allure 步骤分块录制，每 N 个顶层步骤开始一个新块，旧块直接丢弃
+          （stop_chunk 不传 path，不导出）；失败时只导出当前块，即失败前最近的 1~N 个步骤。
+          通过的测试不导出任何文件，失败时的 trace 也比 retain-on-failure 的整个测试小，
+          录制缓冲在每块结束时清空
+
+    每种模式的测试数、平均测试耗时和 tracing 调用耗时在会话结束时合并写入
+    test-results/trace_overhead.json，用不同模式各运行一次后即可对比开销。
+    """
+
+    MODES = ("off", "on", "retain-on-failure", "chunks")
+
+    REPORT_PATH = Path(__file__).parent.parent / "test-results" / "trace_overhead.json"
+
+    # 同一次 pytest 运行（含所有 xdist worker）共享的标识，由 conftest 在 pytest_configure 中设置
+    run_id = uuid.uuid4().hex
+
+    # 本进程各模式的统计：模式 -> {"tests", "test_seconds", "trace_seconds", "saved_files", "saved_bytes"}
+    _stats: Dict[str, Dict[str, float]] = {}
+
+    def __init__(self, context: BrowserContext, mode: str, trace_dir: Path, name: str, chunks: int = 5):
+        if mode not in self.MODES:
+            raise ValueError(f"不支持的 trace 模式: {mode}, 可选: {', '.join(self.MODES)}")
+        self.context = context
+        self.mode = mode
+        self.trace_dir = trace_dir
+        self.name = name
+        self.chunks = max(chunks, 1)
+
+        self._started = 0.0
+        self._trace_seconds = 0.0
+        self._chunk_steps = 0
+        self._step_depth = 0
+        self._registered = False
+
+    def start(self):
+        """测试开始前调用"""
+        self._started = time.perf_counter()
+        if self.mode == "off":
+            return
+        begin = time.perf_counter()
+        # tracing.start 同时开始第一个块
+        self.context.tracing.start(title=self.name, screenshots=True, snapshots=True, sources=True)
+        if self.mode == "chunks":
+            allure_commons.plugin_manager.register(self)
+            self._registered = True
+        self._trace_seconds += time.perf_counter() - begin
+
+    def _unregister(self):
+        if self._registered:
+            allure_commons.plugin_manager.unregister(self)
+            self._registered = False
+
+    @allure_commons.hookimpl
+    def start_step(self, uuid, title, params):  # noqa: ARG002
+        """Allure 步骤开始：每 N 个顶层步骤开始一个新的 trace 块"""
+        self._step_depth += 1
+        if self._step_depth != 1:
+            return
+        try:
+            self._next_chunk(title)
+        except Exception as e:
+            # 上下文已关闭（如 teardown 未执行到 stop）时注销自己，不影响之后测试的步骤
+            self._unregister()
+            print(f"⚠ trace 分块失败，停止分块录制: {self.name}, 错误: {e}")
+
+    @allure_commons.hookimpl
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):  # noqa: ARG002
+        self._step_depth -= 1
+
+    def _next_chunk(self, title: str):
+        """当前块已满 N 个顶层步骤时丢弃它（不导出）并开始新块"""
+        self._chunk_steps += 1
+        if self._chunk_steps <= self.chunks:
+            return
+        begin = time.perf_counter()
+        self.context.tracing.stop_chunk()
+        self.context.tracing.start_chunk(title=title)
+        self._chunk_steps = 1
+        self._trace_seconds += time.perf_counter() - begin
+
+    def stop(self, failed: bool) -> List[Path]:
+        """测试结束后调用，返回保存的 trace 文件列表（不保存时为空）"""
+        saved: List[Path] = []
+        begin = time.perf_counter()
+        if self.mode != "off":
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            if self.mode == "chunks":
+                try:
+                    if failed:
+                        self.trace_dir.mkdir(parents=True, exist_ok=True)
+                        path = self.trace_dir / f"{self.name}_{timestamp}_last{self._chunk_steps}steps.zip"
+                        self.context.tracing.stop_chunk(path=str(path))
+                        saved.append(path)
+                    self.context.tracing.stop()
+                finally:
+                    self._unregister()
+            elif self.mode == "on" or failed:
+                self.trace_dir.mkdir(parents=True, exist_ok=True)
+                path = self.trace_dir / f"{self.name}_{timestamp}.zip"
+                self.context.tracing.stop(path=str(path))
+                saved.append(path)
+            else:
+                self.context.tracing.stop()
+        self._trace_seconds += time.perf_counter() - begin
+
+        stats = self._stats.setdefault(
+            self.mode, {"tests": 0, "test_seconds": 0.0, "trace_seconds": 0.0, "saved_files": 0, "saved_bytes": 0}
+        )
+        stats["tests"] += 1
+        stats["test_seconds"] += time.perf_counter() - self._started
+        stats["trace_seconds"] += self._trace_seconds
+        stats["saved_files"] += len(saved)
+        stats["saved_bytes"] += sum(path.stat().st_size for path in saved)
+        return saved
+
+    @classmethod
+    def save(cls) -> Dict[str, Dict[str, float]]:
+        """将本进程的统计合并写入报告文件（并行 worker 之间加锁），返回合并后的全部统计
+
+        同一模式只保留最近一次运行的统计，各 worker 的结果累加到该次运行中。
+        """
+        if not cls._stats:
+            return {}
+        cls.REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(str(cls.REPORT_PATH) + ".lock"):
+            report = cls.load()
+            for mode, stats in cls._stats.items():
+                entry = report.get(mode)
+                if entry and entry.get("run") == cls.run_id:
+                    for key, value in stats.items():
+                        entry[key] = entry.get(key, 0) + value
+                else:
+                    report[mode] = dict(stats, run=cls.run_id)
+            with open(cls.REPORT_PATH, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        cls._stats = {}
+        return report
+
+    @classmethod
+    def load(cls) -> Dict[str, Dict[str, float]]:
+        """读取报告文件中各模式的统计"""
+        try:
+            with open(cls.REPORT_PATH, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @classmethod
+    def summary(cls, report: Dict[str, Dict[str, float]]) -> str:
+        """各模式的平均每测试开销，以 off 模式为基准"""
+        lines = ["Trace 开销（平均每个测试）:"]
+        baseline = report.get("off")
+        base_ms = baseline["test_seconds"] / baseline["tests"] * 1000 if baseline and baseline["tests"] else None
+        for mode in cls.MODES:
+            stats = report.get(mode)
+            if not stats or not stats["tests"]:
+                continue
+            test_ms = stats["test_seconds"] / stats["tests"] * 1000
+            trace_ms = stats["trace_seconds"] / stats["tests"] * 1000
+            delta = f" (相对 off {test_ms - base_ms:+.0f}ms)" if base_ms is not None and mode != "off" else ""
+            lines.append(
+                f"  {mode:<18} {int(stats['tests'])} 个测试, 测试耗时 {test_ms:.0f}ms{delta}, "
+                f"tracing 调用 {trace_ms:.0f}ms, 保存 {int(stats['saved_files'])} 个文件 "
+                f"{stats['saved_bytes'] / 1024 / 1024:.1f} MB"
+            )
+        if base_ms is None:
+            lines.append("  （使用 --trace-mode off 运行一次可得到对比基准）")
+        return "\n".join(lines)
@@ -0,0 +1,77 @@
+import json
+from pathlib import Path
+from typing import Dict, List
+from filelock import FileLock
+
+
+class WaitHistory:
+    """智能等待的历史耗时记录，用于计算自适应超时时间
+
+    每个等待点（页面类 + 等待类型 + 定位器）保留最近的耗时样本，超时时间取
+    历史 p95 的若干倍，并限制在 [最小超时, 默认超时] 之间；样本不足时使用默认超时。
+    历史数据在会话结束时写入文件，供后续运行使用。
+    """
+
+    HISTORY_PATH = Path(__file__).parent.parent / "test-results" / "wait_history.json"
+
+    # 每个等待点保留的样本数量
+    MAX_SAMPLES = 50
+
+    # 样本数量达到该值后才启用自适应超时
+    MIN_SAMPLES = 5
+
+    _history: Dict[str, List[float]] = None
+    _new_samples: Dict[str, List[float]] = {}
+
+    @classmethod
+    def _load(cls) -> Dict[str, List[float]]:
+        if cls._history is None:
+            try:
+                with open(cls.HISTORY_PATH, "r", encoding="utf-8") as f:
+                    cls._history = json.load(f)
+            except (OSError, ValueError):
+                cls._history = {}
+        return cls._history
+
+    @classmethod
+    def record(cls, key: str, duration_ms: float):
+        """记录一次成功等待的耗时（毫秒）"""
+        samples = cls._load().setdefault(key, [])
+        samples.append(round(duration_ms, 1))
+        del samples[:-cls.MAX_SAMPLES]
+        cls._new_samples.setdefault(key, []).append(round(duration_ms, 1))
+
+    @classmethod
+    def timeout_for(cls, key: str, default: float, minimum: float, factor: float) -> float:
+        """根据历史耗时计算超时时间（毫秒）
+
+        Args:
+            key: 等待点标识
+            default: 默认超时，同时作为上限
+            minimum: 超时下限
+            factor: p95 的倍数
+        """
+        samples = sorted(cls._load().get(key, []))
+        if len(samples) < cls.MIN_SAMPLES:
+            return default
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        return max(minimum, min(default, p95 * factor))
+
+    @classmethod
+    def save(cls):
+        """将本进程新增的样本合并写入历史文件（并行 worker 之间加锁）"""
+        if not cls._new_samples:
+            return
+        cls.HISTORY_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(str(cls.HISTORY_PATH) + ".lock"):
+            try:
+                with open(cls.HISTORY_PATH, "r", encoding="utf-8") as f:
+                    history = json.load(f)
+            except (OSError, ValueError):
+                history = {}
+            for key, samples in cls._new_samples.items():
+                merged = history.setdefault(key, []) + samples
+                history[key] = merged[-cls.MAX_SAMPLES:]
+            with open(cls.HISTORY_PATH, "w", encoding="utf-8") as f:
+                json.dump(history, f, ensure_ascii=False, indent=2)
+        cls._new_samples = {}